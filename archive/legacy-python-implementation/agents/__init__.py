@@ -1,42 +1,53 @@
 """Claude Code Agents - Specialized AI Agents for Software Development"""
 
-# Infrastructure agents
-from .infrastructure.docker_agent import DockerAgent
-from .infrastructure.devops_agent import DevOpsAgent
-from .infrastructure.observability_agent import ObservabilityAgent
+from ._lazy import lazy_loader
 
-# Development agents
-from .development.database_agent import DatabaseAgent
-from .development.frontend_agent import FrontendAgent
-from .development.mobile_agent import MobileAgent
+# Agents are imported on first access (PEP 562), so importing the package
+# (or one agent module) doesn't load all of them
+_EXPORTS = {
+    'BaseAgent': '.base_agent',
 
-# Quality agents
-from .quality.test_suite_agent import TestSuiteAgent
-from .quality.security_agent import SecurityAgent
-from .quality.code_review_agent import CodeReviewAgent
-from .quality.refactoring_agent import RefactoringAgent
-from .quality.performance_agent import PerformanceAgent
+    # Infrastructure agents
+    'DockerAgent': '.infrastructure.docker_agent',
+    'DevOpsAgent': '.infrastructure.devops_agent',
+    'ObservabilityAgent': '.infrastructure.observability_agent',
 
-# Operations agents
-from .operations.migration_agent import MigrationAgent
-from .operations.dependency_agent import DependencyAgent
-from .operations.git_agent import GitAgent
+    # Development agents
+    'DatabaseAgent': '.development.database_agent',
+    'FrontendAgent': '.development.frontend_agent',
+    'MobileAgent': '.development.mobile_agent',
 
-# Productivity agents
-from .productivity.scaffolding_agent import ScaffoldingAgent
-from .productivity.documentation_agent import DocumentationAgent
-from .productivity.debugging_agent import DebuggingAgent
+    # Quality agents
+    'TestSuiteAgent': '.quality.test_suite_agent',
+    'SecurityAgent': '.quality.security_agent',
+    'CodeReviewAgent': '.quality.code_review_agent',
+    'RefactoringAgent': '.quality.refactoring_agent',
+    'PerformanceAgent': '.quality.performance_agent',
 
-# Business agents
-from .business.validation_agent import ValidationAgent
-from .business.architecture_agent import ArchitectureAgent
-from .business.localization_agent import LocalizationAgent
-from .business.compliance_agent import ComplianceAgent
+    # Operations agents
+    'MigrationAgent': '.operations.migration_agent',
+    'DependencyAgent': '.operations.dependency_agent',
+    'GitAgent': '.operations.git_agent',
 
-# Specialized agents
-from .specialized.data_science_agent import DataScienceAgent
+    # Productivity agents
+    'ScaffoldingAgent': '.productivity.scaffolding_agent',
+    'DocumentationAgent': '.productivity.documentation_agent',
+    'DebuggingAgent': '.productivity.debugging_agent',
+
+    # Business agents
+    'ValidationAgent': '.business.validation_agent',
+    'ArchitectureAgent': '.business.architecture_agent',
+    'LocalizationAgent': '.business.localization_agent',
+    'ComplianceAgent': '.business.compliance_agent',
+
+    # Specialized agents
+    'DataScienceAgent': '.specialized.data_science_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = [
+    'BaseAgent',
     # Infrastructure
     'DockerAgent',
     'DevOpsAgent',
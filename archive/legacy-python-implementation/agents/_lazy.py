@@ -0,0 +1,36 @@
+"""
+Lazy Exports - PEP 562 module __getattr__ for the agents packages
+
+The agents package and its subpackages name their agent classes without
+importing them; a class is imported the first time it is accessed, so
+`import agents` (or importing one agent module) doesn't load every agent.
+"""
+
+import importlib
+import sys
+
+
+def lazy_loader(package: str, exports: dict):
+    """
+    Module-level __getattr__ and __dir__ for `package`
+
+    Args:
+        package: __name__ of the package
+        exports: Attribute name -> relative module defining it
+
+    Returns:
+        (__getattr__, __dir__) to assign at module level
+    """
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Cache on the package so later lookups don't go through __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,393 @@
+"""
+Base Agent - Shared client handling and request path for all specialized agents
+
+Subclasses provide `system_prompt`, `_build_prompt` and `_parse_response`,
+and may override `max_tokens`. Every request goes through `_create_message`,
+which applies the process-wide rate limiter, and parsed results are served
+from the process-wide response cache when one is configured. Clients come
+from utils.transport, so a record/replay transport can stand in for the API.
+aexecute() is the coroutine counterpart of execute(): it shares the prompt,
+cache and parse phases and only sends the request through an async client
+from utils.transport, so one event loop can drive many concurrent agent
+calls.
+
+By default every agent uses the transport's shared client (one connection
+pool per API key); a client can also be injected through the constructor.
+
+Every execute() is reported to the process-wide metrics registry
+(utils.metrics) with its latency, outcome and token usage, and its phases
+are recorded as spans when tracing (utils.tracing) is enabled.
+
+Context is packed into the agent's `context_budget` (estimated tokens)
+before the prompt is built; results report what was cut under
+"context_packing".
+
+The system prompt (and a SharedContext, when one is passed) is sent as
+cacheable prompt-prefix blocks; results report the call's token usage,
+including prompt cache reads and writes, under "usage".
+
+Identical requests that are already in flight are coalesced
+(utils.singleflight): the caller waits for the running call and gets a copy
+of its result, marked "coalesced" and without "usage".
+"""
+
+from collections import deque
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.context_packer import pack_context
+from utils.metrics import record_request
+from utils.prompt_cache import SharedContext, cached_block, response_usage
+from utils.rate_limiter import get_rate_limiter
+from utils.response_cache import get_response_cache, make_response_key
+from utils.singleflight import get_singleflight
+from utils.tracing import span
+from utils.transport import create_async_client, create_client
+
+
+class BaseAgent:
+    max_tokens = 6000
+    # Estimated tokens of context per request: agents that audit whole
+    # codebases raise it, generators working from a short spec lower it
+    context_budget = 24000
+    # Set by AgentRegistry to the name the agent is registered under
+    name: Optional[str] = None
+
+    def __init__(self, api_key: str = None, client: Any = None, async_client: Any = None):
+        """
+        Args:
+            api_key: API key for clients created from the transport
+            client: Client to use instead of the transport's shared client
+                (e.g. one pooled client injected into every agent)
+            async_client: Async client for aexecute (default: the transport's
+                shared async client of the running event loop)
+        """
+        self.client = client if client is not None else create_client(api_key)
+        self._api_key = api_key
+        self._async_client = async_client
+        self.model = "claude-sonnet-4-20250514"
+        self.system_prompt = ""
+
+    def execute(self, task: str, context: dict = None, use_cache: bool = True,
+                shared_context: SharedContext = None) -> dict:
+        """
+        Execute a task with this agent
+        
+        Args:
+            task: The task to perform
+            context: Agent-specific context (code, language, platform, etc.)
+            use_cache: Serve/store the result in the response cache if configured
+            shared_context: Context block shared with other agents of the same
+                run; its values are sent once as a cached prefix
+        
+        Returns:
+            dict with 'response', the artifacts extracted by _parse_response,
+            'usage' (token counts, absent when served from the response cache)
+            and 'context_packing' when the context had to be cut to fit
+        """
+        started = time.monotonic()
+        try:
+            with span(f"agent:{self.metrics_name}", model=self.model) as span_args:
+                result = self._execute(task, context, use_cache, shared_context)
+                span_args["cached"] = "usage" not in result
+        except Exception as error:
+            record_request(self.metrics_name, self.model, time.monotonic() - started, "error", error=error)
+            raise
+        self._record_result(result, started)
+        return result
+
+    def _execute(self, task: str, context: dict, use_cache: bool, shared_context: SharedContext) -> dict:
+        pending = self._begin(task, context, use_cache, shared_context)
+        if pending.cached is not None:
+            return pending.cached
+        flight = get_singleflight()
+        if flight is None:
+            return self._call_model(pending)
+        result, shared = flight.do(pending.key, lambda: self._call_model(pending))
+        return self._coalesced(result) if shared else result
+
+    def _call_model(self, pending: SimpleNamespace) -> dict:
+        with span("request", category="network"):
+            response = self._create_message(pending.messages, system=pending.system)
+        return self._finish(pending, response)
+
+    async def aexecute(self, task: str, context: dict = None, use_cache: bool = True,
+                       shared_context: SharedContext = None) -> dict:
+        """Coroutine version of execute(), sending the request with the async client"""
+        started = time.monotonic()
+        try:
+            with span(f"agent:{self.metrics_name}", model=self.model) as span_args:
+                result = await self._aexecute(task, context, use_cache, shared_context)
+                span_args["cached"] = "usage" not in result
+        except Exception as error:
+            record_request(self.metrics_name, self.model, time.monotonic() - started, "error", error=error)
+            raise
+        self._record_result(result, started)
+        return result
+
+    async def _aexecute(self, task: str, context: dict, use_cache: bool, shared_context: SharedContext) -> dict:
+        pending = self._begin(task, context, use_cache, shared_context)
+        if pending.cached is not None:
+            return pending.cached
+        flight = get_singleflight()
+        if flight is None:
+            return await self._acall_model(pending)
+        result, shared = await flight.ado(pending.key, lambda: self._acall_model(pending))
+        return self._coalesced(result) if shared else result
+
+    async def _acall_model(self, pending: SimpleNamespace) -> dict:
+        with span("request", category="network"):
+            response = await self._acreate_message(pending.messages, system=pending.system)
+        return self._finish(pending, response)
+
+    @staticmethod
+    def _coalesced(result: dict) -> dict:
+        """A result shared from another caller's call: its tokens were billed to that call"""
+        result.pop("usage", None)
+        result["coalesced"] = True
+        return result
+
+    def _begin(self, task: str, context: dict, use_cache: bool, shared_context: SharedContext) -> SimpleNamespace:
+        """
+        Build the request; `key` identifies identical requests and `cached` is
+        set when the response cache already has the result
+        """
+        with span("build_prompt"):
+            prompt, packing = self._prepare_prompt(task, context, shared_context)
+        pending = SimpleNamespace(
+            messages=[{"role": "user", "content": prompt}],
+            system=self._system_blocks(shared_context),
+            packing=packing,
+            cache=get_response_cache() if use_cache else None,
+            key=self._response_key(prompt, shared_context),
+            cached=None
+        )
+        if pending.cache is not None:
+            with span("response_cache_lookup"):
+                pending.cached = pending.cache.get(pending.key)
+        return pending
+
+    def _finish(self, pending: SimpleNamespace, response) -> dict:
+        """Parse a response into the result, storing it in the response cache"""
+        with span("parse"):
+            result = self._parse_response(response)
+        if pending.packing is not None:
+            result["context_packing"] = pending.packing
+        
+        if pending.cache is not None:
+            pending.cache.set(pending.key, result)
+        result["usage"] = response_usage(response)
+        return result
+
+    def execute_stream(self, task: str, context: dict = None, use_cache: bool = True,
+                       shared_context: SharedContext = None) -> Iterator[dict]:
+        """
+        Execute a task, yielding events while the response streams in
+        
+        Yields dicts with a "type" of:
+            text: {"text"} - a text delta as received from the model
+            artifact: {"kind", "artifact", "id", "revised"} - an item extracted
+                by _parse_response (config, Dockerfile, test file, vulnerability,
+                ...), emitted as soon as the fenced block that completes it closes
+            result: {"result"} - the full parsed result, same as execute()
+        
+        Items derived from prose (e.g. a vulnerability description) can keep
+        growing after they are first emitted; each change is emitted again
+        with the same "id" and "revised" set, replacing the earlier event.
+        The final "result" event is authoritative.
+        """
+        started = time.monotonic()
+        try:
+            with span(f"agent_stream:{self.metrics_name}", model=self.model):
+                for event in self._stream_events(task, context, use_cache, shared_context):
+                    if event["type"] == "result":
+                        self._record_result(event["result"], started)
+                    yield event
+        except Exception as error:
+            record_request(self.metrics_name, self.model, time.monotonic() - started, "error", error=error)
+            raise
+
+    def _stream_events(self, task: str, context: dict, use_cache: bool,
+                       shared_context: SharedContext) -> Iterator[dict]:
+        with span("build_prompt"):
+            prompt, packing = self._prepare_prompt(task, context, shared_context)
+        
+        cache = get_response_cache() if use_cache else None
+        if cache is not None:
+            cache_key = self._response_key(prompt, shared_context)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                yield {"type": "text", "text": cached.get("response", "")}
+                yield from _ArtifactTracker().update(cached)
+                yield {"type": "result", "result": cached}
+                return
+        
+        artifacts = _ArtifactTracker()
+        text = ""
+        scanned = 0
+        in_block = False
+        
+        with get_rate_limiter().stream(
+            self.client,
+            agent=self.metrics_name,
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=self._system_blocks(shared_context),
+            messages=[{"role": "user", "content": prompt}]
+        ) as stream:
+            for delta in stream.text_stream:
+                yield {"type": "text", "text": delta}
+                text += delta
+                
+                # Track fences on complete lines; parse whenever a block closes
+                newline = text.find("\n", scanned)
+                while newline != -1:
+                    if text[scanned:newline].lstrip().startswith("```"):
+                        in_block = not in_block
+                        if not in_block:
+                            partial = self._parse_response(_text_response(text[:newline + 1]))
+                            yield from artifacts.update(partial)
+                    scanned = newline + 1
+                    newline = text.find("\n", scanned)
+            
+            final_message = stream.get_final_message()
+        
+        with span("parse"):
+            result = self._parse_response(final_message)
+        if packing is not None:
+            result["context_packing"] = packing
+        yield from artifacts.update(result)
+        
+        if cache is not None:
+            cache.set(cache_key, result)
+        result["usage"] = response_usage(final_message)
+        yield {"type": "result", "result": result}
+    
+    @property
+    def metrics_name(self) -> str:
+        """Agent label used in metrics (the registry name when known)"""
+        return self.name or type(self).__name__
+
+    def _record_result(self, result: dict, started: float) -> None:
+        # Results served from the response cache or shared from an in-flight call carry no usage
+        usage = result.get("usage")
+        if usage is not None:
+            outcome = "ok"
+        else:
+            outcome = "coalesced" if result.get("coalesced") else "cached"
+        record_request(self.metrics_name, self.model, time.monotonic() - started, outcome, usage=usage)
+
+    def _prepare_prompt(self, task: str, context: dict = None,
+                        shared_context: SharedContext = None) -> Tuple[str, Optional[dict]]:
+        """Build the prompt from the context packed into `context_budget`; return (prompt, packing report)"""
+        if shared_context is not None:
+            context = shared_context.agent_context(context)
+        context, packing = pack_context(task, context, self.context_budget)
+        return self._build_prompt(task, context), packing
+
+    def _create_message(self, messages: list, max_tokens: int = None, system: List[dict] = None):
+        """Send a request to the model through the shared rate limiter"""
+        return get_rate_limiter().call(
+            self.client,
+            agent=self.metrics_name,
+            model=self.model,
+            max_tokens=max_tokens or self.max_tokens,
+            system=system if system is not None else self._system_blocks(),
+            messages=messages
+        )
+
+    async def _acreate_message(self, messages: list, max_tokens: int = None, system: List[dict] = None):
+        """Await a request to the model with the async client through the shared rate limiter"""
+        return await get_rate_limiter().acall(
+            self.async_client,
+            agent=self.metrics_name,
+            model=self.model,
+            max_tokens=max_tokens or self.max_tokens,
+            system=system if system is not None else self._system_blocks(),
+            messages=messages
+        )
+
+    @property
+    def async_client(self):
+        """Async client used by aexecute: the injected one or the transport's for the running loop"""
+        if self._async_client is not None:
+            return self._async_client
+        return create_async_client(self._api_key)
+
+    def _system_blocks(self, shared_context: SharedContext = None) -> List[dict]:
+        """System prompt as cacheable blocks; a shared context goes first so agents share its prefix"""
+        blocks = [shared_context.block] if shared_context is not None else []
+        if self.system_prompt:
+            blocks.append(cached_block(self.system_prompt))
+        return blocks
+
+    def _response_key(self, prompt: str, shared_context: SharedContext = None) -> str:
+        system = self.system_prompt
+        if shared_context is not None:
+            system = f"{shared_context.text}\x00{system}"
+        return make_response_key(type(self).__name__, self.model, system, prompt, self.max_tokens)
+
+    def _build_prompt(self, task: str, context: dict = None) -> str:
+        raise NotImplementedError
+
+    def _parse_response(self, response) -> dict:
+        raise NotImplementedError
+
+
+def _text_response(text: str) -> SimpleNamespace:
+    """Minimal stand-in for a Message so _parse_response can run on partial text"""
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+class _ArtifactTracker:
+    """
+    Turns successive parses of a streaming response into artifact events
+    
+    Items keep their id by content, not position: parsers build lists like
+    dockerfiles + compose_files, so an item can move as later blocks close.
+    An item that changed since the last parse takes the id of the item it
+    replaced, matched in list order.
+    """
+
+    def __init__(self):
+        # kind -> [(id, fingerprint)] in the order of the last parse
+        self._slots: Dict[str, List[Tuple[str, str]]] = {}
+        self._assigned: Dict[str, int] = {}
+
+    def update(self, result: dict) -> Iterator[dict]:
+        """Yield events for the new and changed list items of a parsed result"""
+        lists = []
+        for key, value in result.items():
+            if isinstance(value, list):
+                lists.append((key, value))
+            elif isinstance(value, dict):
+                lists.extend((f"{key}.{sub}", items) for sub, items in value.items() if isinstance(items, list))
+        
+        for kind, items in lists:
+            previous = self._slots.get(kind, [])
+            unchanged: Dict[str, deque] = {}
+            for artifact_id, fingerprint in previous:
+                unchanged.setdefault(fingerprint, deque()).append(artifact_id)
+            
+            fingerprints = [json.dumps(item, sort_keys=True, default=str) for item in items]
+            slots: List[Optional[Tuple[str, str]]] = []
+            for fingerprint in fingerprints:
+                ids = unchanged.get(fingerprint)
+                slots.append((ids.popleft(), fingerprint) if ids else None)
+            
+            kept = {slot[0] for slot in slots if slot is not None}
+            replaced = deque(artifact_id for artifact_id, _ in previous if artifact_id not in kept)
+            for index, item in enumerate(items):
+                if slots[index] is not None:
+                    continue
+                revised = bool(replaced)
+                if revised:
+                    artifact_id = replaced.popleft()
+                else:
+                    self._assigned[kind] = self._assigned.get(kind, 0) + 1
+                    artifact_id = f"{kind}:{self._assigned[kind]}"
+                slots[index] = (artifact_id, fingerprints[index])
+                yield {"type": "artifact", "kind": kind, "artifact": item, "id": artifact_id, "revised": revised}
+            self._slots[kind] = slots
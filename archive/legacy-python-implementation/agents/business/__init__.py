@@ -1,8 +1,15 @@
 """Business agents for Validation, Architecture, Localization, and Compliance"""
 
-from .validation_agent import ValidationAgent
-from .architecture_agent import ArchitectureAgent
-from .localization_agent import LocalizationAgent
-from .compliance_agent import ComplianceAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'ValidationAgent': '.validation_agent',
+    'ArchitectureAgent': '.architecture_agent',
+    'LocalizationAgent': '.localization_agent',
+    'ComplianceAgent': '.compliance_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['ValidationAgent', 'ArchitectureAgent', 'LocalizationAgent', 'ComplianceAgent']
@@ -2,13 +2,23 @@
 Architecture Agent - Specialized agent for software architecture design
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, blocks_in, marked_lines, response_text
 
-class ArchitectureAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("diagrams", blocks_in(['mermaid', 'plantuml', 'yaml', 'json']))
+    .line("decisions", marked_lines(['decision', 'choose', 'use', 'adopt', 'pattern'], min_length=20))
+)
+
+
+class ArchitectureAgent(BaseAgent):
+    max_tokens = 8000
+    context_budget = 40000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a software architecture specialist with expertise in:
 
@@ -113,18 +123,6 @@ Best practices:
 - Evolutionary architecture
 - Balance consistency and complexity"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=8000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -143,25 +141,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        diagrams = []
-        
-        for language, code in code_blocks:
-            if language.lower() in ['mermaid', 'plantuml', 'yaml', 'json']:
-                diagrams.append({"language": language, "content": code.strip()})
-        
-        # Extract architectural decisions
-        decisions = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['decision', 'choose', 'use', 'adopt', 'pattern']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 20:
-                    decisions.append(clean)
-        
-        return {"response": text_content, "diagrams": diagrams, "decisions": decisions[:10]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "diagrams": parsed["diagrams"], "decisions": parsed["decisions"][:10]}
 
 
 if __name__ == "__main__":
@@ -2,13 +2,22 @@
 Compliance Agent - Specialized agent for regulatory compliance
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class ComplianceAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("implementations", code_block)
+    .line("requirements", marked_lines(['must', 'required', 'mandatory', 'shall', 'comply'], min_length=20, max_length=250))
+)
+
+
+class ComplianceAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a compliance specialist with expertise in:
 
@@ -112,18 +121,6 @@ Best practices:
 - Encrypt sensitive data
 - Regular vulnerability scanning"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -142,24 +139,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        implementations = []
-        
-        for language, code in code_blocks:
-            implementations.append({"language": language, "content": code.strip()})
-        
-        # Extract compliance requirements
-        requirements = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['must', 'required', 'mandatory', 'shall', 'comply']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 20 and len(clean) < 250:
-                    requirements.append(clean)
-        
-        return {"response": text_content, "implementations": implementations, "requirements": requirements[:15]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "implementations": parsed["implementations"], "requirements": parsed["requirements"][:15]}
 
 
 if __name__ == "__main__":
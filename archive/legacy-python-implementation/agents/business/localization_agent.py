@@ -2,13 +2,18 @@
 Localization/i18n Agent - Specialized agent for internationalization
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, response_text
 
-class LocalizationAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = ResponseParser().block("translation_files", code_block)
+
+
+class LocalizationAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
 
         self.system_prompt = """You are a localization and internationalization specialist with expertise in:
 
@@ -103,18 +108,6 @@ Best practices:
 - Plan for translation workflows
 - Test with actual translated content"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-
-        return self._parse_response(response)
-
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
 
@@ -131,16 +124,8 @@ Best practices:
         return prompt
 
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        translation_files = []
-
-        for language, code in code_blocks:
-            translation_files.append({"language": language, "content": code.strip()})
-
-        return {"response": text_content, "translation_files": translation_files}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "translation_files": parsed["translation_files"]}
 
 
 if __name__ == "__main__":
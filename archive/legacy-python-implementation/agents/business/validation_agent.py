@@ -2,13 +2,22 @@
 Validation Agent - Specialized agent for input validation and data validation
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class ValidationAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("validators", code_block)
+    .line("rules", marked_lines(['must', 'should', 'required', 'validate', 'check'], min_length=15, max_length=200))
+)
+
+
+class ValidationAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a validation specialist with expertise in:
 
@@ -106,18 +115,6 @@ Best practices:
 - Document validation rules
 - Keep validation logic centralized"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -136,24 +133,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        validators = []
-        
-        for language, code in code_blocks:
-            validators.append({"language": language, "content": code.strip()})
-        
-        # Extract validation rules
-        rules = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['must', 'should', 'required', 'validate', 'check']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 15 and len(clean) < 200:
-                    rules.append(clean)
-        
-        return {"response": text_content, "validators": validators, "rules": rules[:12]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "validators": parsed["validators"], "rules": parsed["rules"][:12]}
 
 
 if __name__ == "__main__":
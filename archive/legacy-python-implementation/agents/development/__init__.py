@@ -1,7 +1,14 @@
 """Development agents for Database, Frontend, and Mobile"""
 
-from .database_agent import DatabaseAgent
-from .frontend_agent import FrontendAgent
-from .mobile_agent import MobileAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'DatabaseAgent': '.database_agent',
+    'FrontendAgent': '.frontend_agent',
+    'MobileAgent': '.mobile_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['DatabaseAgent', 'FrontendAgent', 'MobileAgent']
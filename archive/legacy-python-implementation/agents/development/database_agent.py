@@ -9,15 +9,36 @@ This agent handles:
 - Database seeding
 """
 
-from anthropic import Anthropic
 import json
-import os
 from typing import List, Dict, Optional
 
-class DatabaseAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, response_text
+
+
+def _classify_block(language: str, code: str):
+    language_lower = language.lower()
+    block = {"language": language, "content": code.strip()}
+    if language_lower in ['sql', 'postgresql', 'mysql']:
+        code_lower = code.lower()
+        if 'create table' in code_lower:
+            return "schemas", block
+        if 'alter table' in code_lower or 'add column' in code_lower:
+            return "migrations", block
+        return "queries", block
+    if language_lower == 'python' and 'class' in code and ('Base' in code or 'Model' in code):
+        return "schemas", block
+    return None
+
+
+RESPONSE_PARSER = ResponseParser().block_choice(["schemas", "queries", "migrations"], _classify_block)
+
+
+class DatabaseAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a database specialist agent with expertise in:
 
@@ -90,18 +111,6 @@ When designing databases:
 - Implement soft deletes when appropriate
 - Use database constraints to enforce business rules"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -122,38 +131,14 @@ When designing databases:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = ""
-        schemas = []
-        queries = []
-        migrations = []
-        
-        for block in response.content:
-            if block.type == "text":
-                text_content += block.text
-        
-        import re
-        code_pattern = r"```(\w+)\n(.*?)```"
-        code_blocks = re.findall(code_pattern, text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            if language.lower() in ['sql', 'postgresql', 'mysql']:
-                if 'create table' in code.lower():
-                    schemas.append({"language": language, "content": code.strip()})
-                elif 'alter table' in code.lower() or 'add column' in code.lower():
-                    migrations.append({"language": language, "content": code.strip()})
-                else:
-                    queries.append({"language": language, "content": code.strip()})
-            elif language.lower() == 'python':
-                if 'class' in code and ('Base' in code or 'Model' in code):
-                    schemas.append({"language": language, "content": code.strip()})
-        
+        parsed = RESPONSE_PARSER.parse(response_text(response))
         return {
-            "response": text_content,
-            "schemas": schemas,
-            "queries": queries,
-            "migrations": migrations
+            "response": parsed.text,
+            "schemas": parsed["schemas"],
+            "queries": parsed["queries"],
+            "migrations": parsed["migrations"]
         }
-    
+
     def design_schema(self, requirements: str, database_type: str = "postgresql") -> dict:
         task = "Design a database schema based on these requirements"
         return self.execute(task, {"requirements": requirements, "database_type": database_type})
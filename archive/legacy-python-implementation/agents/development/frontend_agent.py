@@ -2,13 +2,22 @@
 Frontend Agent - Specialized agent for frontend development in Claude Code
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, blocks_in, response_text
 
-class FrontendAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("components", blocks_in(['jsx', 'tsx', 'javascript', 'typescript', 'vue', 'svelte']))
+    .block("styles", blocks_in(['css', 'scss', 'sass']))
+)
+
+
+class FrontendAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a frontend development specialist with expertise in:
 
@@ -91,18 +100,6 @@ Best practices:
 - Maintain consistent styling
 - Progressive enhancement"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -119,20 +116,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        components = []
-        styles = []
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            if language.lower() in ['jsx', 'tsx', 'javascript', 'typescript', 'vue', 'svelte']:
-                components.append({"language": language, "content": code.strip()})
-            elif language.lower() in ['css', 'scss', 'sass']:
-                styles.append({"language": language, "content": code.strip()})
-        
-        return {"response": text_content, "components": components, "styles": styles}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "components": parsed["components"], "styles": parsed["styles"]}
 
 
 if __name__ == "__main__":
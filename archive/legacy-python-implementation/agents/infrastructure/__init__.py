@@ -1,7 +1,14 @@
 """Infrastructure agents for Docker, DevOps, and Observability"""
 
-from .docker_agent import DockerAgent
-from .devops_agent import DevOpsAgent
-from .observability_agent import ObservabilityAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'DockerAgent': '.docker_agent',
+    'DevOpsAgent': '.devops_agent',
+    'ObservabilityAgent': '.observability_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['DockerAgent', 'DevOpsAgent', 'ObservabilityAgent']
@@ -9,15 +9,52 @@ This agent handles:
 - Cloud platform configurations
 """
 
-from anthropic import Anthropic
 import json
-import os
 from typing import List, Dict, Optional
 
-class DevOpsAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, response_text
+
+
+CONFIG_TYPES = {
+    'yaml': 'yaml_config',
+    'yml': 'yaml_config',
+    'hcl': 'terraform',
+    'tf': 'terraform',
+    'json': 'json_config',
+    'dockerfile': 'dockerfile',
+    'bash': 'script',
+    'sh': 'script'
+}
+
+
+def _config(language: str, code: str):
+    if not language:
+        return None
+    return {
+        "type": CONFIG_TYPES.get(language.lower(), 'config'),
+        "language": language,
+        "content": code.strip()
+    }
+
+
+def _command(line: str, line_lower: str):
+    # Lines starting with a $ or > prompt
+    if line[:1] in ('$', '>'):
+        command = line[1:].strip()
+        if command:
+            return command
+    return None
+
+
+RESPONSE_PARSER = ResponseParser().block("configs", _config).line("commands", _command)
+
+
+class DevOpsAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a DevOps specialist agent with expertise in:
 
@@ -77,33 +114,6 @@ When creating DevOps configurations:
 - Consider cost optimization
 - Implement security by default"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        """
-        Execute a DevOps-related task
-        
-        Args:
-            task: The DevOps task to perform
-            context: Platform, tools, project requirements, etc.
-        
-        Returns:
-            dict with 'response', 'configs', and 'commands'
-        """
-        messages = [
-            {
-                "role": "user",
-                "content": self._build_prompt(task, context)
-            }
-        ]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -138,49 +148,13 @@ When creating DevOps configurations:
     
     def _parse_response(self, response) -> dict:
         """Parse the Claude response and extract configurations"""
-        text_content = ""
-        configs = []
-        commands = []
-        
-        for block in response.content:
-            if block.type == "text":
-                text_content += block.text
-        
-        # Extract code blocks
-        import re
-        code_pattern = r"```(\w+)\n(.*?)```"
-        code_blocks = re.findall(code_pattern, text_content, re.DOTALL)
-        
-        config_types = {
-            'yaml': 'yaml_config',
-            'yml': 'yaml_config',
-            'hcl': 'terraform',
-            'tf': 'terraform',
-            'json': 'json_config',
-            'dockerfile': 'dockerfile',
-            'bash': 'script',
-            'sh': 'script'
-        }
-        
-        for language, code in code_blocks:
-            config_type = config_types.get(language.lower(), 'config')
-            configs.append({
-                "type": config_type,
-                "language": language,
-                "content": code.strip()
-            })
-        
-        # Extract command blocks (lines starting with $, >, or common command prefixes)
-        command_pattern = r'(?:^|\n)[$>]\s*(.+?)(?=\n|$)'
-        found_commands = re.findall(command_pattern, text_content, re.MULTILINE)
-        commands.extend(found_commands)
-        
+        parsed = RESPONSE_PARSER.parse(response_text(response))
         return {
-            "response": text_content,
-            "configs": configs,
-            "commands": commands
+            "response": parsed.text,
+            "configs": parsed["configs"],
+            "commands": parsed["commands"]
         }
-    
+
     def create_pipeline(self, language: str, ci_tool: str, 
                        test_command: str = None, build_command: str = None) -> dict:
         """Create a CI/CD pipeline configuration"""
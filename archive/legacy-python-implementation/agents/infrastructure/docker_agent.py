@@ -8,14 +8,37 @@ This agent handles Docker-related tasks including:
 - Dockerfile creation and best practices
 """
 
-from anthropic import Anthropic
 import json
-import os
 
-class DockerAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, response_text
+
+
+def _dockerfile(language: str, code: str):
+    if language == 'dockerfile':
+        return {"type": "dockerfile", "content": code.strip()}
+    return None
+
+
+def _compose_file(language: str, code: str):
+    if language in ('yaml', 'yml') and ("version:" in code or "services:" in code):
+        return {"type": "docker-compose", "content": code.strip()}
+    return None
+
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("dockerfiles", _dockerfile)
+    .block("compose_files", _compose_file)
+)
+
+
+class DockerAgent(BaseAgent):
+    max_tokens = 4000
+    context_budget = 12000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a Docker specialist agent. Your expertise includes:
 
@@ -57,33 +80,6 @@ When asked to create or modify Docker configurations:
 
 Provide specific, actionable Docker commands and configurations."""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        """
-        Execute a Docker-related task
-        
-        Args:
-            task: The Docker task to perform
-            context: Additional context (current directory, project info, etc.)
-        
-        Returns:
-            dict with 'response' and 'artifacts' (Dockerfiles, compose files, etc.)
-        """
-        messages = [
-            {
-                "role": "user",
-                "content": self._build_prompt(task, context)
-            }
-        ]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -104,38 +100,10 @@ Provide specific, actionable Docker commands and configurations."""
     
     def _parse_response(self, response) -> dict:
         """Parse the Claude response and extract artifacts"""
-        text_content = ""
-        artifacts = []
-        
-        for block in response.content:
-            if block.type == "text":
-                text_content += block.text
-        
-        # Extract code blocks that look like Docker artifacts
-        import re
-        
-        # Find Dockerfiles
-        dockerfile_pattern = r"```dockerfile\n(.*?)```"
-        dockerfiles = re.findall(dockerfile_pattern, text_content, re.DOTALL)
-        for df in dockerfiles:
-            artifacts.append({
-                "type": "dockerfile",
-                "content": df.strip()
-            })
-        
-        # Find docker-compose files
-        compose_pattern = r"```ya?ml\n(.*?)```"
-        compose_files = re.findall(compose_pattern, text_content, re.DOTALL)
-        for cf in compose_files:
-            if "version:" in cf or "services:" in cf:
-                artifacts.append({
-                    "type": "docker-compose",
-                    "content": cf.strip()
-                })
-        
+        parsed = RESPONSE_PARSER.parse(response_text(response))
         return {
-            "response": text_content,
-            "artifacts": artifacts
+            "response": parsed.text,
+            "artifacts": parsed["dockerfiles"] + parsed["compose_files"]
         }
 
 
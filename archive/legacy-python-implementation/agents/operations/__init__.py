@@ -1,7 +1,14 @@
 """Operations agents for Migration, Dependency Management, and Git"""
 
-from .migration_agent import MigrationAgent
-from .dependency_agent import DependencyAgent
-from .git_agent import GitAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'MigrationAgent': '.migration_agent',
+    'DependencyAgent': '.dependency_agent',
+    'GitAgent': '.git_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['MigrationAgent', 'DependencyAgent', 'GitAgent']
@@ -2,13 +2,22 @@
 Dependency Management Agent - Specialized agent for dependency management
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class DependencyAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("configs", code_block)
+    .line("recommendations", marked_lines(['update', 'upgrade', 'remove', 'replace', 'add'], min_length=20))
+)
+
+
+class DependencyAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a dependency management specialist with expertise in:
 
@@ -87,18 +96,6 @@ Best practices:
 - Use automated update tools
 - Document dependency decisions"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -115,23 +112,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        configs = []
-        
-        for language, code in code_blocks:
-            configs.append({"language": language, "content": code.strip()})
-        
-        recommendations = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['update', 'upgrade', 'remove', 'replace', 'add']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 20:
-                    recommendations.append(clean)
-        
-        return {"response": text_content, "configs": configs, "recommendations": recommendations[:15]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "configs": parsed["configs"], "recommendations": parsed["recommendations"][:15]}
 
 
 if __name__ == "__main__":
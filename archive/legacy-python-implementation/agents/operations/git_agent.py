@@ -2,13 +2,38 @@
 Git Agent - Specialized agent for Git operations and workflows
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, response_text
 
-class GitAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+def _commit_message(language: str, code: str):
+    if language in ('', 'bash', 'shell', 'git') and 'git commit' in code:
+        return code.strip()
+    return None
+
+
+def _git_command(line: str, line_lower: str):
+    command = line.strip()
+    if command[:1] in ('$', '>'):
+        command = command[1:].lstrip()
+    if command.startswith('git ') and len(command) > 4:
+        return command
+    return None
+
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("commit_messages", _commit_message)
+    .line("commands", _git_command)
+)
+
+
+class GitAgent(BaseAgent):
+    max_tokens = 4000
+    context_budget = 16000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a Git specialist with expertise in:
 
@@ -102,18 +127,6 @@ Best practices:
 - Document workflows
 - Protect main branch"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=4000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -130,24 +143,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        
-        # Extract commit messages
-        commit_messages = []
-        code_blocks = re.findall(r"```(?:bash|shell|git)?\n(.*?)```", text_content, re.DOTALL)
-        for block in code_blocks:
-            if 'git commit' in block:
-                commit_messages.append(block.strip())
-        
-        # Extract git commands
-        commands = []
-        git_pattern = r'(?:^|\n)(?:\$|>)?\s*(git [^\n]+)'
-        git_commands = re.findall(git_pattern, text_content, re.MULTILINE)
-        commands.extend(git_commands)
-        
-        return {"response": text_content, "commit_messages": commit_messages, "commands": commands}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "commit_messages": parsed["commit_messages"], "commands": parsed["commands"]}
 
 
 if __name__ == "__main__":
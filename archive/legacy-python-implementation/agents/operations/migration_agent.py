@@ -2,13 +2,23 @@
 Migration Agent - Specialized agent for system and code migrations
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class MigrationAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("migration_scripts", code_block)
+    .line("steps", marked_lines(['step', 'phase', 'stage'], clean=False))
+)
+
+
+class MigrationAgent(BaseAgent):
+    max_tokens = 6000
+    context_budget = 32000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a migration specialist with expertise in:
 
@@ -90,18 +100,6 @@ Best practices:
 - Migrate incrementally when possible
 - Validate data integrity"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -118,22 +116,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        migration_scripts = []
-        
-        for language, code in code_blocks:
-            migration_scripts.append({"language": language, "content": code.strip()})
-        
-        # Extract steps/phases
-        steps = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['step', 'phase', 'stage']):
-                steps.append(line.strip())
-        
-        return {"response": text_content, "migration_scripts": migration_scripts, "steps": steps[:10]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "migration_scripts": parsed["migration_scripts"], "steps": parsed["steps"][:10]}
 
 
 if __name__ == "__main__":
@@ -1,7 +1,14 @@
 """Productivity agents for Scaffolding, Documentation, and Debugging"""
 
-from .scaffolding_agent import ScaffoldingAgent
-from .documentation_agent import DocumentationAgent
-from .debugging_agent import DebuggingAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'ScaffoldingAgent': '.scaffolding_agent',
+    'DocumentationAgent': '.documentation_agent',
+    'DebuggingAgent': '.debugging_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['ScaffoldingAgent', 'DocumentationAgent', 'DebuggingAgent']
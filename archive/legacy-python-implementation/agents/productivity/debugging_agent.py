@@ -2,13 +2,23 @@
 Debugging Agent - Specialized agent for debugging and troubleshooting
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class DebuggingAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("fixes", code_block)
+    .line("steps", marked_lines(['step', '1.', '2.', '3.', 'first', 'then', 'next'], min_length=10))
+)
+
+
+class DebuggingAgent(BaseAgent):
+    max_tokens = 6000
+    context_budget = 32000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a debugging specialist with expertise in:
 
@@ -103,18 +113,6 @@ Best practices:
 - Learn from each bug
 - Share knowledge with team"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -133,24 +131,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        fixes = []
-        
-        for language, code in code_blocks:
-            fixes.append({"language": language, "content": code.strip()})
-        
-        # Extract debugging steps
-        steps = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['step', '1.', '2.', '3.', 'first', 'then', 'next']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 10:
-                    steps.append(clean)
-        
-        return {"response": text_content, "fixes": fixes, "debugging_steps": steps[:10]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "fixes": parsed["fixes"], "debugging_steps": parsed["steps"][:10]}
 
 
 if __name__ == "__main__":
@@ -2,13 +2,18 @@
 Documentation Agent - Specialized agent for code documentation
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, response_text
 
-class DocumentationAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = ResponseParser().block("documentation", code_block)
+
+
+class DocumentationAgent(BaseAgent):
+    max_tokens = 6000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a documentation specialist with expertise in:
 
@@ -90,18 +95,6 @@ Documentation principles:
 - Version documentation with code
 - Test documentation examples"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -118,16 +111,8 @@ Documentation principles:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        documentation = []
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            documentation.append({"language": language, "content": code.strip()})
-        
-        return {"response": text_content, "documentation": documentation}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "documentation": parsed["documentation"]}
 
 
 if __name__ == "__main__":
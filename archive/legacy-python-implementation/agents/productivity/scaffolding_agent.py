@@ -2,13 +2,30 @@
 Scaffolding Agent - Specialized agent for project scaffolding and boilerplate
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, response_text
 
-class ScaffoldingAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+def _structure_line(line: str, line_lower: str):
+    stripped = line.strip()
+    if '/' in line or '├──' in line or '└──' in line or stripped.endswith('/'):
+        return stripped
+    return None
+
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("files", code_block)
+    .line("structure", _structure_line)
+)
+
+
+class ScaffoldingAgent(BaseAgent):
+    max_tokens = 8000
+    context_budget = 8000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a project scaffolding specialist with expertise in:
 
@@ -98,18 +115,6 @@ Best practices:
 - Add logging setup
 - Include security basics"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=8000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -128,22 +133,8 @@ Best practices:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        files = []
-        
-        for language, code in code_blocks:
-            files.append({"language": language, "content": code.strip()})
-        
-        # Extract file structure
-        structure = []
-        for line in text_content.split('\n'):
-            if '/' in line or '├──' in line or '└──' in line or line.strip().endswith('/'):
-                structure.append(line.strip())
-        
-        return {"response": text_content, "files": files, "structure": structure[:30]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "files": parsed["files"], "structure": parsed["structure"][:30]}
 
 
 if __name__ == "__main__":
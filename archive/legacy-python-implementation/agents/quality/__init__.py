@@ -1,9 +1,16 @@
 """Quality agents for Testing, Security, Code Review, Refactoring, and Performance"""
 
-from .test_suite_agent import TestSuiteAgent
-from .security_agent import SecurityAgent
-from .code_review_agent import CodeReviewAgent
-from .refactoring_agent import RefactoringAgent
-from .performance_agent import PerformanceAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'TestSuiteAgent': '.test_suite_agent',
+    'SecurityAgent': '.security_agent',
+    'CodeReviewAgent': '.code_review_agent',
+    'RefactoringAgent': '.refactoring_agent',
+    'PerformanceAgent': '.performance_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['TestSuiteAgent', 'SecurityAgent', 'CodeReviewAgent', 'RefactoringAgent', 'PerformanceAgent']
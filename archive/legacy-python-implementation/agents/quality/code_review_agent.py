@@ -2,13 +2,36 @@
 Code Review Agent - Specialized agent for code review
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, response_text
 
-class CodeReviewAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+# Checked in order; a line lands in the first bucket whose markers it contains
+REVIEW_MARKERS = [
+    ("critical", ['critical', '🔴', 'must fix']),
+    ("major", ['major', 'important', '🟠']),
+    ("minor", ['minor', '🟡']),
+    ("suggestions", ['suggest', 'consider', 'could', '💡']),
+    ("positives", ['good', 'well done', 'nice', '✅', '👍']),
+]
+
+
+def _review_line(line: str, line_lower: str):
+    for bucket, markers in REVIEW_MARKERS:
+        if any(marker in line_lower for marker in markers):
+            return bucket, line.strip()
+    return None
+
+
+RESPONSE_PARSER = ResponseParser().line_choice([bucket for bucket, _ in REVIEW_MARKERS], _review_line)
+
+
+class CodeReviewAgent(BaseAgent):
+    max_tokens = 6000
+    context_budget = 48000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a code review specialist with expertise in:
 
@@ -84,18 +107,6 @@ Review principles:
 - Consider maintainability
 - Think about future developers"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -110,25 +121,9 @@ Review principles:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        issues = {"critical": [], "major": [], "minor": [], "suggestions": []}
-        positives = []
-        
-        for line in text_content.split('\n'):
-            line_lower = line.lower()
-            if any(marker in line_lower for marker in ['critical', '🔴', 'must fix']):
-                issues["critical"].append(line.strip())
-            elif any(marker in line_lower for marker in ['major', 'important', '🟠']):
-                issues["major"].append(line.strip())
-            elif any(marker in line_lower for marker in ['minor', '🟡']):
-                issues["minor"].append(line.strip())
-            elif any(marker in line_lower for marker in ['suggest', 'consider', 'could', '💡']):
-                issues["suggestions"].append(line.strip())
-            elif any(marker in line_lower for marker in ['good', 'well done', 'nice', '✅', '👍']):
-                positives.append(line.strip())
-        
-        return {"response": text_content, "issues": issues, "positives": positives[:5]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        issues = {bucket: parsed[bucket] for bucket in ("critical", "major", "minor", "suggestions")}
+        return {"response": parsed.text, "issues": issues, "positives": parsed["positives"][:5]}
 
 
 if __name__ == "__main__":
@@ -2,13 +2,23 @@
 Performance Optimization Agent - Specialized agent for performance optimization
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class PerformanceAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("optimizations", code_block)
+    .line("recommendations", marked_lines(['optimize', 'improve', 'reduce', 'increase', 'cache'], min_length=20))
+)
+
+
+class PerformanceAgent(BaseAgent):
+    max_tokens = 6000
+    context_budget = 40000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a performance optimization specialist with expertise in:
 
@@ -89,18 +99,6 @@ Optimization principles:
 - Set performance budgets
 - Monitor continuously"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -117,23 +115,8 @@ Optimization principles:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        optimizations = []
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            optimizations.append({"language": language, "content": code.strip()})
-        
-        recommendations = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['optimize', 'improve', 'reduce', 'increase', 'cache']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 20:
-                    recommendations.append(clean)
-        
-        return {"response": text_content, "optimizations": optimizations, "recommendations": recommendations[:10]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "optimizations": parsed["optimizations"], "recommendations": parsed["recommendations"][:10]}
 
 
 if __name__ == "__main__":
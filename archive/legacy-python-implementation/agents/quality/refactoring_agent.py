@@ -2,13 +2,23 @@
 Refactoring Agent - Specialized agent for code refactoring
 """
 
-from anthropic import Anthropic
-import os
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, code_block, marked_lines, response_text
 
-class RefactoringAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("refactored_code", code_block)
+    .line("smells", marked_lines(['smell', 'issue', 'problem', 'violation'], min_length=20))
+)
+
+
+class RefactoringAgent(BaseAgent):
+    max_tokens = 6000
+    context_budget = 40000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a code refactoring specialist with expertise in:
 
@@ -90,18 +100,6 @@ Refactoring principles:
 - Commit frequently
 - Use IDE refactoring tools when available"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        messages = [{"role": "user", "content": self._build_prompt(task, context)}]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -116,23 +114,8 @@ Refactoring principles:
         return prompt
     
     def _parse_response(self, response) -> dict:
-        text_content = "".join(block.text for block in response.content if block.type == "text")
-        
-        import re
-        refactored_code = []
-        code_blocks = re.findall(r"```(\w+)\n(.*?)```", text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            refactored_code.append({"language": language, "content": code.strip()})
-        
-        smells = []
-        for line in text_content.split('\n'):
-            if any(marker in line.lower() for marker in ['smell', 'issue', 'problem', 'violation']):
-                clean = line.strip().lstrip('•-*123456789. ')
-                if len(clean) > 20:
-                    smells.append(clean)
-        
-        return {"response": text_content, "refactored_code": refactored_code, "smells_found": smells[:10]}
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+        return {"response": parsed.text, "refactored_code": parsed["refactored_code"], "smells_found": parsed["smells"][:10]}
 
 
 if __name__ == "__main__":
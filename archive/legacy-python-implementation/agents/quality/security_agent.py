@@ -10,15 +10,201 @@ This agent handles:
 - Secure coding recommendations
 """
 
-from anthropic import Anthropic
 import json
-import os
-from typing import List, Dict, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 
-class SecurityAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+from ..base_agent import BaseAgent
+from utils.code_chunker import CodeChunk, chunk_code
+from utils.prompt_cache import sum_usage
+from utils.response_parser import ResponseParser, clean_line, response_text
+
+
+def _secure_example(language: str, code: str):
+    if language and any(term in code.lower() for term in ['secure', 'fixed', 'safe', 'correct']):
+        return {"language": language, "code": code.strip()}
+    return None
+
+
+RESPONSE_PARSER = ResponseParser().block("secure_examples", _secure_example)
+
+# Severity markers (case-insensitive) and CWE/CVE references (case-sensitive),
+# found together in one scan of each line
+FINDING_PATTERN = re.compile(
+    r"(?P<reference>CWE-\d+|CVE-\d{4}-\d+)"
+    r"|(?P<CRITICAL>(?i:critical)|🔴)"
+    r"|(?P<HIGH>(?i:high)|🟠)"
+    r"|(?P<MEDIUM>(?i:medium)|🟡)"
+    r"|(?P<LOW>(?i:low)|🟢)"
+)
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+
+RECOMMENDATION_MARKERS = [
+    'recommend', 'should', 'must', 'always', 'never',
+    'best practice', 'ensure', 'use', 'avoid', 'implement'
+]
+
+MAX_VULNERABILITIES = 20
+MAX_RECOMMENDATIONS = 15
+
+ANALYZE_TASK = "Perform a comprehensive security analysis of this code"
+
+# "line 42", "lines 10-12", "L42", "file.py:42"
+LOCATION_PATTERN = re.compile(r"\b(?:lines?\s+|L)(\d+)|\.\w+:(\d+)\b", re.IGNORECASE)
+
+
+def extract_vulnerabilities(text: str, limit: int = MAX_VULNERABILITIES) -> List[Dict]:
+    """
+    Split a report into vulnerabilities, one per line carrying a severity marker
+
+    Each line is scanned once for severity markers and CWE/CVE references; the
+    highest severity on a line wins. Following lines without a severity word
+    form the description (from the second line after the title on).
+
+    Args:
+        text: Response text
+        limit: Maximum number of vulnerabilities returned
+
+    Returns:
+        Vulnerabilities with severity, title, description, line_number and,
+        when present, references
+    """
+    vulnerabilities = []
+    current = None
+    description: List[str] = []
+    references: List[str] = []
+
+    def close():
+        current["description"] = "".join(description)
+        if references:
+            current["references"] = list(references)
+        vulnerabilities.append(current)
+
+    for index, line in enumerate(text.split("\n")):
+        severity = None
+        line_references = []
+        for match in FINDING_PATTERN.finditer(line):
+            kind = match.lastgroup
+            if kind == "reference":
+                line_references.append(match.group())
+            elif severity is None or SEVERITY_RANK[kind] < SEVERITY_RANK[severity]:
+                severity = kind
+
+        if severity is not None:
+            if current is not None:
+                close()
+                if len(vulnerabilities) >= limit:
+                    return vulnerabilities
+            current = {
+                "severity": severity,
+                "title": line.strip(),
+                "description": "",
+                "line_number": index + 1
+            }
+            description, references = [], line_references
+        elif current is not None and index > current["line_number"] and line.strip():
+            description.append(line + "\n")
+            references.extend(line_references)
+
+    if current is not None:
+        close()
+    return vulnerabilities[:limit]
+
+
+def vulnerability_location(vulnerability: Dict) -> Optional[int]:
+    """First source line number mentioned in a vulnerability's title or description"""
+    match = LOCATION_PATTERN.search(f"{vulnerability['title']}\n{vulnerability['description']}")
+    if match is None:
+        return None
+    return int(match.group(1) or match.group(2))
+
+
+def merge_chunk_results(chunks: List[CodeChunk], results: List[Optional[Dict]],
+                        errors: List[Optional[str]]) -> Dict:
+    """
+    Reduce per-chunk analyses into one result
+
+    Vulnerabilities reported for the same CWE/CVE references at the same
+    source line (or with the same title when no line is given) are merged,
+    keeping the highest severity. The merged list is ordered by severity,
+    then by location. Recommendations and secure examples are deduplicated.
+    """
+    merged: Dict[Tuple, Dict] = {}
+    recommendations: List[str] = []
+    seen_recommendations = set()
+    secure_examples: List[Dict] = []
+    seen_examples = set()
+    responses = []
+    chunk_report = []
+
+    for chunk, result, error in zip(chunks, results, errors):
+        entry = {"start_line": chunk.start_line, "end_line": chunk.end_line}
+        if error is not None:
+            entry["error"] = error
+        chunk_report.append(entry)
+        if result is None:
+            continue
+
+        responses.append(f"## Lines {chunk.start_line}-{chunk.end_line}\n\n{result['response']}")
+        for vulnerability in result.get("vulnerabilities", []):
+            location = vulnerability_location(vulnerability)
+            references = tuple(sorted(vulnerability.get("references", [])))
+            key = (references, location) if location is not None else (references, vulnerability["title"].lower())
+            candidate = dict(vulnerability, location=location, chunk=[chunk.start_line, chunk.end_line])
+            existing = merged.get(key)
+            if existing is None or SEVERITY_RANK[candidate["severity"]] < SEVERITY_RANK[existing["severity"]]:
+                merged[key] = candidate
+        for recommendation in result.get("recommendations", []):
+            if recommendation not in seen_recommendations:
+                seen_recommendations.add(recommendation)
+                recommendations.append(recommendation)
+        for example in result.get("secure_examples", []):
+            if example["code"] not in seen_examples:
+                seen_examples.add(example["code"])
+                secure_examples.append(example)
+
+    no_location = float("inf")
+    vulnerabilities = sorted(
+        merged.values(),
+        key=lambda v: (SEVERITY_RANK[v["severity"]], v["location"] if v["location"] is not None else no_location)
+    )
+    return {
+        "response": "\n\n".join(responses),
+        "vulnerabilities": vulnerabilities,
+        "recommendations": recommendations,
+        "secure_examples": secure_examples,
+        "chunks": chunk_report,
+        "usage": sum_usage([result.get("usage") for result in results if result is not None])
+    }
+
+
+def extract_recommendations(text: str, limit: int = MAX_RECOMMENDATIONS) -> List[str]:
+    """Return up to `limit` distinct recommendation lines, in order of appearance"""
+    recommendations = []
+    seen = set()
+
+    for line in text.split("\n"):
+        line_lower = line.lower()
+        if not any(marker in line_lower for marker in RECOMMENDATION_MARKERS):
+            continue
+        cleaned = clean_line(line)
+        if len(cleaned) > 20 and cleaned not in seen:
+            seen.add(cleaned)
+            recommendations.append(cleaned)
+            if len(recommendations) >= limit:
+                break
+
+    return recommendations
+
+
+class SecurityAgent(BaseAgent):
+    max_tokens = 8000
+    context_budget = 60000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a security specialist agent focused on application security. Your expertise includes:
 
@@ -89,33 +275,6 @@ Always provide:
 4. Remediation steps with code examples
 5. Prevention strategies"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        """
-        Execute a security-related task
-        
-        Args:
-            task: The security task to perform
-            context: Code to analyze, dependencies, configuration, etc.
-        
-        Returns:
-            dict with 'response', 'vulnerabilities', and 'recommendations'
-        """
-        messages = [
-            {
-                "role": "user",
-                "content": self._build_prompt(task, context)
-            }
-        ]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=8000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -150,108 +309,73 @@ Always provide:
     
     def _parse_response(self, response) -> dict:
         """Parse the Claude response and extract vulnerabilities and recommendations"""
-        text_content = ""
-        
-        for block in response.content:
-            if block.type == "text":
-                text_content += block.text
-        
-        # Extract vulnerabilities (sections with severity indicators)
-        vulnerabilities = self._extract_vulnerabilities(text_content)
-        
-        # Extract recommendations
-        recommendations = self._extract_recommendations(text_content)
-        
-        # Extract secure code examples
-        import re
-        code_pattern = r"```(\w+)\n(.*?)```"
-        secure_examples = []
-        code_blocks = re.findall(code_pattern, text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            if any(term in code.lower() for term in ['secure', 'fixed', 'safe', 'correct']):
-                secure_examples.append({
-                    "language": language,
-                    "code": code.strip()
-                })
-        
+        parsed = RESPONSE_PARSER.parse(response_text(response))
+
         return {
-            "response": text_content,
-            "vulnerabilities": vulnerabilities,
-            "recommendations": recommendations,
-            "secure_examples": secure_examples
+            "response": parsed.text,
+            "vulnerabilities": self._extract_vulnerabilities(parsed.text),
+            "recommendations": self._extract_recommendations(parsed.text),
+            "secure_examples": parsed["secure_examples"]
         }
-    
+
     def _extract_vulnerabilities(self, text: str) -> List[Dict]:
         """Extract vulnerability information from text"""
-        vulnerabilities = []
-        
-        # Common severity indicators
-        severity_patterns = [
-            (r"(?:^|\n).*?(?:CRITICAL|Critical|🔴).*?(?:\n|$)", "CRITICAL"),
-            (r"(?:^|\n).*?(?:HIGH|High|🟠).*?(?:\n|$)", "HIGH"),
-            (r"(?:^|\n).*?(?:MEDIUM|Medium|🟡).*?(?:\n|$)", "MEDIUM"),
-            (r"(?:^|\n).*?(?:LOW|Low|🟢).*?(?:\n|$)", "LOW"),
-        ]
+        return extract_vulnerabilities(text)
+
+    def _extract_recommendations(self, text: str) -> List[str]:
+        """Extract security recommendations from text"""
+        return extract_recommendations(text)
+
+    def analyze_code(self, code: str, language: str, framework: str = None,
+                     chunk_lines: int = 400, max_concurrency: int = 4) -> dict:
+        """
+        Perform comprehensive security analysis on code
         
-        lines = text.split('\n')
-        current_vuln = None
+        Sources longer than `chunk_lines` lines are split at function/class
+        boundaries and the chunks are analysed concurrently (map-reduce), so
+        large modules are covered without truncation.
         
-        for i, line in enumerate(lines):
-            # Check for vulnerability markers
-            for pattern, severity in severity_patterns:
-                import re
-                if re.search(pattern, line, re.IGNORECASE):
-                    if current_vuln:
-                        vulnerabilities.append(current_vuln)
-                    
-                    current_vuln = {
-                        "severity": severity,
-                        "title": line.strip(),
-                        "description": "",
-                        "line_number": i + 1
-                    }
-                    break
-            
-            # Collect description for current vulnerability
-            if current_vuln and i > current_vuln["line_number"]:
-                if line.strip() and not any(s in line.upper() for s in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]):
-                    current_vuln["description"] += line + "\n"
+        Args:
+            code: Source to analyse
+            language: Source language
+            framework: Framework in use, if any
+            chunk_lines: Maximum lines sent in one request
+            max_concurrency: Chunks analysed at once
         
-        if current_vuln:
-            vulnerabilities.append(current_vuln)
+        Returns:
+            dict like execute(); chunked analyses also report 'chunks'
+        """
+        chunks = chunk_code(code, language, chunk_lines)
+        if len(chunks) == 1:
+            return self.execute(ANALYZE_TASK, self._analysis_context(code, language, framework))
         
-        # Extract CWE/CVE references
-        cwe_cve_pattern = r"(CWE-\d+|CVE-\d{4}-\d+)"
-        for vuln in vulnerabilities:
-            import re
-            matches = re.findall(cwe_cve_pattern, vuln["title"] + vuln["description"])
-            if matches:
-                vuln["references"] = matches
+        total_lines = code.count("\n") + 1
         
-        return vulnerabilities[:20]  # Return top 20 vulnerabilities
-    
-    def _extract_recommendations(self, text: str) -> List[str]:
-        """Extract security recommendations from text"""
-        recommendations = []
-        lines = text.split('\n')
+        def analyse(chunk: CodeChunk) -> dict:
+            task = (f"{ANALYZE_TASK}. It is lines {chunk.start_line}-{chunk.end_line} of a "
+                    f"{total_lines}-line file; report line numbers relative to the whole file.")
+            return self.execute(task, self._analysis_context(chunk.text, language, framework))
         
-        for line in lines:
-            # Look for recommendation markers
-            if any(marker in line.lower() for marker in [
-                'recommend', 'should', 'must', 'always', 'never',
-                'best practice', 'ensure', 'use', 'avoid', 'implement'
-            ]):
-                clean_line = line.strip().lstrip('•-*123456789. ')
-                if len(clean_line) > 20 and clean_line not in recommendations:
-                    recommendations.append(clean_line)
+        results: List[Optional[dict]] = [None] * len(chunks)
+        errors: List[Optional[str]] = [None] * len(chunks)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks))),
+                                thread_name_prefix="security-chunk") as executor:
+            futures = {executor.submit(analyse, chunk): index for index, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                index = futures[future]
+                error = future.exception()
+                if error is not None:
+                    errors[index] = str(error) or type(error).__name__
+                else:
+                    results[index] = future.result()
         
-        return recommendations[:15]  # Top 15 recommendations
+        if all(result is None for result in results):
+            raise RuntimeError(f"security analysis failed for all {len(chunks)} chunks: {errors[0]}")
+        return merge_chunk_results(chunks, results, errors)
     
-    def analyze_code(self, code: str, language: str, framework: str = None) -> dict:
-        """Perform comprehensive security analysis on code"""
-        task = "Perform a comprehensive security analysis of this code"
-        context = {
+    @staticmethod
+    def _analysis_context(code: str, language: str, framework: str = None) -> dict:
+        return {
             "code": code,
             "language": language,
             "framework": framework,
@@ -263,7 +387,6 @@ Always provide:
                 "error handling"
             ]
         }
-        return self.execute(task, context)
     
     def scan_dependencies(self, dependencies: str, language: str) -> dict:
         """Scan dependencies for known vulnerabilities"""
@@ -9,15 +9,42 @@ This agent handles all testing-related tasks including:
 - Testing framework setup
 """
 
-from anthropic import Anthropic
 import json
-import os
 from typing import List, Dict, Optional
 
-class TestSuiteAgent:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
-        self.model = "claude-sonnet-4-20250514"
+from ..base_agent import BaseAgent
+from utils.response_parser import ResponseParser, response_text
+
+
+def _test_file(language: str, code: str):
+    # Identify test files by common patterns
+    code_lower = code.lower()
+    if language and any(keyword in code_lower for keyword in ['test_', 'test(', 'it(', 'describe(', 'assert', '@test']):
+        return {"language": language, "content": code.strip()}
+    return None
+
+
+def _recommendation(line: str, line_lower: str):
+    if any(marker in line_lower for marker in ['recommend', 'should', 'consider', 'important', 'note:']):
+        stripped = line.strip()
+        if len(stripped) > 10:
+            return stripped
+    return None
+
+
+RESPONSE_PARSER = (
+    ResponseParser()
+    .block("tests", _test_file)
+    .line("recommendations", _recommendation)
+)
+
+
+class TestSuiteAgent(BaseAgent):
+    max_tokens = 6000
+    context_budget = 32000
+
+    def __init__(self, api_key: str = None, client=None, async_client=None):
+        super().__init__(api_key, client, async_client)
         
         self.system_prompt = """You are a testing specialist agent focused on creating comprehensive test suites. Your expertise includes:
 
@@ -64,33 +91,6 @@ When generating tests:
 - Include setup and teardown when needed
 - Add comments for complex test scenarios"""
 
-    def execute(self, task: str, context: dict = None) -> dict:
-        """
-        Execute a testing-related task
-        
-        Args:
-            task: The testing task to perform
-            context: Code to test, language, framework, etc.
-        
-        Returns:
-            dict with 'response', 'tests', and 'recommendations'
-        """
-        messages = [
-            {
-                "role": "user",
-                "content": self._build_prompt(task, context)
-            }
-        ]
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=6000,
-            system=self.system_prompt,
-            messages=messages
-        )
-        
-        return self._parse_response(response)
-    
     def _build_prompt(self, task: str, context: dict = None) -> str:
         prompt = f"Task: {task}\n\n"
         
@@ -124,40 +124,13 @@ When generating tests:
     
     def _parse_response(self, response) -> dict:
         """Parse the Claude response and extract test code and recommendations"""
-        text_content = ""
-        test_files = []
-        recommendations = []
-        
-        for block in response.content:
-            if block.type == "text":
-                text_content += block.text
-        
-        # Extract code blocks
-        import re
-        code_pattern = r"```(\w+)\n(.*?)```"
-        code_blocks = re.findall(code_pattern, text_content, re.DOTALL)
-        
-        for language, code in code_blocks:
-            # Identify test files by common patterns
-            if any(keyword in code.lower() for keyword in ['test_', 'test(', 'it(', 'describe(', 'assert', '@test']):
-                test_files.append({
-                    "language": language,
-                    "content": code.strip()
-                })
-        
-        # Extract recommendations (lines starting with common recommendation markers)
-        lines = text_content.split('\n')
-        for line in lines:
-            if any(marker in line.lower() for marker in ['recommend', 'should', 'consider', 'important', 'note:']):
-                if len(line.strip()) > 10:
-                    recommendations.append(line.strip())
-        
+        parsed = RESPONSE_PARSER.parse(response_text(response))
         return {
-            "response": text_content,
-            "tests": test_files,
-            "recommendations": recommendations[:10]  # Top 10 recommendations
+            "response": parsed.text,
+            "tests": parsed["tests"],
+            "recommendations": parsed["recommendations"][:10]  # Top 10 recommendations
         }
-    
+
     def analyze_coverage(self, code: str, existing_tests: str, language: str) -> dict:
         """Analyze test coverage and suggest missing tests"""
         task = "Analyze the existing tests and identify coverage gaps. Suggest additional test cases needed."
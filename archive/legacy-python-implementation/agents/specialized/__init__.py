@@ -1,5 +1,12 @@
 """Specialized agents for Data Science and other specialized tasks"""
 
-from .data_science_agent import DataScienceAgent
+from .._lazy import lazy_loader
+
+# Imported on first access (PEP 562)
+_EXPORTS = {
+    'DataScienceAgent': '.data_science_agent',
+}
+
+__getattr__, __dir__ = lazy_loader(__name__, _EXPORTS)
 
 __all__ = ['DataScienceAgent']
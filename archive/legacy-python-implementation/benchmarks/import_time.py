@@ -0,0 +1,158 @@
+"""
+Import Time Benchmark - Startup cost of the agents, orchestrator and utils packages
+
+Runs `python -X importtime -c "import <target>"` in a fresh interpreter for
+each target and reports the best-of-N cumulative import time of the target
+and how many modules it pulled in. Each target also has modules it must not
+import: `import agents` must not load any agent module (they are loaded
+lazily, PEP 562) nor the anthropic SDK, and importing one agent module must
+not load the other agents.
+
+Results can be saved as a baseline and later runs compared against it; the
+run exits non-zero when a forbidden module is imported or a target is slower
+than the baseline by more than --tolerance (plus --slack-ms, since import
+times of a few milliseconds are noisy).
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --save-baseline benchmarks/import_baseline.json
+    python -m benchmarks.import_time --baseline benchmarks/import_baseline.json
+"""
+
+import argparse
+import functools
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Agent modules, e.g. agents.quality.security_agent
+AGENT_MODULE = r"agents\.\w+\.\w+_agent$"
+
+# target -> patterns of modules it must not import
+TARGETS = {
+    "agents": [AGENT_MODULE, r"anthropic(\.|$)", r"asyncio(\.|$)"],
+    "agents.infrastructure.docker_agent": [r"agents\.\w+\.(?!docker_agent$)\w+_agent$", r"anthropic(\.|$)"],
+    "orchestrator.agent_orchestrator": [AGENT_MODULE, r"anthropic(\.|$)", r"asyncio(\.|$)"],
+    "utils": [r"anthropic(\.|$)", r"asyncio(\.|$)"],
+    # The daemon client CLI must stay thin
+    "orchestrator.daemon_client": [r"agents(\.|$)", r"utils(\.|$)", r"orchestrator\.agent_orchestrator$",
+                                   r"anthropic(\.|$)", r"asyncio(\.|$)"],
+}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def import_profile(target: str) -> Tuple[float, List[str]]:
+    """Cumulative import time of `target` in ms and the modules it imported, from a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules: List[str] = []
+    # Lines are printed in completion order, so the target's own top-level
+    # line comes after every module it imported
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        modules.append(match.group(4))
+        if match.group(4) == target and match.group(3) == " ":
+            startup = _startup_modules()
+            return int(match.group(2)) / 1000.0, [name for name in modules if name not in startup]
+    raise RuntimeError(f"{target} not found in -X importtime output")
+
+
+@functools.lru_cache(maxsize=None)
+def _startup_modules() -> FrozenSet[str]:
+    """Modules the interpreter imports before running -c (encodings, site, ...)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return frozenset(
+        match.group(4) for match in map(_IMPORTTIME_LINE.match, completed.stderr.splitlines()) if match
+    )
+
+
+def measure(target: str, repeat: int) -> Dict[str, Any]:
+    """Best-of-`repeat` cumulative import time and the modules imported"""
+    best = float("inf")
+    modules: List[str] = []
+    for _ in range(repeat):
+        milliseconds, modules = import_profile(target)
+        best = min(best, milliseconds)
+    return {"ms": best, "modules": len(modules), "module_names": modules}
+
+
+def forbidden_imports(target: str, modules: List[str]) -> List[str]:
+    patterns = [re.compile(pattern) for pattern in TARGETS.get(target, [])]
+    return [name for name in dict.fromkeys(modules) if any(pattern.match(name) for pattern in patterns)]
+
+
+def regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                tolerance: float, slack_ms: float) -> List[str]:
+    """Targets whose import time grew more than `tolerance` (plus `slack_ms`) over the baseline"""
+    found = []
+    for target, stats in results.items():
+        reference = baseline.get("results", {}).get(target)
+        if reference is None:
+            continue
+        ceiling = reference["ms"] * (1.0 + tolerance) + slack_ms
+        if stats["ms"] > ceiling:
+            found.append(f"{target}: {stats['ms']:.1f} ms (baseline {reference['ms']:.1f} ms)")
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark package import time with python -X importtime")
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target (best is kept)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Allowed import time growth relative to the baseline (0.5 = 50%%)")
+    parser.add_argument("--slack-ms", type=float, default=2.0,
+                        help="Absolute growth always allowed, in milliseconds")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="List the modules each target imports")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    failures: List[str] = []
+    print(f"{'target':<40}{'ms':>9}{'modules':>9}")
+    for target in args.targets:
+        stats = measure(target, args.repeat)
+        print(f"{target:<40}{stats['ms']:>9.1f}{stats['modules']:>9}")
+        if args.verbose:
+            print("    " + ", ".join(stats["module_names"]))
+        forbidden = forbidden_imports(target, stats.pop("module_names"))
+        if forbidden:
+            failures.append(f"{target} imports {', '.join(forbidden)}")
+        results[target] = stats
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump({"python": sys.version.split()[0], "results": results}, handle, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        failures += regressions(results, baseline, args.tolerance, args.slack_ms)
+
+    if failures:
+        print("Import regressions:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("No import regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
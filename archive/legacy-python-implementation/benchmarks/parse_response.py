@@ -0,0 +1,186 @@
+"""
+Parse Response Benchmark - Throughput and memory of every agent's _parse_response
+
+Builds a deterministic synthetic corpus of agent-style responses (headings,
+severity-tagged findings, recommendations, shell commands, directory trees
+and fenced blocks in Dockerfile, compose YAML, SQL, Python, TypeScript, CSS,
+Terraform and bash) at sizes from 1 KB to 5 MB, then measures each agent's
+_parse_response: best-of-N throughput in MB/s and the tracemalloc peak.
+
+Results can be saved as a baseline and later runs compared against it; the
+run exits non-zero when any agent/size is slower than the baseline by more
+than --tolerance. No API access is needed: agents are created with a null
+transport since parsing never touches the client.
+
+Usage:
+    python -m benchmarks.parse_response --save-baseline benchmarks/parse_baseline.json
+    python -m benchmarks.parse_response --baseline benchmarks/parse_baseline.json
+    python -m benchmarks.parse_response --agents docker devops --sizes 1KB 1MB
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from orchestrator.agent_registry import DEFAULT_AGENTS, AgentRegistry
+from utils.transport import configure_transport
+
+
+SIZES = {"1KB": 1 << 10, "10KB": 10 << 10, "100KB": 100 << 10, "1MB": 1 << 20, "5MB": 5 << 20}
+
+_PROSE = [
+    "## Analysis of the {name} module",
+    "The {name} handler is called for every request and should validate its input.",
+    "- Critical: {name} builds SQL from user input (CWE-89) at line {n}",
+    "- Major: important to handle errors from {name} before retrying",
+    "- Minor: rename {name} for consistency 🟡",
+    "💡 Consider caching the result of {name} to reduce latency and improve throughput",
+    "✅ Good use of context managers in {name}, well done",
+    "HIGH: Hardcoded credential in {name}.py line {n} (CVE-2023-{n:05d})",
+    "Recommendation: always use parameterized queries and ensure secrets come from the environment",
+    "1. First, update the {name} dependency; then upgrade the lockfile",
+    "Step {n}: migrate the {name} table in phase two, then remove the old stage",
+    "Decision: adopt the repository pattern to use a single data access layer for {name}",
+    "Note: you should add tests for {name}; the requirement is mandatory and must comply with policy",
+    "$ docker compose up -d {name}",
+    "> npm run build -- --scope {name}",
+    "git checkout -b feature/{name}",
+    "src/{name}/",
+    "├── {name}.py",
+    "└── test_{name}.py",
+]
+
+_BLOCKS = [
+    ("dockerfile", "FROM python:3.12-slim\nWORKDIR /app\nCOPY . .\nRUN pip install -r requirements.txt\nCMD [\"python\", \"{name}.py\"]"),
+    ("yaml", "version: \"3.9\"\nservices:\n  {name}:\n    build: .\n    ports:\n      - \"{n}:{n}\""),
+    ("yaml", "name: ci\non: [push]\njobs:\n  test:\n    runs-on: ubuntu-latest\n    steps:\n      - run: pytest -k {name}"),
+    ("sql", "CREATE TABLE {name} (\n  id SERIAL PRIMARY KEY,\n  created_at TIMESTAMP NOT NULL\n);"),
+    ("sql", "ALTER TABLE {name} ADD COLUMN email TEXT;"),
+    ("sql", "SELECT id, email FROM {name} WHERE created_at > NOW() - INTERVAL '1 day';"),
+    ("python", "class {name}(Base):\n    __tablename__ = \"{name}\"\n\n    def test_{name}(self):\n        # secure, fixed version\n        assert self.id is not None"),
+    ("typescript", "export function {name}(props: Props) {{\n  return <div className=\"{name}\">{{props.children}}</div>;\n}}\ndescribe(\"{name}\", () => {{ it(\"renders\", () => {{}}); }});"),
+    ("css", ".{name} {{\n  display: flex;\n  gap: {n}px;\n}}"),
+    ("hcl", "resource \"aws_s3_bucket\" \"{name}\" {{\n  bucket = \"{name}-{n}\"\n}}"),
+    ("bash", "git add {name}.py\ngit commit -m \"fix({name}): validate input\""),
+    ("mermaid", "graph TD\n  client --> {name}\n  {name} --> db"),
+]
+
+
+def build_response(size: int, seed: int = 0) -> str:
+    """Deterministic response text of about `size` bytes (UTF-8)"""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        name = f"service_{rng.randrange(1000)}"
+        n = rng.randrange(1, 99999)
+        if rng.random() < 0.2:
+            language, body = rng.choice(_BLOCKS)
+            part = f"```{language}\n{body.format(name=name, n=n)}\n```"
+        else:
+            part = rng.choice(_PROSE).format(name=name, n=n)
+        parts.append(part)
+        length += len(part.encode("utf-8")) + 1
+    return "\n".join(parts)
+
+
+def _message(text: str) -> Any:
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+def measure(agent: Any, text: str, repeat: int) -> Dict[str, float]:
+    """Best-of-`repeat` throughput and the tracemalloc peak of one parse"""
+    message = _message(text)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        agent._parse_response(message)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        agent._parse_response(message)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    megabytes = len(text.encode("utf-8")) / (1 << 20)
+    return {"seconds": best, "mb_per_s": megabytes / best if best else float("inf"), "peak_kb": peak / 1024}
+
+
+def run(agent_names: List[str], size_names: List[str], repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    configure_transport(lambda api_key: None)
+    registry = AgentRegistry.with_defaults()
+    # Seeded by size so a subset of sizes sees the same corpus as a full run
+    seeds = {name: index for index, name in enumerate(SIZES)}
+    corpus = {name: build_response(SIZES[name], seed=seeds[name]) for name in size_names}
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    print(f"{'agent':<15}{'size':>7}{'ms':>11}{'MB/s':>10}{'peak KB':>12}")
+    for agent_name in agent_names:
+        agent = registry[agent_name]
+        results[agent_name] = {}
+        for size_name in size_names:
+            stats = measure(agent, corpus[size_name], repeat)
+            results[agent_name][size_name] = stats
+            print(f"{agent_name:<15}{size_name:>7}{stats['seconds'] * 1000:>11.2f}"
+                  f"{stats['mb_per_s']:>10.1f}{stats['peak_kb']:>12.0f}")
+    return results
+
+
+def regressions(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Any],
+                tolerance: float) -> List[str]:
+    """Agent/size pairs whose throughput fell more than `tolerance` below the baseline"""
+    found = []
+    for agent_name, sizes in results.items():
+        for size_name, stats in sizes.items():
+            reference: Optional[dict] = baseline.get("results", {}).get(agent_name, {}).get(size_name)
+            if reference is None:
+                continue
+            floor = reference["mb_per_s"] * (1.0 - tolerance)
+            if stats["mb_per_s"] < floor:
+                found.append(f"{agent_name} {size_name}: {stats['mb_per_s']:.1f} MB/s "
+                             f"(baseline {reference['mb_per_s']:.1f} MB/s)")
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent _parse_response implementations")
+    parser.add_argument("--agents", nargs="+", help="Agents to benchmark (default: all)")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES),
+                        help="Corpus sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per agent and size (best is kept)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed throughput drop relative to the baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    agent_names = args.agents or [name for name, _, _, _ in DEFAULT_AGENTS]
+    results = run(agent_names, args.sizes, args.repeat)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump({"python": sys.version.split()[0], "results": results}, handle, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        found = regressions(results, baseline, args.tolerance)
+        if found:
+            print("Throughput regressions:")
+            for line in found:
+                print(f"  {line}")
+            return 1
+        print("No throughput regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
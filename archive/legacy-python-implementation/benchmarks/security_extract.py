@@ -0,0 +1,103 @@
+"""
+Security Extract Benchmark - Parse cost of SecurityAgent findings on huge reports
+
+Times extract_vulnerabilities() and extract_recommendations() over generated
+audit reports of 10k to 200k lines. Each report shape stresses one of the
+paths that used to be superlinear: a single finding with a very long
+description, a report with no findings at all, long lines dense with
+references, and thousands of repeated recommendations.
+
+Exits non-zero when the per-line cost at the largest size grows more than
+--max-growth times over the smallest size.
+
+Usage:
+    python -m benchmarks.security_extract [--sizes 10000 50000 200000] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List
+
+from agents.quality.security_agent import extract_recommendations, extract_vulnerabilities
+
+
+DEFAULT_SIZES = [10000, 50000, 100000, 200000]
+
+
+def long_description(lines: int) -> str:
+    """One finding followed by a description spanning the whole report"""
+    body = [f"    at handler_{i}.py:{i} request data reaches the query builder (CWE-{i % 1000})"
+            for i in range(lines - 1)]
+    return "\n".join(["## 🔴 SQL injection in search endpoint"] + body)
+
+
+def no_findings(lines: int) -> str:
+    """Plain prose with no severity markers or recommendations"""
+    return "\n".join(f"Line {i}: the request handler parses the payload and returns" for i in range(lines))
+
+
+def dense_references(lines: int) -> str:
+    """Findings every 1000 lines, every line carrying many references"""
+    refs = " ".join(f"CVE-2024-{n:05d}" for n in range(40))
+    return "\n".join(
+        f"Medium: outdated dependency {i} {refs}" if i % 1000 == 0 else f"affected by {refs}"
+        for i in range(lines)
+    )
+
+
+def repeated_recommendations(lines: int) -> str:
+    """Mostly duplicate recommendation lines with few distinct ones"""
+    return "\n".join(
+        f"- You should validate and sanitize input for field {i % 10}" for i in range(lines)
+    )
+
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+    "long_description": long_description,
+    "no_findings": no_findings,
+    "dense_references": dense_references,
+    "repeated_recommendations": repeated_recommendations,
+}
+
+
+def time_parse(text: str, repeat: int) -> float:
+    """Best wall time in seconds of extracting vulnerabilities and recommendations"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract_vulnerabilities(text)
+        extract_recommendations(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes: List[int], repeat: int, max_growth: float) -> bool:
+    sizes = sorted(sizes)
+    linear = True
+    print(f"{'shape':<26}{'lines':>9}{'ms':>10}{'us/line':>10}")
+    for name, build in SHAPES.items():
+        per_line = []
+        for size in sizes:
+            elapsed = time_parse(build(size), repeat)
+            per_line.append(elapsed / size)
+            print(f"{name:<26}{size:>9}{elapsed * 1000:>10.1f}{elapsed / size * 1e6:>10.2f}")
+        growth = per_line[-1] / per_line[0] if per_line[0] else 1.0
+        if growth > max_growth:
+            print(f"  {name}: per-line cost grew {growth:.1f}x from {sizes[0]} to {sizes[-1]} lines")
+            linear = False
+    return linear
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark SecurityAgent response extraction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Report sizes in lines")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is reported)")
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Allowed per-line cost growth from the smallest to the largest size")
+    args = parser.parse_args()
+    return 0 if run(args.sizes, args.repeat, args.max_growth) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
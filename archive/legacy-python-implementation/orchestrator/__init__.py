@@ -1,5 +1,29 @@
 """Agent Orchestrator for managing and coordinating multiple agents"""
 
-from .agent_orchestrator import AgentOrchestrator
+import importlib
 
-__all__ = ['AgentOrchestrator']
+# Imported on first access (PEP 562), so the daemon client can import
+# orchestrator.daemon_client without loading the orchestrator itself
+_EXPORTS = {
+    'AgentOrchestrator': '.agent_orchestrator',
+    'AgentRegistry': '.agent_registry',
+    'RoutingCache': '.routing_cache',
+    'Workflow': '.workflow',
+    'WorkflowStage': '.workflow',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+__all__ = ['AgentOrchestrator', 'AgentRegistry', 'RoutingCache', 'Workflow', 'WorkflowStage']
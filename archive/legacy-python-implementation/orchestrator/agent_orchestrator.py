@@ -3,190 +3,581 @@ Agent Orchestrator - Master coordinator for all sub-agents in Claude Code
 
 This orchestrator intelligently routes tasks to the appropriate specialized agents
 and can coordinate multi-agent workflows for complex tasks.
+
+aexecute() is the asyncio counterpart of execute(): routing and agent calls
+go through async clients, so a single event loop can serve many concurrent
+tasks without a thread per in-flight request.
+
+With `speculative`, a task that needs the LLM router starts the keyword
+router's primary agent while the router request is in flight. The run is kept
+when the router picks that agent (as primary or secondary) and cancelled
+otherwise; speculation_metrics() reports the hit rate and the tokens spent on
+discarded runs. The speculative run is prompted with the run's shared context,
+so agents that join it later share its cached prefix.
 """
 
-from anthropic import Anthropic
-import os
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, as_completed, wait
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from utils.context_packer import estimate_tokens
+from utils.metrics import record_request, record_routing, record_speculation, record_speculation_waste
+from utils.prompt_cache import SharedContext, cached_block, response_usage, sum_usage
+from utils.rate_limiter import get_rate_limiter
+from utils.tracing import span
+from utils.transport import create_async_client, create_client
+
+from .agent_registry import AgentRegistry
+from .keyword_matcher import KeywordMatcher
+from .routing_cache import RoutingCache, make_routing_key
+from .workflow import Workflow
 
-# Import all specialized agents
-from docker_agent import DockerAgent
-from test_suite_agent import TestSuiteAgent
-from devops_agent import DevOpsAgent
-from security_agent import SecurityAgent
-from database_agent import DatabaseAgent
-from api_design_agent import APIDesignAgent
-from frontend_agent import FrontendAgent
-from performance_agent import PerformanceAgent
-from refactoring_agent import RefactoringAgent
-from documentation_agent import DocumentationAgent
-from code_review_agent import CodeReviewAgent
-from data_science_agent import DataScienceAgent
-from mobile_agent import MobileAgent
-from game_dev_agent import GameDevelopmentAgent
-from observability_agent import ObservabilityAgent
-from migration_agent import MigrationAgent
-from dependency_agent import DependencyAgent
-from scaffolding_agent import ScaffoldingAgent
-from git_agent import GitAgent
-from debugging_agent import DebuggingAgent
-from validation_agent import ValidationAgent
-from architecture_agent import ArchitectureAgent
-from localization_agent import LocalizationAgent
-from compliance_agent import ComplianceAgent
+
+# Keywords used by the local router (_simple_routing)
+ROUTING_KEYWORDS = {
+    "docker": ["docker", "container", "dockerfile", "compose"],
+    "testing": ["test", "unit test", "integration test", "coverage"],
+    "devops": ["cicd", "ci/cd", "deploy", "pipeline", "kubernetes", "terraform", "helm"],
+    "security": ["security", "vulnerability", "exploit", "penetration", "owasp", "cve"],
+    "database": ["database", "sql", "schema", "query", "migration", "index"],
+    "frontend": ["react", "vue", "angular", "component", "ui", "css", "html"],
+    "performance": ["performance", "optimize", "slow", "bottleneck", "latency", "profile"],
+    "refactoring": ["refactor", "clean", "improve", "smell"],
+    "documentation": ["document", "readme", "docs", "comment", "docstring"],
+    "code_review": ["review", "quality", "best practice"],
+    "debugging": ["debug", "bug", "error", "fix", "issue", "crash", "stack trace"],
+    "git": ["git", "commit", "branch", "merge", "pull request", "rebase"],
+    "scaffolding": ["scaffold", "boilerplate", "setup", "initialize"],
+    "observability": ["monitoring", "logging", "metrics", "tracing", "alerting", "prometheus", "grafana"],
+    "mobile": ["mobile", "ios", "android", "react native", "flutter"],
+    "data_science": ["machine learning", "ml", "model training", "dataset", "pandas"],
+    "migration": ["migrate", "upgrade", "data migration"],
+    "dependency": ["dependency", "dependencies", "package", "npm audit", "outdated"],
+    "validation": ["validation", "validate", "input validation"],
+    "architecture": ["architecture", "system design", "microservice", "design pattern"],
+    "localization": ["localization", "i18n", "translation", "translate", "locale"],
+    "compliance": ["compliance", "gdpr", "hipaa", "accessibility", "wcag", "soc2"],
+}
 
 
 class AgentOrchestrator:
-    def __init__(self, api_key: str = None):
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
+    def __init__(self, api_key: str = None, registry: AgentRegistry = None,
+                 parallel: bool = False, max_concurrency: int = 4,
+                 agent_timeout: Optional[float] = None, use_workflow: bool = False,
+                 routing_cache: RoutingCache = None, local_first: bool = False,
+                 local_confidence: float = 0.5, client: Any = None, async_client: Any = None,
+                 speculative: bool = False):
+        # One client (and connection pool) for the router and every default agent
+        self.client = client if client is not None else create_client(api_key)
+        self._api_key = api_key
+        self._async_client = async_client
         self.model = "claude-sonnet-4-20250514"
         
-        # Initialize all specialized agents
-        self.agents = {
-            "docker": DockerAgent(api_key),
-            "testing": TestSuiteAgent(api_key),
-            "devops": DevOpsAgent(api_key),
-            "security": SecurityAgent(api_key),
-            "database": DatabaseAgent(api_key),
-            "api_design": APIDesignAgent(api_key),
-            "frontend": FrontendAgent(api_key),
-            "performance": PerformanceAgent(api_key),
-            "refactoring": RefactoringAgent(api_key),
-            "documentation": DocumentationAgent(api_key),
-            "code_review": CodeReviewAgent(api_key),
-            "data_science": DataScienceAgent(api_key),
-            "mobile": MobileAgent(api_key),
-            "game_dev": GameDevelopmentAgent(api_key),
-            "observability": ObservabilityAgent(api_key),
-            "migration": MigrationAgent(api_key),
-            "dependency": DependencyAgent(api_key),
-            "scaffolding": ScaffoldingAgent(api_key),
-            "git": GitAgent(api_key),
-            "debugging": DebuggingAgent(api_key),
-            "validation": ValidationAgent(api_key),
-            "architecture": ArchitectureAgent(api_key),
-            "localization": LocalizationAgent(api_key),
-            "compliance": ComplianceAgent(api_key),
-        }
+        # Parallel execution settings (see _execute_parallel)
+        self.parallel = parallel
+        self.max_concurrency = max_concurrency
+        self.agent_timeout = agent_timeout
+        # Follow the router's "workflow" plan as a DAG (see orchestrator/workflow.py)
+        self.use_workflow = use_workflow
+        
+        # Optional persistent cache of LLM routing decisions
+        self.routing_cache = routing_cache
+        
+        # Tiered routing: trust the keyword router when its top agent leads the
+        # runner-up by at least `local_confidence` (relative margin, 0..1)
+        self.local_first = local_first
+        self.local_confidence = local_confidence
+        self._routing_tiers = Counter()
+        self._routing_tiers_lock = threading.Lock()
+        
+        # Speculative execution: start the keyword router's primary agent
+        # while the LLM router runs (see _speculate)
+        self.speculative = speculative
+        self._speculation = Counter()
+        self._wasted_tokens = Counter()
+        self._speculation_cancelled = 0
+        self._speculation_lock = threading.Lock()
+        
+        # Agents are registered lazily and constructed on first use
+        self.agents = registry if registry is not None else AgentRegistry.with_defaults(
+            api_key, client=self.client, async_client=async_client
+        )
+        
+        # Compiled once; scores every registered agent in a single pass
+        self.keyword_matcher = KeywordMatcher({
+            name: keywords for name, keywords in ROUTING_KEYWORDS.items() if name in self.agents
+        })
         
         self.routing_prompt = """You are an intelligent agent router. Analyze the task and determine which specialized agent(s) should handle it.
 
 Available agents:
-- docker: Container operations, Dockerfiles, Docker Compose
-- testing: Unit tests, integration tests, test coverage
-- devops: CI/CD, infrastructure, deployments
-- security: Security analysis, vulnerability detection
-- database: Schema design, queries, migrations
-- api_design: REST/GraphQL API design, documentation
-- frontend: React/Vue/Angular, UI components, state management
-- performance: Optimization, profiling, bottleneck analysis
-- refactoring: Code improvement, design patterns, cleanup
-- documentation: Code docs, README, API documentation
-- code_review: Code quality review, best practices
-- data_science: ML pipelines, data preprocessing, modeling
-- mobile: iOS/Android, React Native, Flutter
-- game_dev: Game mechanics, physics, rendering
-- observability: Monitoring, logging, metrics, tracing
-- migration: System migrations, upgrades, data migration
-- dependency: Dependency management, updates, audits
-- scaffolding: Project setup, boilerplate generation
-- git: Git operations, commit messages, branching
-- debugging: Bug analysis, troubleshooting, fixes
-- validation: Input validation, data validation, schemas
-- architecture: System design, architectural patterns
-- localization: i18n, translations, RTL support
-- compliance: GDPR, HIPAA, accessibility, regulations
+{agent_list}
 
 Respond with a JSON object:
 {
   "primary_agent": "agent_name",
   "secondary_agents": ["agent_name1", "agent_name2"],
   "reasoning": "Why these agents were selected",
-  "workflow": "Sequential or parallel execution plan"
+  "workflow": "Execution plan in order, e.g. \"architecture -> docker, devops -> observability\" (agents separated by commas run in parallel)"
 }
 
-If multiple agents are needed, explain the workflow."""
+If multiple agents are needed, explain the workflow.""".replace("{agent_list}", self._format_agent_list())
+
+    @property
+    def async_client(self):
+        """Async client used by aroute_task: the injected one or the transport's for the running loop"""
+        if self._async_client is not None:
+            return self._async_client
+        return create_async_client(self._api_key)
+
+    def _format_agent_list(self) -> str:
+        return "\n".join(
+            f"- {name}: {description}"
+            for name, description in self.agents.descriptions().items()
+        )
 
     def route_task(self, task: str, context: dict = None) -> dict:
-        """Determine which agent(s) should handle the task"""
+        """
+        Determine which agent(s) should handle the task
+        
+        Tiers are tried cheapest first: the local keyword router (with
+        `local_first`), the routing cache, the LLM router, and finally the
+        keyword router as a fallback. The deciding tier is recorded in the
+        routing's "tier" key, counted in routing_metrics() and reported to the
+        metrics registry with the routing latency.
+        """
+        return self._route_task(task, context)
+    
+    async def aroute_task(self, task: str, context: dict = None) -> dict:
+        """Coroutine version of route_task(), calling the LLM router with the async client"""
+        return await self._aroute_task(task, context)
+    
+    def _route_task(self, task: str, context: dict = None,
+                    speculation: Optional[SimpleNamespace] = None) -> dict:
+        """route_task(); with a `speculation`, the predicted agent is started before the LLM request"""
+        started = time.monotonic()
+        with span("route_task", category="orchestrator") as span_args:
+            routing, cache_key = self._route_without_llm(task, context)
+            if routing is None:
+                if speculation is not None:
+                    self._speculate(task, context, speculation)
+                routing = self._route_with_llm(task, context, cache_key)
+            span_args["tier"] = routing["tier"]
+            span_args["primary_agent"] = routing.get("primary_agent")
+        record_routing(routing["tier"], self.model, time.monotonic() - started)
+        return routing
+    
+    async def _aroute_task(self, task: str, context: dict = None,
+                           speculation: Optional[SimpleNamespace] = None) -> dict:
+        """aroute_task(); with a `speculation`, the predicted agent is started before the LLM request"""
+        started = time.monotonic()
+        with span("route_task", category="orchestrator") as span_args:
+            routing, cache_key = self._route_without_llm(task, context)
+            if routing is None:
+                if speculation is not None:
+                    self._aspeculate(task, context, speculation)
+                routing = await self._aroute_with_llm(task, context, cache_key)
+            span_args["tier"] = routing["tier"]
+            span_args["primary_agent"] = routing.get("primary_agent")
+        record_routing(routing["tier"], self.model, time.monotonic() - started)
+        return routing
+    
+    def _route_with_llm(self, task: str, context: dict, cache_key: Optional[str]) -> dict:
+        started = time.monotonic()
+        try:
+            with span("request", category="network", agent="router"):
+                response = get_rate_limiter().call(self.client, **self._routing_request(task, context))
+        except Exception as error:
+            record_request("router", self.model, time.monotonic() - started, "error", error=error)
+            raise
+        return self._routing_from_response(task, response, cache_key, started)
+    
+    async def _aroute_with_llm(self, task: str, context: dict, cache_key: Optional[str]) -> dict:
+        started = time.monotonic()
+        try:
+            with span("request", category="network", agent="router"):
+                response = await get_rate_limiter().acall(self.async_client, **self._routing_request(task, context))
+        except Exception as error:
+            record_request("router", self.model, time.monotonic() - started, "error", error=error)
+            raise
+        return self._routing_from_response(task, response, cache_key, started)
+    
+    def _route_without_llm(self, task: str, context: dict = None) -> Tuple[Optional[dict], Optional[str]]:
+        """Routing from the local or cache tier if one decides; return (routing or None, routing cache key)"""
+        if self.local_first:
+            routing = self._simple_routing(task)
+            routing["confidence"] = self._routing_confidence(routing["scores"])
+            if routing["confidence"] >= self.local_confidence:
+                return self._record_tier(routing, "local"), None
         
+        cache_key = None
+        if self.routing_cache is not None:
+            # Decisions depend on the model and the agent list in the prompt
+            cache_key = make_routing_key(task, context, namespace=f"{self.model}\x00{self.routing_prompt}")
+            cached = self.routing_cache.get(cache_key)
+            if cached is not None:
+                return self._record_tier(cached, "cache"), cache_key
+        return None, cache_key
+    
+    def _routing_request(self, task: str, context: dict = None) -> dict:
+        """Keyword arguments of the LLM router's rate-limited request"""
         prompt = f"Task: {task}\n\n"
         if context:
             prompt += f"Context: {context}\n\n"
         prompt += "Determine which agent(s) should handle this task."
-        
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=1000,
-            system=self.routing_prompt,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        import json
-        import re
+        return {
+            "agent": "router",
+            "model": self.model,
+            "max_tokens": 1000,
+            "system": [cached_block(self.routing_prompt)],
+            "messages": [{"role": "user", "content": prompt}]
+        }
+    
+    def _routing_from_response(self, task: str, response: Any, cache_key: Optional[str], started: float) -> dict:
+        """Record the router's request and turn its response into a routing"""
+        record_request("router", self.model, time.monotonic() - started, "ok", usage=response_usage(response))
         
         text = response.content[0].text
         # Extract JSON from response
         json_match = re.search(r'\{.*\}', text, re.DOTALL)
         if json_match:
             routing = json.loads(json_match.group())
-            return routing
+            if cache_key is not None:
+                self.routing_cache.set(cache_key, routing)
+            return self._record_tier(routing, "llm")
         
         # Fallback to simple routing based on keywords
-        return self._simple_routing(task)
-    
-    def _simple_routing(self, task: str) -> dict:
-        """Fallback routing based on keyword matching"""
-        task_lower = task.lower()
-        
-        routing_map = {
-            "docker": ["docker", "container", "dockerfile", "compose"],
-            "testing": ["test", "unit test", "integration test", "coverage"],
-            "devops": ["cicd", "ci/cd", "deploy", "pipeline", "kubernetes"],
-            "security": ["security", "vulnerability", "exploit", "penetration"],
-            "database": ["database", "sql", "schema", "query", "migration"],
-            "api_design": ["api", "rest", "graphql", "endpoint"],
-            "frontend": ["react", "vue", "angular", "component", "ui"],
-            "performance": ["performance", "optimize", "slow", "bottleneck"],
-            "refactoring": ["refactor", "clean", "improve", "smell"],
-            "documentation": ["document", "readme", "docs", "comment"],
-            "code_review": ["review", "quality", "best practice"],
-            "debugging": ["debug", "bug", "error", "fix", "issue"],
-            "git": ["git", "commit", "branch", "merge", "pull request"],
-            "scaffolding": ["scaffold", "boilerplate", "setup", "initialize"],
+        return self._record_tier(self._simple_routing(task), "fallback")
+    
+    @staticmethod
+    def _routing_confidence(scores: Dict[str, float]) -> float:
+        """Relative margin between the top two keyword scores (0 = tie or no match)"""
+        ranked = sorted(scores.values(), reverse=True)
+        if not ranked or ranked[0] <= 0:
+            return 0.0
+        runner_up = ranked[1] if len(ranked) > 1 else 0.0
+        return (ranked[0] - runner_up) / ranked[0]
+    
+    def _record_tier(self, routing: dict, tier: str) -> dict:
+        routing["tier"] = tier
+        with self._routing_tiers_lock:
+            self._routing_tiers[tier] += 1
+        return routing
+    
+    def routing_metrics(self) -> Dict[str, Any]:
+        """Number of tasks decided by each routing tier"""
+        with self._routing_tiers_lock:
+            tiers = dict(self._routing_tiers)
+        total = sum(tiers.values())
+        # "fallback" decisions still paid for the router round trip
+        skipped = tiers.get("local", 0) + tiers.get("cache", 0)
+        return {
+            "total": total,
+            "tiers": tiers,
+            "llm_skipped_rate": skipped / total if total else 0.0
+        }
+    
+    def _speculate(self, task: str, context: dict, speculation: SimpleNamespace) -> None:
+        """Start the keyword router's primary agent on a worker thread"""
+        agent = self._prepare_speculation(task, context, speculation)
+        if agent is None:
+            return
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative")
+        speculation.future = executor.submit(self._run_speculative, agent, speculation)
+        executor.shutdown(wait=False)
+    
+    def _aspeculate(self, task: str, context: dict, speculation: SimpleNamespace) -> None:
+        """Start the keyword router's primary agent as a task on the running loop"""
+        import asyncio
+
+        agent = self._prepare_speculation(task, context, speculation)
+        if agent is None:
+            return
+        speculation.future = asyncio.ensure_future(self._arun_speculative(agent, speculation))
+    
+    def _prepare_speculation(self, task: str, context: dict, speculation: SimpleNamespace) -> Any:
+        """
+        Fill in the speculation for the predicted primary agent; return the agent (None if unknown)
+        
+        The run's shared context is built here rather than in _start_run, so a
+        kept run was prompted exactly like the agents that join it later.
+        """
+        predicted = self._simple_routing(task)["primary_agent"]
+        if predicted not in self.agents:
+            return None
+        speculation.agent = predicted
+        speculation.task = task
+        speculation.context = context
+        speculation.shared_context = SharedContext.build(context, task=task)
+        speculation.started = time.monotonic()
+        return self.agents[predicted]
+    
+    def _run_speculative(self, agent: Any, speculation: SimpleNamespace) -> dict:
+        with span("speculate", category="orchestrator", agent=speculation.agent):
+            return self._run_agent(agent, speculation.task, speculation.context, speculation.shared_context)
+    
+    async def _arun_speculative(self, agent: Any, speculation: SimpleNamespace) -> dict:
+        with span("speculate", category="orchestrator", agent=speculation.agent):
+            return await self._arun_agent(agent, speculation.task, speculation.context, speculation.shared_context)
+    
+    def _settle_speculation(self, speculation: Optional[SimpleNamespace],
+                            routing: Optional[dict]) -> Dict[str, SimpleNamespace]:
+        """
+        Compare a speculative run with the routing (None when routing failed)
+        
+        Returns {agent name: speculation} when the run is kept, as the primary
+        ("hit") or as a secondary agent ("reused"). Otherwise ("miss") the run
+        is cancelled, or left to finish unused when it can't be (threads), and
+        its tokens are counted as wasted once it is done.
+        """
+        if speculation is None or speculation.future is None:
+            return {}
+        agent = speculation.agent
+        if routing is not None and routing.get("primary_agent") == agent:
+            outcome = "hit"
+        elif routing is not None and agent in routing.get("secondary_agents", []):
+            outcome = "reused"
+        else:
+            outcome = "miss"
+        with self._speculation_lock:
+            self._speculation[outcome] += 1
+        record_speculation(outcome, agent, self.model)
+        
+        if outcome != "miss":
+            return {agent: speculation}
+        speculation.future.cancel()
+        speculation.future.add_done_callback(
+            lambda future: self._discard_speculation(future, speculation)
+        )
+        return {}
+    
+    def _discard_speculation(self, future: Any, speculation: SimpleNamespace) -> None:
+        """
+        Count the tokens of a speculative run whose result was not used
+        
+        A run cancelled mid-request (asyncio) reports no usage; its prompt may
+        already have been billed, so its estimated input tokens are counted.
+        """
+        if future.cancelled():
+            usage = {"input_tokens": self._estimated_input_tokens(speculation)}
+            with self._speculation_lock:
+                self._speculation_cancelled += 1
+        elif future.exception() is not None:
+            return
+        else:
+            usage = (future.result() or {}).get("usage") or {}
+        with self._speculation_lock:
+            for field in ("input_tokens", "output_tokens", "cache_read_input_tokens",
+                          "cache_creation_input_tokens"):
+                if usage.get(field):
+                    self._wasted_tokens[field] += usage[field]
+        record_speculation_waste(speculation.agent, self.model, usage)
+    
+    def _estimated_input_tokens(self, speculation: SimpleNamespace) -> int:
+        """Estimated prompt size of a speculative run (system prompt, shared context and prompt)"""
+        agent = self.agents[speculation.agent]
+        shared_context = speculation.shared_context
+        prompt, _ = agent._prepare_prompt(speculation.task, speculation.context, shared_context)
+        tokens = estimate_tokens(prompt) + estimate_tokens(agent.system_prompt)
+        if shared_context is not None:
+            tokens += estimate_tokens(shared_context.text)
+        return tokens
+    
+    def speculation_metrics(self) -> Dict[str, Any]:
+        """Outcomes of speculative runs and the tokens spent on discarded ones"""
+        with self._speculation_lock:
+            outcomes = dict(self._speculation)
+            wasted = dict(self._wasted_tokens)
+            cancelled = self._speculation_cancelled
+        total = sum(outcomes.values())
+        return {
+            "total": total,
+            "outcomes": outcomes,
+            "hit_rate": outcomes.get("hit", 0) / total if total else 0.0,
+            # Missed runs cancelled mid-flight; their input tokens are estimated
+            "cancelled": cancelled,
+            "wasted_tokens": wasted
         }
+
+    def _simple_routing(self, task: str, secondary_ratio: float = 0.5, max_secondary: int = 3) -> dict:
+        """
+        Local routing based on keyword matching
+        
+        Every agent is scored in one pass over the task. The best scoring agent
+        becomes the primary; other agents scoring at least `secondary_ratio` of
+        the top score (up to `max_secondary`) become secondary agents.
+        """
+        ranking = self.keyword_matcher.rank(task)
         
-        for agent, keywords in routing_map.items():
-            if any(keyword in task_lower for keyword in keywords):
-                return {
-                    "primary_agent": agent,
-                    "secondary_agents": [],
-                    "reasoning": f"Task contains keywords related to {agent}",
-                    "workflow": "single"
-                }
+        if ranking:
+            primary_agent, top_score = ranking[0]
+            secondary_agents = [
+                name for name, score in ranking[1:1 + max_secondary]
+                if score >= top_score * secondary_ratio
+            ]
+            return {
+                "primary_agent": primary_agent,
+                "secondary_agents": secondary_agents,
+                "reasoning": f"Task contains keywords related to {primary_agent}",
+                "workflow": " -> ".join([primary_agent, ", ".join(secondary_agents)]) if secondary_agents else "single",
+                "scores": dict(ranking)
+            }
         
         # Default to code_review for general tasks
         return {
             "primary_agent": "code_review",
             "secondary_agents": [],
             "reasoning": "Default routing for general code tasks",
-            "workflow": "single"
+            "workflow": "single",
+            "scores": {}
         }
     
-    def execute(self, task: str, context: dict = None) -> dict:
+    def execute(self, task: str, context: dict = None, parallel: bool = None,
+                workflow: Any = None) -> dict:
         """
         Execute a task by routing to appropriate agent(s)
         
         Args:
             task: The task to execute
             context: Additional context for the task
+            parallel: Run the primary and secondary agents concurrently
+                (defaults to the orchestrator's `parallel` setting)
+            workflow: Explicit Workflow, stage spec or free-text plan (e.g.
+                "architecture -> docker, devops") to run instead of the routed
+                agents; with `use_workflow` the router's plan is used
         
         Returns:
             dict with results from all agents involved
         """
-        # Route the task
-        routing = self.route_task(task, context)
+        with span("execute", category="orchestrator", task=task[:120]):
+            # Route the task, speculatively starting the predicted primary agent
+            speculation = self._new_speculation(workflow)
+            try:
+                routing = self._route_task(task, context, speculation)
+            except BaseException:
+                self._settle_speculation(speculation, None)
+                raise
+            started_runs = self._settle_speculation(speculation, routing)
+            with span("execute_agents", category="orchestrator"):
+                return self._execute_routed(task, context, routing, parallel, workflow, started_runs)
+    
+    async def aexecute(self, task: str, context: dict = None, parallel: bool = None,
+                       workflow: Any = None) -> dict:
+        """
+        Coroutine version of execute()
+        
+        Routing and agent requests are awaited on the running event loop;
+        with `parallel` the agents run as concurrent tasks, at most
+        `max_concurrency` at a time. Workflows run on a worker thread.
+        """
+        with span("execute", category="orchestrator", task=task[:120]):
+            speculation = self._new_speculation(workflow)
+            try:
+                routing = await self._aroute_task(task, context, speculation)
+            except BaseException:
+                self._settle_speculation(speculation, None)
+                raise
+            started_runs = self._settle_speculation(speculation, routing)
+            with span("execute_agents", category="orchestrator"):
+                return await self._aexecute_routed(task, context, routing, parallel, workflow, started_runs)
+    
+    def _new_speculation(self, workflow: Any = None) -> Optional[SimpleNamespace]:
+        """Holder for a speculative run, or None when this execute() shouldn't speculate"""
+        # Workflow stages may depend on earlier stages, so their agents can't start early
+        if not self.speculative or workflow is not None or self.use_workflow:
+            return None
+        return SimpleNamespace(agent=None, future=None, started=None, task=None, context=None,
+                               shared_context=None)
+    
+    def _execute_routed(self, task: str, context: dict, routing: dict,
+                        parallel: bool = None, workflow: Any = None,
+                        started_runs: Dict[str, SimpleNamespace] = None) -> dict:
+        """Run the agents selected by `routing` (see execute), joining `started_runs` instead of rerunning them"""
+        results, workflow, shared_context = self._start_run(task, context, routing, workflow, started_runs)
+        if parallel is None:
+            parallel = self.parallel
+        
+        if workflow is not None:
+            self._execute_workflow(task, context, routing, workflow, results, shared_context)
+        elif parallel:
+            self._execute_parallel(task, context, routing, results, shared_context, started_runs)
+        else:
+            started_runs = started_runs or {}
+            # Execute primary agent
+            primary_agent_name = routing["primary_agent"]
+            if primary_agent_name in started_runs:
+                results["primary_result"] = started_runs[primary_agent_name].future.result()
+            elif primary_agent_name in self.agents:
+                primary_agent = self.agents[primary_agent_name]
+                results["primary_result"] = self._run_agent(primary_agent, task, context, shared_context)
+            
+            # Execute secondary agents if needed
+            for agent_name in routing.get("secondary_agents", []):
+                if agent_name in started_runs:
+                    results["secondary_results"].append({
+                        "agent": agent_name,
+                        "result": started_runs[agent_name].future.result()
+                    })
+                elif agent_name in self.agents:
+                    agent = self.agents[agent_name]
+                    secondary_result = self._run_agent(agent, task, context, shared_context)
+                    results["secondary_results"].append({
+                        "agent": agent_name,
+                        "result": secondary_result
+                    })
+        
+        return self._finish_run(results)
+    
+    async def _aexecute_routed(self, task: str, context: dict, routing: dict,
+                               parallel: bool = None, workflow: Any = None,
+                               started_runs: Dict[str, SimpleNamespace] = None) -> dict:
+        """Run the agents selected by `routing` on the event loop (see aexecute)"""
+        import asyncio  # only needed by async callers; kept off the import path
+
+        results, workflow, shared_context = self._start_run(task, context, routing, workflow, started_runs)
+        if parallel is None:
+            parallel = self.parallel
         
+        if workflow is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._execute_workflow, task, context, routing, workflow, results, shared_context
+            )
+        elif parallel:
+            await self._aexecute_parallel(task, context, routing, results, shared_context, started_runs)
+        else:
+            started_runs = started_runs or {}
+            primary_agent_name = routing["primary_agent"]
+            if primary_agent_name in started_runs:
+                results["primary_result"] = await started_runs[primary_agent_name].future
+            elif primary_agent_name in self.agents:
+                results["primary_result"] = await self._arun_agent(
+                    self.agents[primary_agent_name], task, context, shared_context
+                )
+            
+            for agent_name in routing.get("secondary_agents", []):
+                if agent_name in started_runs:
+                    results["secondary_results"].append({
+                        "agent": agent_name,
+                        "result": await started_runs[agent_name].future
+                    })
+                elif agent_name in self.agents:
+                    secondary_result = await self._arun_agent(self.agents[agent_name], task, context, shared_context)
+                    results["secondary_results"].append({
+                        "agent": agent_name,
+                        "result": secondary_result
+                    })
+        
+        return self._finish_run(results)
+    
+    def _start_run(self, task: str, context: dict, routing: dict, workflow: Any = None,
+                   started_runs: Dict[str, SimpleNamespace] = None
+                   ) -> Tuple[dict, Optional[Workflow], Optional[SharedContext]]:
+        """Empty results, the workflow to follow (if any) and the run's shared context"""
         results = {
             "routing": routing,
             "primary_result": None,
@@ -194,27 +585,289 @@ If multiple agents are needed, explain the workflow."""
             "summary": ""
         }
         
-        # Execute primary agent
-        primary_agent_name = routing["primary_agent"]
-        if primary_agent_name in self.agents:
-            primary_agent = self.agents[primary_agent_name]
-            results["primary_result"] = primary_agent.execute(task, context)
-        
-        # Execute secondary agents if needed
-        for agent_name in routing.get("secondary_agents", []):
-            if agent_name in self.agents:
-                agent = self.agents[agent_name]
-                secondary_result = agent.execute(task, context)
-                results["secondary_results"].append({
-                    "agent": agent_name,
-                    "result": secondary_result
-                })
+        if workflow is None and self.use_workflow:
+            workflow = Workflow.from_routing(routing, known=self.agents.keys())
+        if isinstance(workflow, str):
+            workflow = Workflow.from_plan(workflow, self.agents.keys())
+        elif workflow is not None and not isinstance(workflow, Workflow):
+            workflow = Workflow.from_spec(workflow)
+        
+        # Large context values are rendered once and sent as a cached prefix
+        # shared by every agent of this run
+        shared_context = None
+        if started_runs:
+            # A kept speculative run was already prompted with the shared context
+            shared_context = next(iter(started_runs.values())).shared_context
+        elif workflow is not None or routing.get("secondary_agents"):
+            shared_context = SharedContext.build(context, task=task)
+        if shared_context is not None and shared_context.packing is not None:
+            results["context_packing"] = shared_context.packing
+        return results, workflow, shared_context
+    
+    def _finish_run(self, results: dict) -> dict:
+        """Total the agents' token usage and add the summary"""
+        results["usage"] = sum_usage(
+            [(results["primary_result"] or {}).get("usage")]
+            + [(entry["result"] or {}).get("usage") for entry in results["secondary_results"]]
+        )
         
         # Generate summary
         results["summary"] = self._generate_summary(results)
         
         return results
     
+    def execute_many(self, tasks: Iterable[Any], max_concurrency: int = None,
+                     ordered: bool = True) -> Iterator[dict]:
+        """
+        Execute a batch of tasks concurrently, streaming results
+        
+        Identical (task, context) pairs are executed once. Each unique task is
+        routed and then executed by the same worker, so results stream back as
+        soon as their task finishes; at most `max_concurrency` tasks (and so
+        routing or agent calls) are in flight at any time.
+        
+        Args:
+            tasks: Task strings, (task, context) tuples or dicts with "task"
+                and optional "context" keys
+            max_concurrency: Global cap (defaults to the orchestrator's)
+            ordered: Yield in input order; otherwise yield as tasks complete
+        
+        Yields:
+            dict with 'index', 'task', 'context', 'result', 'deduplicated'
+            and, for failed tasks, 'error'
+        """
+        jobs: List[Tuple[str, dict]] = []
+        job_indices: List[List[int]] = []
+        index_to_job: List[int] = []
+        seen: Dict[str, int] = {}
+        
+        for item in tasks:
+            if isinstance(item, dict):
+                task, context = item["task"], item.get("context")
+            elif isinstance(item, (tuple, list)):
+                task, context = item[0], item[1] if len(item) > 1 else None
+            else:
+                task, context = item, None
+            
+            key = json.dumps([task, context], sort_keys=True, default=str)
+            if key not in seen:
+                seen[key] = len(jobs)
+                jobs.append((task, context))
+                job_indices.append([])
+            job_indices[seen[key]].append(len(index_to_job))
+            index_to_job.append(seen[key])
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrency or self.max_concurrency),
+            thread_name_prefix="batch"
+        )
+        futures: List[Future] = []
+        try:
+            futures = [executor.submit(self._route_and_execute, task, context) for task, context in jobs]
+            
+            if ordered:
+                for index, job_id in enumerate(index_to_job):
+                    yield self._batch_entry(index, jobs[job_id], futures[job_id], job_indices[job_id][0] != index)
+            else:
+                job_of = {future: job_id for job_id, future in enumerate(futures)}
+                for future in as_completed(job_of):
+                    job_id = job_of[future]
+                    for position, index in enumerate(job_indices[job_id]):
+                        yield self._batch_entry(index, jobs[job_id], future, position > 0)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def _route_and_execute(self, task: str, context: dict) -> dict:
+        """One execute_many() job: route, then run the routed agents sequentially"""
+        return self._execute_routed(task, context, self.route_task(task, context), False)
+    
+    @staticmethod
+    def _batch_entry(index: int, job: Tuple[str, dict], future: Future, deduplicated: bool) -> dict:
+        entry = {
+            "index": index,
+            "task": job[0],
+            "context": job[1],
+            "result": None,
+            "deduplicated": deduplicated
+        }
+        error = future.exception()
+        if error is not None:
+            entry["error"] = str(error) or type(error).__name__
+        else:
+            entry["result"] = future.result()
+        return entry
+    
+    def _execute_parallel(self, task: str, context: dict, routing: dict, results: dict,
+                          shared_context: SharedContext = None,
+                          started_runs: Dict[str, SimpleNamespace] = None) -> None:
+        """
+        Run the primary and secondary agents on a thread pool
+        
+        At most `max_concurrency` agents run at once. Results are collected in
+        routing order. A secondary agent that fails or exceeds `agent_timeout`
+        is reported with an "error" entry; a failing primary agent raises.
+        Agents in `started_runs` (speculative runs) are joined, not rerun.
+        """
+        primary_agent_name = routing["primary_agent"]
+        agent_names = [primary_agent_name] if primary_agent_name in self.agents else []
+        agent_names += [name for name in routing.get("secondary_agents", []) if name in self.agents]
+        if not agent_names:
+            return
+        
+        started: Dict[int, float] = {}
+        started_runs = started_runs or {}
+        
+        def run(index: int, agent_name: str) -> dict:
+            started[index] = time.monotonic()
+            return self._run_agent(self.agents[agent_name], task, context, shared_context)
+        
+        def submit(index: int, agent_name: str) -> Future:
+            speculation = started_runs.get(agent_name)
+            if speculation is not None:
+                started[index] = speculation.started
+                return speculation.future
+            return executor.submit(run, index, agent_name)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_concurrency, len(agent_names))),
+            thread_name_prefix="agent"
+        )
+        futures: List[Future] = []
+        try:
+            futures = [submit(i, name) for i, name in enumerate(agent_names)]
+            
+            for index, agent_name in enumerate(agent_names):
+                result, error = self._collect(futures[index], started, index)
+                if index == 0 and agent_name == primary_agent_name:
+                    if error is not None:
+                        raise error
+                    results["primary_result"] = result
+                    continue
+                
+                entry = {"agent": agent_name, "result": result}
+                if error is not None:
+                    entry["error"] = str(error) or type(error).__name__
+                results["secondary_results"].append(entry)
+        finally:
+            # Don't block on agents that outlived their timeout
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    async def _aexecute_parallel(self, task: str, context: dict, routing: dict, results: dict,
+                                 shared_context: SharedContext = None,
+                                 started_runs: Dict[str, SimpleNamespace] = None) -> None:
+        """Run the primary and secondary agents as concurrent tasks (see _execute_parallel)"""
+        import asyncio
+
+        primary_agent_name = routing["primary_agent"]
+        agent_names = [primary_agent_name] if primary_agent_name in self.agents else []
+        agent_names += [name for name in routing.get("secondary_agents", []) if name in self.agents]
+        if not agent_names:
+            return
+        
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        timeout = self.agent_timeout
+        started_runs = started_runs or {}
+        
+        async def run(agent_name: str) -> dict:
+            speculation = started_runs.get(agent_name)
+            if speculation is not None:
+                # Already running; the timeout counts from when it started
+                remaining = None if timeout is None else max(0.0, speculation.started + timeout - time.monotonic())
+                try:
+                    return await asyncio.wait_for(speculation.future, remaining)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"agent timed out after {timeout}s") from None
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._arun_agent(self.agents[agent_name], task, context, shared_context), timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"agent timed out after {timeout}s") from None
+        
+        outcomes = await asyncio.gather(*(run(name) for name in agent_names), return_exceptions=True)
+        for index, (agent_name, outcome) in enumerate(zip(agent_names, outcomes)):
+            error = outcome if isinstance(outcome, BaseException) else None
+            if index == 0 and agent_name == primary_agent_name:
+                if error is not None:
+                    raise error
+                results["primary_result"] = outcome
+                continue
+            
+            entry = {"agent": agent_name, "result": None if error is not None else outcome}
+            if error is not None:
+                entry["error"] = str(error) or type(error).__name__
+            results["secondary_results"].append(entry)
+    
+    def _execute_workflow(self, task: str, context: dict, routing: dict,
+                          workflow: Workflow, results: dict, shared_context: SharedContext = None) -> None:
+        """Run a workflow DAG, reporting stages in the usual result shape"""
+        results["workflow"] = workflow.levels()
+        outcomes = workflow.run(
+            self.agents, task, context,
+            max_concurrency=self.max_concurrency,
+            stage_timeout=self.agent_timeout,
+            shared_context=shared_context
+        )
+        
+        for name, outcome in outcomes.items():
+            if outcome["agent"] == routing["primary_agent"] and results["primary_result"] is None:
+                if outcome["error"] is not None:
+                    raise outcome["error"]
+                results["primary_result"] = outcome["result"]
+                continue
+            
+            entry = {"agent": outcome["agent"], "result": outcome["result"]}
+            if name != outcome["agent"]:
+                entry["stage"] = name
+            if outcome["error"] is not None:
+                entry["error"] = str(outcome["error"]) or type(outcome["error"]).__name__
+            results["secondary_results"].append(entry)
+    
+    @staticmethod
+    def _run_agent(agent: Any, task: str, context: dict, shared_context: SharedContext = None) -> dict:
+        if shared_context is None:
+            return agent.execute(task, context)
+        return agent.execute(task, context, shared_context=shared_context)
+    
+    @staticmethod
+    async def _arun_agent(agent: Any, task: str, context: dict, shared_context: SharedContext = None) -> dict:
+        import asyncio
+
+        aexecute = getattr(agent, "aexecute", None)
+        if aexecute is None:
+            # Agents without an async API run on a worker thread
+            return await asyncio.get_running_loop().run_in_executor(
+                None, AgentOrchestrator._run_agent, agent, task, context, shared_context
+            )
+        if shared_context is None:
+            return await aexecute(task, context)
+        return await aexecute(task, context, shared_context=shared_context)
+    
+    def _collect(self, future: Future, started: Dict[int, float], index: int) -> Tuple[Any, Optional[BaseException]]:
+        """Wait for one agent, applying the timeout from the moment it started running"""
+        timeout = self.agent_timeout
+        if timeout is not None:
+            while not future.done():
+                began = started.get(index)
+                if began is None:
+                    # Still queued behind other agents
+                    wait([future], timeout=0.05)
+                    continue
+                remaining = began + timeout - time.monotonic()
+                if remaining <= 0:
+                    return None, TimeoutError(f"agent timed out after {timeout}s")
+                wait([future], timeout=remaining)
+        
+        error = future.exception()
+        if error is not None:
+            return None, error
+        return future.result(), None
+    
     def _generate_summary(self, results: dict) -> str:
         """Generate a summary of the multi-agent execution"""
         summary = f"Task routed to: {results['routing']['primary_agent']}\n"
@@ -225,15 +878,18 @@ If multiple agents are needed, explain the workflow."""
         
         if results["secondary_results"]:
             summary += f"Additional agents involved: {len(results['secondary_results'])}\n"
+            failed = [entry["agent"] for entry in results["secondary_results"] if entry.get("error")]
+            if failed:
+                summary += f"Agents failed: {', '.join(failed)}\n"
         
         return summary
     
     def list_agents(self) -> List[str]:
-        """List all available agents"""
-        return list(self.agents.keys())
+        """List all available agents without constructing them"""
+        return self.agents.keys()
     
     def get_agent(self, agent_name: str):
-        """Get a specific agent by name"""
+        """Get a specific agent by name, constructing it on first use"""
         return self.agents.get(agent_name)
 
 
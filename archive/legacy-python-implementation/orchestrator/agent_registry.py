@@ -0,0 +1,169 @@
+"""
+Agent Registry - Lazy construction of specialized agents
+
+The registry records how to build each agent instead of building it. An agent
+is only created the first time it is requested and is then cached for the
+lifetime of the registry. Listing agents or rendering their descriptions
+never imports an agent module.
+
+When the registry is given a client (the orchestrator passes its own), it is
+injected into every agent it builds, so all agents share one connection pool.
+"""
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterator, List
+
+
+# name, module, class, description (used by the routing prompt)
+DEFAULT_AGENTS = [
+    ("docker", "agents.infrastructure.docker_agent", "DockerAgent",
+     "Container operations, Dockerfiles, Docker Compose"),
+    ("testing", "agents.quality.test_suite_agent", "TestSuiteAgent",
+     "Unit tests, integration tests, test coverage"),
+    ("devops", "agents.infrastructure.devops_agent", "DevOpsAgent",
+     "CI/CD, infrastructure, deployments"),
+    ("security", "agents.quality.security_agent", "SecurityAgent",
+     "Security analysis, vulnerability detection"),
+    ("database", "agents.development.database_agent", "DatabaseAgent",
+     "Schema design, queries, migrations"),
+    ("frontend", "agents.development.frontend_agent", "FrontendAgent",
+     "React/Vue/Angular, UI components, state management"),
+    ("performance", "agents.quality.performance_agent", "PerformanceAgent",
+     "Optimization, profiling, bottleneck analysis"),
+    ("refactoring", "agents.quality.refactoring_agent", "RefactoringAgent",
+     "Code improvement, design patterns, cleanup"),
+    ("documentation", "agents.productivity.documentation_agent", "DocumentationAgent",
+     "Code docs, README, API documentation"),
+    ("code_review", "agents.quality.code_review_agent", "CodeReviewAgent",
+     "Code quality review, best practices"),
+    ("data_science", "agents.specialized.data_science_agent", "DataScienceAgent",
+     "ML pipelines, data preprocessing, modeling"),
+    ("mobile", "agents.development.mobile_agent", "MobileAgent",
+     "iOS/Android, React Native, Flutter"),
+    ("observability", "agents.infrastructure.observability_agent", "ObservabilityAgent",
+     "Monitoring, logging, metrics, tracing"),
+    ("migration", "agents.operations.migration_agent", "MigrationAgent",
+     "System migrations, upgrades, data migration"),
+    ("dependency", "agents.operations.dependency_agent", "DependencyAgent",
+     "Dependency management, updates, audits"),
+    ("scaffolding", "agents.productivity.scaffolding_agent", "ScaffoldingAgent",
+     "Project setup, boilerplate generation"),
+    ("git", "agents.operations.git_agent", "GitAgent",
+     "Git operations, commit messages, branching"),
+    ("debugging", "agents.productivity.debugging_agent", "DebuggingAgent",
+     "Bug analysis, troubleshooting, fixes"),
+    ("validation", "agents.business.validation_agent", "ValidationAgent",
+     "Input validation, data validation, schemas"),
+    ("architecture", "agents.business.architecture_agent", "ArchitectureAgent",
+     "System design, architectural patterns"),
+    ("localization", "agents.business.localization_agent", "LocalizationAgent",
+     "i18n, translations, RTL support"),
+    ("compliance", "agents.business.compliance_agent", "ComplianceAgent",
+     "GDPR, HIPAA, accessibility, regulations"),
+]
+
+
+def import_factory(module_path: str, class_name: str) -> Callable[..., Any]:
+    """Return a factory that imports `module_path` only when first called"""
+    def factory(*args, **kwargs):
+        module = importlib.import_module(module_path)
+        return getattr(module, class_name)(*args, **kwargs)
+    return factory
+
+
+class AgentRegistry:
+    """Maps agent names to factories and caches instances on first use"""
+
+    def __init__(self, api_key: str = None, client: Any = None, async_client: Any = None):
+        """
+        Args:
+            api_key: Passed to every agent factory
+            client: Client injected into every agent (None: agents use the transport's)
+            async_client: Async client injected into every agent
+        """
+        self.api_key = api_key
+        self.client = client
+        self.async_client = async_client
+        self._factories: Dict[str, Callable[..., Any]] = {}
+        self._descriptions: Dict[str, str] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def with_defaults(cls, api_key: str = None, client: Any = None,
+                      async_client: Any = None) -> "AgentRegistry":
+        """Create a registry pre-populated with all built-in agents"""
+        registry = cls(api_key, client, async_client)
+        for name, module_path, class_name, description in DEFAULT_AGENTS:
+            registry.register(name, import_factory(module_path, class_name), description)
+        return registry
+
+    def register(self, name: str, factory: Callable[..., Any], description: str = "") -> None:
+        """
+        Register an agent factory
+
+        Args:
+            name: Routing name of the agent (e.g. "docker")
+            factory: Callable taking the API key and returning an agent; it
+                must also accept `client` / `async_client` keywords when the
+                registry injects clients
+            description: One-line summary shown to the router
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._descriptions[name] = description
+            self._instances.pop(name, None)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return the agent for `name`, constructing it on first access"""
+        agent = self._instances.get(name)
+        if agent is not None:
+            return agent
+        if name not in self._factories:
+            return default
+
+        with self._lock:
+            agent = self._instances.get(name)
+            if agent is None:
+                agent = self._factories[name](self.api_key, **self._clients())
+                if getattr(agent, "name", "") is None:
+                    agent.name = name
+                self._instances[name] = agent
+        return agent
+
+    def _clients(self) -> Dict[str, Any]:
+        clients = {}
+        if self.client is not None:
+            clients["client"] = self.client
+        if self.async_client is not None:
+            clients["async_client"] = self.async_client
+        return clients
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._factories:
+            raise KeyError(name)
+        return self.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._factories))
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def keys(self) -> List[str]:
+        return list(self._factories)
+
+    def descriptions(self) -> Dict[str, str]:
+        """Agent name -> description, without constructing any agent"""
+        return dict(self._descriptions)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def loaded_agents(self) -> List[str]:
+        """Names of agents that have been constructed so far"""
+        return list(self._instances)
@@ -0,0 +1,415 @@
+"""
+Daemon - Long-lived orchestrator serving JSON-RPC over a Unix domain socket
+
+Scripts that construct an AgentOrchestrator pay interpreter start, imports,
+client construction and cold caches on every run. The daemon keeps one
+orchestrator warm (agents constructed, the shared connection pool open,
+routing and response caches populated) and serves requests on a single
+event loop with the async API (aexecute), so a client invocation costs one
+round trip over the socket plus the model calls.
+
+Methods (params in parentheses):
+    execute(task, context?, parallel?, workflow?)  AgentOrchestrator.aexecute
+    route(task, context?)                          AgentOrchestrator.aroute_task
+    run_agent(agent, task, context?, use_cache?)   one agent's aexecute
+    list_agents(), stats(), ping()
+    reload(code?)   build a fresh orchestrator (reloading agent modules with
+                    code=true); in-flight requests finish on the old one
+    shutdown()      stop accepting requests and drain in-flight ones
+
+At most `max_concurrency` execute/route/run_agent requests run at once; a
+request that can't get a slot within `queue_timeout` seconds fails with
+SERVER_BUSY. SIGHUP reloads, SIGTERM and SIGINT shut down gracefully.
+
+Usage:
+    python -m orchestrator.daemon [--socket PATH] [--max-concurrency 16] [--parallel]
+    python -m orchestrator.daemon_client execute "Create a Dockerfile for a FastAPI app"
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import get_metrics
+from utils.rate_limiter import get_rate_limiter
+from utils.response_cache import get_response_cache
+from utils.singleflight import get_singleflight
+
+from .agent_orchestrator import AgentOrchestrator
+from .workflow import Workflow
+from .daemon_protocol import (
+    AGENT_ERROR, INVALID_PARAMS, INVALID_REQUEST, JSONRPC_VERSION, MAX_MESSAGE_BYTES,
+    METHOD_NOT_FOUND, PARSE_ERROR, SERVER_BUSY, SHUTTING_DOWN,
+    default_socket_path, encode, error_response, result_response
+)
+from .routing_cache import RoutingCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestError(Exception):
+    """A request the daemon rejects with a JSON-RPC error"""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class OrchestratorDaemon:
+    """Serves a warm AgentOrchestrator over a Unix domain socket"""
+
+    def __init__(self, socket_path: str = None, max_concurrency: int = 16, queue_timeout: float = 30.0,
+                 drain_timeout: float = 60.0, warm: bool = True,
+                 orchestrator_factory: Callable[[], AgentOrchestrator] = None):
+        """
+        Args:
+            socket_path: Socket to listen on (default: default_socket_path())
+            max_concurrency: Orchestrator requests served at once
+            queue_timeout: Seconds a request may wait for a slot before SERVER_BUSY
+            drain_timeout: Seconds shutdown waits for in-flight requests
+            warm: Construct every agent up front (and on reload)
+            orchestrator_factory: Builds the orchestrator (default: AgentOrchestrator())
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.drain_timeout = drain_timeout
+        self.warm = warm
+        self.orchestrator_factory = orchestrator_factory or AgentOrchestrator
+
+        self.orchestrator: Optional[AgentOrchestrator] = None
+        self.generation = 0
+        self.started_at = time.time()
+        self.in_flight = 0
+        self.served = 0
+        self.failed = 0
+        self.rejected = 0
+
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._reloading: Optional[asyncio.Lock] = None
+        self._methods = {
+            "execute": self._execute,
+            "route": self._route,
+            "run_agent": self._run_agent,
+            "list_agents": self._list_agents,
+            "stats": self._stats,
+            "ping": self._ping,
+            "reload": self._reload,
+            "shutdown": self._shutdown,
+        }
+
+    def run(self) -> None:
+        """Serve until shutdown (blocking)"""
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._stopping = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._reloading = asyncio.Lock()
+
+        self.orchestrator = await loop.run_in_executor(None, self._build_orchestrator, False)
+        self._claim_socket()
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path,
+                                                 limit=MAX_MESSAGE_BYTES)
+        os.chmod(self.socket_path, 0o600)
+        for signum, handler in ((signal.SIGHUP, self._signal_reload), (signal.SIGTERM, self._stopping.set),
+                                (signal.SIGINT, self._stopping.set)):
+            loop.add_signal_handler(signum, handler)
+        logger.info("Serving on %s (pid %d)", self.socket_path, os.getpid())
+
+        try:
+            await self._stopping.wait()
+        finally:
+            server.close()
+            for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signum)
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Shutting down with %d requests still in flight", self.in_flight)
+            self._release_socket()
+
+    def _claim_socket(self) -> None:
+        """Remove a stale socket file, refusing to start if another daemon answers on it"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def _release_socket(self) -> None:
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _build_orchestrator(self, reload_code: bool) -> AgentOrchestrator:
+        if reload_code:
+            # The base class first, so reloaded agents subclass the new BaseAgent
+            names = sorted(
+                (name for name in sys.modules if name.startswith("agents.") and name.endswith("_agent")),
+                key=lambda name: name != "agents.base_agent"
+            )
+            for name in names:
+                importlib.reload(sys.modules[name])
+        orchestrator = self.orchestrator_factory()
+        if self.warm:
+            for name in orchestrator.list_agents():
+                orchestrator.get_agent(name)
+        return orchestrator
+
+    # Connection handling
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while not reader.at_eof():
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(encode(error_response(None, INVALID_REQUEST, "Message too large")))
+                    break
+                if not line.strip():
+                    continue
+                writer.write(encode(await self._respond(line)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes) -> Dict[str, Any]:
+        try:
+            message = json.loads(line)
+        except ValueError as error:
+            return error_response(None, PARSE_ERROR, f"Invalid JSON: {error}")
+
+        request_id = message.get("id") if isinstance(message, dict) else None
+        started = time.monotonic()
+        method = "invalid"
+        try:
+            if not isinstance(message, dict) or message.get("jsonrpc") != JSONRPC_VERSION:
+                raise RequestError(INVALID_REQUEST, "Expected a JSON-RPC 2.0 request object")
+            method = message.get("method")
+            handler = self._methods.get(method)
+            if handler is None:
+                raise RequestError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+            params = message.get("params") or {}
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+            result = await handler(params)
+        except RequestError as error:
+            self._record(method, "rejected", started)
+            return error_response(request_id, error.code, str(error), error.data)
+        except Exception as error:
+            logger.exception("%s failed", method)
+            self._record(method, "error", started)
+            return error_response(request_id, AGENT_ERROR, str(error) or type(error).__name__,
+                                  {"type": type(error).__name__})
+        self._record(method, "ok", started)
+        return result_response(request_id, result)
+
+    def _record(self, method: str, outcome: str, started: float) -> None:
+        registry = get_metrics()
+        if registry is None:
+            return
+        labels = {"method": method, "outcome": outcome}
+        registry.counter("daemon_requests_total", "Daemon requests by method and outcome").inc(1, **labels)
+        registry.histogram(
+            "daemon_request_duration_seconds", "Daemon request latency in seconds"
+        ).observe(time.monotonic() - started, **labels)
+
+    async def _run(self, work: Callable[[AgentOrchestrator], Any]) -> Any:
+        """Run orchestrator work in a concurrency slot, on the orchestrator current at admission"""
+        if self._stopping.is_set():
+            raise RequestError(SHUTTING_DOWN, "Daemon is shutting down")
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise RequestError(SERVER_BUSY, f"No free slot within {self.queue_timeout}s "
+                                            f"({self.max_concurrency} requests in flight)") from None
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            result = await work(self.orchestrator)
+            self.served += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+            self._slots.release()
+
+    # Methods
+
+    @staticmethod
+    def _task_params(params: Dict[str, Any]) -> tuple:
+        task = params.get("task")
+        if not isinstance(task, str) or not task:
+            raise RequestError(INVALID_PARAMS, "task must be a non-empty string")
+        context = params.get("context")
+        if context is not None and not isinstance(context, dict):
+            raise RequestError(INVALID_PARAMS, "context must be an object")
+        return task, context
+
+    def _workflow_param(self, params: Dict[str, Any]) -> Optional[Workflow]:
+        """The "workflow" param: a free-text plan ("architecture -> docker, devops") or a stage list"""
+        workflow = params.get("workflow")
+        try:
+            if isinstance(workflow, str):
+                return Workflow.from_plan(workflow, self.orchestrator.agents.keys())
+            if isinstance(workflow, list):
+                return Workflow.from_spec(workflow)
+        except (KeyError, ValueError) as error:
+            raise RequestError(INVALID_PARAMS, f"Invalid workflow: {error}") from None
+        if workflow is not None:
+            raise RequestError(INVALID_PARAMS, "workflow must be a plan string or a list of stages")
+        return None
+
+    async def _execute(self, params: Dict[str, Any]) -> dict:
+        task, context = self._task_params(params)
+        workflow = self._workflow_param(params)
+        return await self._run(lambda orchestrator: orchestrator.aexecute(
+            task, context, parallel=params.get("parallel"), workflow=workflow
+        ))
+
+    async def _route(self, params: Dict[str, Any]) -> dict:
+        task, context = self._task_params(params)
+        return await self._run(lambda orchestrator: orchestrator.aroute_task(task, context))
+
+    async def _run_agent(self, params: Dict[str, Any]) -> dict:
+        task, context = self._task_params(params)
+        name = params.get("agent")
+        if name not in self.orchestrator.agents:
+            raise RequestError(INVALID_PARAMS, f"Unknown agent: {name}")
+        use_cache = params.get("use_cache", True)
+        return await self._run(lambda orchestrator: orchestrator.get_agent(name).aexecute(
+            task, context, use_cache=use_cache
+        ))
+
+    async def _list_agents(self, params: Dict[str, Any]) -> Dict[str, str]:
+        return self.orchestrator.agents.descriptions()
+
+    async def _ping(self, params: Dict[str, Any]) -> dict:
+        return {"pid": os.getpid(), "generation": self.generation}
+
+    async def _stats(self, params: Dict[str, Any]) -> dict:
+        response_cache = get_response_cache()
+        routing_cache = self.orchestrator.routing_cache
+        flight = get_singleflight()
+        registry = get_metrics()
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "uptime": time.time() - self.started_at,
+            "generation": self.generation,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "served": self.served,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "loaded_agents": self.orchestrator.agents.loaded_agents(),
+            "routing": self.orchestrator.routing_metrics(),
+            "speculation": self.orchestrator.speculation_metrics(),
+            "routing_cache": routing_cache.stats() if routing_cache is not None else None,
+            "response_cache": response_cache.stats() if response_cache is not None else None,
+            "singleflight": flight.stats() if flight is not None else None,
+            "rate_limiter": get_rate_limiter().utilisation(),
+            "metrics": registry.snapshot() if hasattr(registry, "snapshot") else None
+        }
+
+    async def _reload(self, params: Dict[str, Any]) -> dict:
+        return await self.reload(bool(params.get("code", False)))
+
+    async def reload(self, code: bool = False) -> dict:
+        """
+        Swap in a freshly built orchestrator
+
+        Requests admitted before the swap finish on the old orchestrator. The
+        connection pool and the response cache are process-wide and stay warm.
+
+        Args:
+            code: Reload the agent modules first (picks up edited agents)
+        """
+        async with self._reloading:
+            started = time.monotonic()
+            orchestrator = await asyncio.get_running_loop().run_in_executor(
+                None, self._build_orchestrator, code
+            )
+            self.orchestrator = orchestrator
+            self.generation += 1
+        logger.info("Reloaded (generation %d)", self.generation)
+        return {"generation": self.generation, "seconds": time.monotonic() - started, "code": code}
+
+    def _signal_reload(self) -> None:
+        asyncio.ensure_future(self.reload())
+
+    async def _shutdown(self, params: Dict[str, Any]) -> dict:
+        # Answer first; the server stops once this response is written
+        asyncio.get_running_loop().call_soon(self._stopping.set)
+        return {"in_flight": self.in_flight}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a warm AgentOrchestrator over a Unix socket")
+    parser.add_argument("--socket", help="Socket path (default: $AGENT_DAEMON_SOCKET or a per-user path)")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Orchestrator requests served at once")
+    parser.add_argument("--queue-timeout", type=float, default=30.0,
+                        help="Seconds a request waits for a slot before it is rejected")
+    parser.add_argument("--drain-timeout", type=float, default=60.0,
+                        help="Seconds shutdown waits for in-flight requests")
+    parser.add_argument("--parallel", action="store_true", help="Run routed agents concurrently")
+    parser.add_argument("--local-first", action="store_true", help="Try the keyword router before the LLM")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Start the predicted primary agent while the LLM router runs")
+    parser.add_argument("--routing-cache", help="SQLite file for cached routing decisions")
+    parser.add_argument("--no-warm", action="store_true", help="Construct agents on first use instead of at start")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    # Shared across reloads so cached routing decisions stay warm
+    routing_cache = RoutingCache(args.routing_cache) if args.routing_cache else None
+
+    def factory() -> AgentOrchestrator:
+        return AgentOrchestrator(parallel=args.parallel, local_first=args.local_first,
+                                 routing_cache=routing_cache, speculative=args.speculative)
+
+    daemon = OrchestratorDaemon(
+        socket_path=args.socket,
+        max_concurrency=args.max_concurrency,
+        queue_timeout=args.queue_timeout,
+        drain_timeout=args.drain_timeout,
+        warm=not args.no_warm,
+        orchestrator_factory=factory
+    )
+    daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Daemon Client - Thin client and CLI for the orchestrator daemon
+
+Talks JSON-RPC to a running daemon (orchestrator/daemon.py) over its Unix
+socket. It only imports the standard library and the protocol module, so a
+CLI invocation costs an interpreter start and one socket round trip instead
+of importing and warming up the orchestrator.
+
+Usage:
+    python -m orchestrator.daemon_client execute "Add CI for this repo" --context '{"language": "Go"}'
+    python -m orchestrator.daemon_client agent security "Audit this" --context-file ctx.json
+    python -m orchestrator.daemon_client route "Write unit tests"
+    python -m orchestrator.daemon_client stats | reload [--code] | shutdown | agents | ping
+"""
+
+import argparse
+import itertools
+import json
+import socket
+import sys
+from typing import Any, Dict, Optional
+
+from .daemon_protocol import MAX_MESSAGE_BYTES, default_socket_path, encode, request
+
+
+class DaemonError(Exception):
+    """The daemon answered with a JSON-RPC error"""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket"""
+
+
+class DaemonClient:
+    """Sends JSON-RPC requests to the daemon, one connection per call"""
+
+    def __init__(self, socket_path: str = None, timeout: Optional[float] = None):
+        """
+        Args:
+            socket_path: Daemon socket (default: default_socket_path())
+            timeout: Seconds to wait for a response (None waits indefinitely)
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+
+    def call(self, method: str, **params) -> Any:
+        """Call `method` and return its result; raises DaemonError or DaemonUnavailable"""
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        try:
+            try:
+                connection.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError) as error:
+                raise DaemonUnavailable(f"No daemon listening on {self.socket_path}") from error
+            connection.sendall(encode(request(method, params, next(self._ids))))
+            response = json.loads(self._read_line(connection))
+        finally:
+            connection.close()
+
+        if "error" in response:
+            error = response["error"]
+            raise DaemonError(error.get("code", 0), error.get("message", ""), error.get("data"))
+        return response.get("result")
+
+    @staticmethod
+    def _read_line(connection: socket.socket) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                raise ConnectionError("Daemon closed the connection without a response")
+            newline = chunk.find(b"\n")
+            if newline != -1:
+                chunks.append(chunk[:newline])
+                return b"".join(chunks)
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > MAX_MESSAGE_BYTES:
+                raise ConnectionError("Daemon response exceeds the message size limit")
+
+    def execute(self, task: str, context: dict = None, parallel: bool = None, workflow: Any = None) -> dict:
+        return self.call("execute", task=task, context=context, parallel=parallel, workflow=workflow)
+
+    def route(self, task: str, context: dict = None) -> dict:
+        return self.call("route", task=task, context=context)
+
+    def run_agent(self, agent: str, task: str, context: dict = None, use_cache: bool = True) -> dict:
+        return self.call("run_agent", agent=agent, task=task, context=context, use_cache=use_cache)
+
+    def stats(self) -> dict:
+        return self.call("stats")
+
+    def reload(self, code: bool = False) -> dict:
+        return self.call("reload", code=code)
+
+    def shutdown(self) -> dict:
+        return self.call("shutdown")
+
+
+def _context(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    if getattr(args, "context_file", None):
+        with open(args.context_file, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    if getattr(args, "context", None):
+        return json.loads(args.context)
+    return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Send a request to the orchestrator daemon")
+    parser.add_argument("--socket", help="Daemon socket (default: $AGENT_DAEMON_SOCKET or a per-user path)")
+    parser.add_argument("--timeout", type=float, help="Seconds to wait for the response")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def with_context(command: argparse.ArgumentParser) -> None:
+        command.add_argument("task")
+        group = command.add_mutually_exclusive_group()
+        group.add_argument("--context", help="Context as a JSON object")
+        group.add_argument("--context-file", help="File holding the context JSON object")
+
+    execute = commands.add_parser("execute", help="Route and execute a task")
+    with_context(execute)
+    execute.add_argument("--parallel", action="store_true", default=None, help="Run routed agents concurrently")
+    execute.add_argument("--workflow", help='Explicit workflow, e.g. "architecture -> docker, devops"')
+
+    route = commands.add_parser("route", help="Show which agents would handle a task")
+    with_context(route)
+
+    agent = commands.add_parser("agent", help="Run a single agent")
+    agent.add_argument("agent")
+    with_context(agent)
+    agent.add_argument("--no-cache", action="store_true", help="Bypass the response cache")
+
+    commands.add_parser("agents", help="List the available agents")
+    commands.add_parser("stats", help="Show daemon, cache and metrics statistics")
+    commands.add_parser("ping", help="Check that the daemon is up")
+    reload = commands.add_parser("reload", help="Rebuild the orchestrator without dropping requests")
+    reload.add_argument("--code", action="store_true", help="Also reload the agent modules")
+    commands.add_parser("shutdown", help="Drain in-flight requests and stop the daemon")
+
+    args = parser.parse_args(argv)
+    client = DaemonClient(args.socket, args.timeout)
+    try:
+        if args.command == "execute":
+            result = client.execute(args.task, _context(args), args.parallel, args.workflow)
+        elif args.command == "route":
+            result = client.route(args.task, _context(args))
+        elif args.command == "agent":
+            result = client.run_agent(args.agent, args.task, _context(args), use_cache=not args.no_cache)
+        elif args.command == "agents":
+            result = client.call("list_agents")
+        elif args.command == "reload":
+            result = client.reload(args.code)
+        else:
+            result = client.call(args.command)
+    except DaemonUnavailable as error:
+        print(f"{error}; start it with: python -m orchestrator.daemon", file=sys.stderr)
+        return 2
+    except DaemonError as error:
+        print(f"Error {error.code}: {error}", file=sys.stderr)
+        return 1
+
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Daemon Protocol - JSON-RPC 2.0 framing shared by the daemon and its client
+
+Messages are single-line JSON-RPC 2.0 objects terminated by a newline, sent
+over a Unix domain socket. This module only uses the standard library so the
+client CLI stays cheap to start.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+JSONRPC_VERSION = "2.0"
+
+# Largest request or response line (contexts can carry whole source files)
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+# Standard JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+# Daemon error codes
+AGENT_ERROR = -32000      # the orchestrator or an agent raised
+SERVER_BUSY = -32001      # no concurrency slot freed up within the queue timeout
+SHUTTING_DOWN = -32002    # the daemon is draining and takes no new work
+
+
+def default_socket_path() -> str:
+    """AGENT_DAEMON_SOCKET, else a per-user socket in XDG_RUNTIME_DIR or the temp directory"""
+    configured = os.environ.get("AGENT_DAEMON_SOCKET")
+    if configured:
+        return configured
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "agent-orchestrator.sock")
+    temp_dir = os.environ.get("TMPDIR", "/tmp")
+    return os.path.join(temp_dir, f"agent-orchestrator-{os.getuid()}.sock")
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    """One protocol line; values JSON can't represent are sent as strings"""
+    return json.dumps(message, default=str, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def request(method: str, params: Optional[Dict[str, Any]] = None, request_id: Any = 1) -> Dict[str, Any]:
+    return {"jsonrpc": JSONRPC_VERSION, "method": method, "params": params or {}, "id": request_id}
+
+
+def result_response(request_id: Any, result: Any) -> Dict[str, Any]:
+    return {"jsonrpc": JSONRPC_VERSION, "result": result, "id": request_id}
+
+
+def error_response(request_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": JSONRPC_VERSION, "error": error, "id": request_id}
@@ -0,0 +1,133 @@
+"""
+Keyword Matcher - Single-pass multi-keyword scoring for local routing
+
+All routing keywords are compiled into one Aho-Corasick automaton, so a task
+is scanned once regardless of how many agents and keywords exist. Matches
+must start at a word boundary and end at one (optionally after a common
+inflection such as "-s" or "-ing"), so "test" matches "tests" but not
+"latest".
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+# Word endings accepted after a keyword ("deploy" -> "deployment")
+INFLECTIONS = frozenset(["s", "es", "ed", "d", "ing", "er", "ers", "ment", "ments"])
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping keywords to the agents they indicate"""
+
+    def __init__(self, keyword_map: Dict[str, Iterable[str]]):
+        """
+        Args:
+            keyword_map: Agent name -> keywords. Multi-word keywords are more
+                specific and weigh one point per word.
+        """
+        self.agents = list(keyword_map)
+        self.keywords: List[str] = []
+        self._keyword_agents: List[List[str]] = []
+        keyword_index: Dict[str, int] = {}
+
+        for agent, keywords in keyword_map.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword not in keyword_index:
+                    keyword_index[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self._keyword_agents.append([])
+                self._keyword_agents[keyword_index[keyword]].append(agent)
+
+        self._weights = [float(len(keyword.split())) for keyword in self.keywords]
+        self._build()
+
+    def _build(self) -> None:
+        # Trie: one transition dict, failure link and output list per node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            node = 0
+            for char in keyword:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """Return (start offset, keyword) for every word-bounded match in `text`"""
+        return [(start, self.keywords[index]) for start, index in self._matches(text)]
+
+    def _matches(self, text: str) -> List[Tuple[int, int]]:
+        text = text.lower()
+        length = len(text)
+        matches = []
+        node = 0
+
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            for index in self._output[node]:
+                keyword = self.keywords[index]
+                start = position - len(keyword) + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(keyword[0]):
+                    continue
+                if self._ends_word(text, position + 1, length, keyword):
+                    matches.append((start, index))
+
+        return matches
+
+    @staticmethod
+    def _ends_word(text: str, end: int, length: int, keyword: str) -> bool:
+        if end >= length or not _is_word_char(text[end]) or not _is_word_char(keyword[-1]):
+            return True
+        tail_end = end
+        while tail_end < length and _is_word_char(text[tail_end]):
+            tail_end += 1
+        return text[end:tail_end] in INFLECTIONS
+
+    def rank(self, text: str) -> List[Tuple[str, float]]:
+        """
+        Score every agent against `text` in one pass
+
+        Each distinct keyword counts once. Ties are broken by the earliest
+        match in the text, then by keyword map order.
+        """
+        scores: Dict[str, float] = {}
+        first_seen: Dict[str, int] = {}
+        counted = set()
+
+        for start, index in self._matches(text):
+            if index in counted:
+                continue
+            counted.add(index)
+            for agent in self._keyword_agents[index]:
+                scores[agent] = scores.get(agent, 0.0) + self._weights[index]
+                first_seen.setdefault(agent, start)
+
+        order = {agent: i for i, agent in enumerate(self.agents)}
+        return sorted(scores.items(), key=lambda item: (-item[1], first_seen[item[0]], order[item[0]]))
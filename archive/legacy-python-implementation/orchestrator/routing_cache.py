@@ -0,0 +1,156 @@
+"""
+Routing Cache - Persistent store for routing decisions
+
+Routing decisions are keyed by a hash of the normalized task and context and
+stored in SQLite, so repeated task shapes skip the LLM router even across
+process restarts. Entries expire after a TTL and the least recently used
+entries are evicted once the cache is full.
+
+Hot entries are also kept in process memory; their SQLite recency is updated
+in batches on the next write rather than on every hit.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def make_routing_key(task: str, context: dict = None, namespace: str = "") -> str:
+    """Hash a task and context, ignoring case, whitespace and key order"""
+    normalized_task = " ".join(task.lower().split())
+    normalized_context = json.dumps(context or {}, sort_keys=True, default=str)
+    payload = f"{namespace}\x00{normalized_task}\x00{normalized_context}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RoutingCache:
+    """SQLite-backed routing decision cache with TTL and LRU eviction"""
+
+    def __init__(self, path: str = ":memory:", ttl: Optional[float] = 24 * 3600, max_entries: int = 10000):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a process-local cache)
+            ttl: Seconds an entry stays valid (None disables expiry)
+            max_entries: Entries kept before least recently used ones are evicted
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS routing_cache ("
+            " key TEXT PRIMARY KEY,"
+            " routing TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS routing_cache_lru ON routing_cache (last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached routing decision for `key`, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT created_at, routing FROM routing_cache WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row is not None else None
+
+            if entry is not None and self.ttl is not None and now - entry[0] > self.ttl:
+                self._memory.pop(key, None)
+                self._touched.pop(key, None)
+                self._conn.execute("DELETE FROM routing_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._remember(key, entry)
+            self._touched[key] = now
+            self.hits += 1
+        return json.loads(entry[1])
+
+    def set(self, key: str, routing: dict) -> None:
+        """Store a routing decision, evicting the least recently used entries if full"""
+        now = time.time()
+        entry = (now, json.dumps(routing))
+        with self._lock:
+            self._flush_touched()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO routing_cache (key, created_at, routing, last_used) VALUES (?, ?, ?, ?)",
+                (key, entry[0], entry[1], now)
+            )
+            self._remember(key, entry)
+
+            overflow = self._size() - self.max_entries
+            if overflow > 0:
+                evicted = [row[0] for row in self._conn.execute(
+                    "SELECT key FROM routing_cache ORDER BY last_used ASC LIMIT ?", (overflow,)
+                )]
+                self._conn.executemany("DELETE FROM routing_cache WHERE key = ?", [(k,) for k in evicted])
+                for evicted_key in evicted:
+                    self._memory.pop(evicted_key, None)
+                self.evictions += len(evicted)
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM routing_cache")
+            self._conn.commit()
+            self._memory.clear()
+            self._touched.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            size = self._size()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": size
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self) -> None:
+        """Persist recency of entries served since the last write"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE routing_cache SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM routing_cache").fetchone()[0]
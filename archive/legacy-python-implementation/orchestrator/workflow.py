@@ -0,0 +1,337 @@
+"""
+Workflow Engine - Dependency-ordered execution of multi-agent plans
+
+A workflow is a DAG of stages, one agent call per stage. It can be built from
+an explicit spec or from the router's free-text "workflow" plan, e.g.
+
+    "architecture -> docker, devops -> observability"
+
+Stages whose dependencies have finished run concurrently, and every stage
+receives the responses of its direct upstream stages appended to its task.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, TimeoutError, wait
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.tracing import span
+
+
+# Boundaries between consecutive steps of a free-text plan
+_STEP_SEPARATORS = re.compile(
+    r"->|→|=>|\n|;|\bthen\b|\bfollowed by\b|\bafterwards?\b|\bnext\b|\bfinally\b|(?:^|\s)\d+[.)]\s",
+    re.IGNORECASE
+)
+
+
+class WorkflowStage:
+    """A single agent call inside a workflow"""
+
+    def __init__(self, agent: str, depends_on: Iterable[str] = (), task: str = None, name: str = None):
+        self.name = name or agent
+        self.agent = agent
+        self.depends_on = list(depends_on)
+        self.task = task
+
+    def __repr__(self) -> str:
+        return f"WorkflowStage({self.name!r}, depends_on={self.depends_on!r})"
+
+
+class Workflow:
+    """A validated DAG of workflow stages"""
+
+    def __init__(self, stages: Iterable[WorkflowStage]):
+        self.stages: Dict[str, WorkflowStage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate workflow stage: {stage.name}")
+            self.stages[stage.name] = stage
+
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage {stage.name} depends on unknown stage {dependency}")
+
+        self._levels = self._compute_levels()
+
+    @classmethod
+    def from_spec(cls, spec: Iterable[Any]) -> "Workflow":
+        """
+        Build a workflow from an explicit spec
+
+        Each item is an agent name (no dependencies), a WorkflowStage, or a
+        dict with "agent" and optional "depends_on", "task" and "name" keys.
+        """
+        stages = []
+        for item in spec:
+            if isinstance(item, WorkflowStage):
+                stages.append(item)
+            elif isinstance(item, str):
+                stages.append(WorkflowStage(item))
+            elif isinstance(item, dict):
+                stages.append(WorkflowStage(
+                    item["agent"],
+                    depends_on=item.get("depends_on", []),
+                    task=item.get("task"),
+                    name=item.get("name")
+                ))
+            else:
+                raise ValueError(f"Invalid workflow stage: {item!r}")
+        return cls(stages)
+
+    @classmethod
+    def from_routing(cls, routing: dict, known: Optional[Iterable[str]] = None) -> "Workflow":
+        """
+        Build a workflow from a routing decision
+
+        Structured plans (a list of stages, or a dict with "stages") are used
+        as-is. Free-text plans are split into ordered steps; agents named in
+        the same step run in parallel and depend on every agent of the
+        previous step. Routed agents the plan does not mention run
+        independently. Without any recognisable structure the agents run
+        sequentially in routing order, or all at once if the plan only says
+        "parallel".
+
+        With `known` (e.g. an AgentRegistry), agents outside it are left out,
+        like the serial and parallel paths skip them; stages that depended
+        on a left-out stage depend on its dependencies instead.
+        """
+        agents = [routing["primary_agent"]]
+        for name in routing.get("secondary_agents", []):
+            if name not in agents:
+                agents.append(name)
+        if known is not None:
+            known = set(known)
+            agents = [name for name in agents if name in known]
+
+        plan = routing.get("workflow")
+        if isinstance(plan, dict):
+            plan = plan.get("stages", [])
+        if isinstance(plan, list):
+            workflow = cls.from_spec(plan)
+            if known is None:
+                return workflow
+            return cls(_known_stages(list(workflow.stages.values()), known))
+
+        text = plan if isinstance(plan, str) else ""
+        groups = _parse_plan(text, agents)
+        if not groups:
+            if re.search(r"\bparallel\b", text, re.IGNORECASE) and not re.search(r"\bsequential", text, re.IGNORECASE):
+                groups = [agents]
+            else:
+                groups = [[name] for name in agents]
+
+        stages = _chain(groups)
+        mentioned = {name for group in groups for name in group}
+        stages.extend(WorkflowStage(name) for name in agents if name not in mentioned)
+        return cls(stages)
+
+    @classmethod
+    def from_plan(cls, text: str, agents: Iterable[str]) -> "Workflow":
+        """
+        Build a workflow from a free-text plan, e.g. "architecture -> docker, devops"
+
+        Steps are parsed as in from_routing; only the names in `agents` that
+        the plan mentions become stages.
+        """
+        groups = _parse_plan(text, list(agents))
+        if not groups:
+            raise ValueError(f"Workflow plan names no known agent: {text!r}")
+        return cls(_chain(groups))
+
+    def levels(self) -> List[List[str]]:
+        """Stage names grouped by depth; stages in one level are independent"""
+        return [list(level) for level in self._levels]
+
+    def _compute_levels(self) -> List[List[str]]:
+        depth: Dict[str, int] = {}
+        remaining = list(self.stages)
+        while remaining:
+            progressed = False
+            for name in list(remaining):
+                dependencies = self.stages[name].depends_on
+                if all(dep in depth for dep in dependencies):
+                    depth[name] = 1 + max((depth[dep] for dep in dependencies), default=-1)
+                    remaining.remove(name)
+                    progressed = True
+            if not progressed:
+                raise ValueError(f"Workflow has a dependency cycle involving: {', '.join(remaining)}")
+
+        levels: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name in self.stages:
+            levels[depth[name]].append(name)
+        return levels
+
+    def run(self, agents: Any, task: str, context: dict = None,
+            max_concurrency: int = 4, stage_timeout: Optional[float] = None,
+            shared_context: Any = None) -> Dict[str, dict]:
+        """
+        Execute the workflow
+
+        Args:
+            agents: Mapping of agent name to agent (e.g. an AgentRegistry)
+            task: The overall task; stages without their own task use it
+            context: Context passed to every stage
+            max_concurrency: Maximum number of stages running at once
+            stage_timeout: Seconds a single stage may run before it is failed,
+                counted from when it starts running (not while it is queued)
+            shared_context: SharedContext passed to every stage's agent, built
+                once for the whole workflow
+
+        Returns:
+            dict of stage name -> {"agent", "result", "error", "duration"}, in
+            stage order. "error" holds the exception for failed, timed-out or
+            skipped stages (a stage is skipped when an upstream stage failed).
+        """
+        outcomes: Dict[str, dict] = {}
+        pending = [name for level in self._levels for name in level]
+        running: Dict[Future, str] = {}
+        # Set by the worker when a stage starts running
+        started: Dict[str, float] = {}
+        max_concurrency = max(1, max_concurrency)
+
+        def submit(stage: WorkflowStage, stage_task: str) -> Future:
+            # A thread per stage rather than a pool: a timed-out stage can't be
+            # interrupted, and its thread must not hold a worker later stages need
+            future: Future = Future()
+
+            def work() -> None:
+                if not future.set_running_or_notify_cancel():
+                    return
+                started[stage.name] = time.monotonic()
+                try:
+                    future.set_result(self._run_stage(agents, stage, stage_task, context, shared_context))
+                except BaseException as error:
+                    future.set_exception(error)
+
+            threading.Thread(target=work, name=f"workflow-{stage.name}", daemon=True).start()
+            return future
+
+        while pending or running:
+            for name in list(pending):
+                stage = self.stages[name]
+                failed = [dep for dep in stage.depends_on if dep in outcomes and outcomes[dep]["error"]]
+                if failed:
+                    pending.remove(name)
+                    outcomes[name] = self._outcome(
+                        stage, None, RuntimeError(f"skipped: upstream {', '.join(failed)} failed"), 0.0
+                    )
+                    continue
+                if len(running) >= max_concurrency:
+                    continue
+                if all(dep in outcomes for dep in stage.depends_on):
+                    pending.remove(name)
+                    stage_task = self._stage_task(stage, task, outcomes)
+                    future = submit(stage, stage_task)
+                    running[future] = name
+
+            if not running:
+                continue
+
+            timeout = None
+            if stage_timeout is not None:
+                begun = [started[name] for name in running.values() if name in started]
+                # A stage whose thread has not started yet is polled until it does
+                timeout = max(0.0, min(begun) + stage_timeout - time.monotonic()) if begun else 0.05
+
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                result = None if error is not None else future.result()
+                outcomes[name] = self._outcome(self.stages[name], result, error, now - started.get(name, now))
+
+            if stage_timeout is not None:
+                for future, name in list(running.items()):
+                    if name in started and now - started[name] >= stage_timeout:
+                        del running[future]
+                        future.cancel()
+                        outcomes[name] = self._outcome(
+                            self.stages[name], None,
+                            TimeoutError(f"stage timed out after {stage_timeout}s"), now - started[name]
+                        )
+
+        return {name: outcomes[name] for name in self.stages}
+
+    @staticmethod
+    def _outcome(stage: WorkflowStage, result: Any, error: Optional[BaseException], duration: float) -> dict:
+        return {"agent": stage.agent, "result": result, "error": error, "duration": duration}
+
+    def _stage_task(self, stage: WorkflowStage, task: str, outcomes: Dict[str, dict]) -> str:
+        """Append the responses of direct upstream stages to the stage's task"""
+        stage_task = stage.task or task
+        upstream = [
+            (dep, outcomes[dep]["result"].get("response", ""))
+            for dep in stage.depends_on
+            if isinstance(outcomes[dep]["result"], dict)
+        ]
+        if upstream:
+            stage_task += "\n\nOutput from earlier workflow stages:\n"
+            for dep, response in upstream:
+                stage_task += f"\n[{dep}]\n{response}\n"
+        return stage_task
+
+    @staticmethod
+    def _run_stage(agents: Any, stage: WorkflowStage, task: str, context: dict,
+                   shared_context: Any = None) -> dict:
+        agent = agents.get(stage.agent)
+        if agent is None:
+            raise LookupError(f"Unknown agent: {stage.agent}")
+        with span(f"stage:{stage.name}", category="workflow", agent=stage.agent):
+            if shared_context is None:
+                return agent.execute(task, context)
+            return agent.execute(task, context, shared_context=shared_context)
+
+
+def _known_stages(stages: List[WorkflowStage], known: set) -> List[WorkflowStage]:
+    """Stages whose agent is in `known`; dependencies on other stages are replaced by theirs"""
+    by_name = {stage.name: stage for stage in stages}
+
+    def resolve(names: Iterable[str]) -> List[str]:
+        resolved: List[str] = []
+        for name in names:
+            if by_name[name].agent in known:
+                resolved.append(name)
+            else:
+                resolved.extend(resolve(by_name[name].depends_on))
+        return list(dict.fromkeys(resolved))
+
+    return [
+        WorkflowStage(stage.agent, depends_on=resolve(stage.depends_on), task=stage.task, name=stage.name)
+        for stage in stages if stage.agent in known
+    ]
+
+
+def _chain(groups: List[List[str]]) -> List[WorkflowStage]:
+    """Stages where every agent of a group depends on every agent of the previous group"""
+    stages = []
+    previous: List[str] = []
+    for group in groups:
+        stages.extend(WorkflowStage(name, depends_on=previous) for name in group)
+        previous = group
+    return stages
+
+
+def _parse_plan(text: str, agents: List[str]) -> List[List[str]]:
+    """Split a free-text plan into ordered groups of agent names"""
+    patterns = {
+        name: re.compile(r"\b" + re.escape(name).replace("_", "[ _-]") + r"\b", re.IGNORECASE)
+        for name in agents
+    }
+
+    groups: List[List[str]] = []
+    seen = set()
+    for step in _STEP_SEPARATORS.split(text):
+        found = []
+        for name, pattern in patterns.items():
+            match = pattern.search(step)
+            if match and name not in seen:
+                found.append((match.start(), name))
+        if found:
+            group = [name for _, name in sorted(found)]
+            seen.update(group)
+            groups.append(group)
+    return groups
@@ -1,3 +1,23 @@
 """Utility functions and helpers"""
 
-__all__ = []
+from .context_packer import estimate_tokens, pack_context
+from .metrics import MetricsRegistry, configure_metrics, get_metrics
+from .prompt_cache import SharedContext
+from .rate_limiter import RateLimiter, configure_rate_limiter, get_rate_limiter
+from .response_cache import ResponseCache, configure_response_cache, get_response_cache
+from .response_parser import ParsedResponse, ResponseParser, response_text
+from .singleflight import SingleFlight, configure_singleflight, get_singleflight
+from .tracing import Tracer, configure_tracer, get_tracer, trace_to
+from .transport import configure_connection_pool, configure_transport, create_async_client, create_client
+
+__all__ = [
+    'estimate_tokens', 'pack_context',
+    'MetricsRegistry', 'configure_metrics', 'get_metrics',
+    'SharedContext',
+    'RateLimiter', 'configure_rate_limiter', 'get_rate_limiter',
+    'ResponseCache', 'configure_response_cache', 'get_response_cache',
+    'ParsedResponse', 'ResponseParser', 'response_text',
+    'SingleFlight', 'configure_singleflight', 'get_singleflight',
+    'Tracer', 'configure_tracer', 'get_tracer', 'trace_to',
+    'configure_connection_pool', 'configure_transport', 'create_async_client', 'create_client',
+]
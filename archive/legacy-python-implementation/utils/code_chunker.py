@@ -0,0 +1,181 @@
+"""
+Code Chunker - Split large sources at function/class boundaries
+
+Python sources are split with the ast module at top-level statements; a
+class too large for one chunk is split between its methods, each piece
+repeating the class header. C-like sources (braces) are split where the
+brace depth returns to zero, ignoring braces inside strings and comments.
+Anything else, or Python that does not parse, is split at blank lines.
+
+Boundaries are grouped greedily into chunks of at most `max_lines` lines; a
+single definition longer than that is cut at line boundaries as a last
+resort. Line numbers are 1-based and refer to the original source.
+"""
+
+import ast
+from typing import List, Tuple
+
+
+# Languages split by brace depth
+BRACE_LANGUAGES = frozenset([
+    "c", "cpp", "c++", "csharp", "c#", "java", "javascript", "js", "typescript", "ts",
+    "jsx", "tsx", "go", "rust", "kotlin", "swift", "scala", "php", "dart", "objective-c"
+])
+
+
+class CodeChunk:
+    """Lines start_line..end_line (inclusive) of a source, with any context header"""
+
+    def __init__(self, start_line: int, end_line: int, text: str):
+        self.start_line = start_line
+        self.end_line = end_line
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"CodeChunk(lines {self.start_line}-{self.end_line})"
+
+
+def chunk_code(code: str, language: str, max_lines: int = 400) -> List[CodeChunk]:
+    """
+    Split `code` into chunks of at most `max_lines` lines at definition boundaries
+
+    Args:
+        code: Source text
+        language: Source language (selects the boundary strategy)
+        max_lines: Maximum lines per chunk
+
+    Returns:
+        Chunks in source order, covering every line of `code`
+    """
+    lines = code.split("\n")
+    if len(lines) <= max_lines:
+        return [CodeChunk(1, len(lines), code)]
+
+    language = (language or "").lower()
+    units = None
+    if language in ("python", "py"):
+        units = _python_units(code, lines, max_lines)
+    elif language in BRACE_LANGUAGES:
+        units = _brace_units(lines)
+    if not units:
+        units = _paragraph_units(lines)
+
+    chunks: List[CodeChunk] = []
+    pending: List[Tuple[int, int, str]] = []
+
+    def flush():
+        if pending:
+            start, end = pending[0][0], pending[-1][1]
+            header = pending[0][2]
+            body = "\n".join(lines[start - 1:end])
+            chunks.append(CodeChunk(start, end, f"{header}\n{body}" if header else body))
+            pending.clear()
+
+    for start, end, header in units:
+        if end - start + 1 > max_lines:
+            flush()
+            for piece_start in range(start, end + 1, max_lines):
+                pending.append((piece_start, min(end, piece_start + max_lines - 1), header))
+                flush()
+            continue
+        if pending and (end - pending[0][0] + 1 > max_lines or header != pending[0][2]):
+            flush()
+        pending.append((start, end, header))
+    flush()
+    return chunks
+
+
+def _python_units(code: str, lines: List[str], max_lines: int) -> List[Tuple[int, int, str]]:
+    """(start, end, header) units from top-level statements; oversized classes split by member"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+
+    units = []
+    previous_end = 0
+    for node in tree.body:
+        start = _node_start(node)
+        end = node.end_lineno
+        # Attach comments/blank lines before a statement to it
+        start = previous_end + 1 if start > previous_end + 1 else start
+        if isinstance(node, ast.ClassDef) and end - start + 1 > max_lines and node.body:
+            header_end = _node_start(node.body[0]) - 1
+            header = "\n".join(lines[_node_start(node) - 1:header_end])
+            units.append((start, header_end, ""))
+            member_start = header_end + 1
+            for member in node.body:
+                units.append((member_start, member.end_lineno, header))
+                member_start = member.end_lineno + 1
+            if member_start <= end:
+                units.append((member_start, end, header))
+        else:
+            units.append((start, end, ""))
+        previous_end = end
+
+    if previous_end < len(lines):
+        units.append((previous_end + 1, len(lines), ""))
+    return units
+
+
+def _node_start(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", None)
+    if decorators:
+        return min(decorator.lineno for decorator in decorators)
+    return node.lineno
+
+
+def _brace_units(lines: List[str]) -> List[Tuple[int, int, str]]:
+    """Units ending on lines where brace depth returns to zero (strings and comments skipped)"""
+    units = []
+    depth = 0
+    start = 1
+    in_block_comment = False
+    for number, line in enumerate(lines, 1):
+        quote = None
+        index = 0
+        while index < len(line):
+            char = line[index]
+            pair = line[index:index + 2]
+            if in_block_comment:
+                if pair == "*/":
+                    in_block_comment = False
+                    index += 1
+            elif quote is not None:
+                if char == "\\":
+                    index += 1
+                elif char == quote:
+                    quote = None
+            elif pair == "//":
+                break
+            elif pair == "/*":
+                in_block_comment = True
+                index += 1
+            elif char in "\"'`":
+                quote = char
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth = max(0, depth - 1)
+            index += 1
+
+        if depth == 0 and not in_block_comment and line.strip().endswith(("}", "};", ");")):
+            units.append((start, number, ""))
+            start = number + 1
+
+    if start <= len(lines):
+        units.append((start, len(lines), ""))
+    return units
+
+
+def _paragraph_units(lines: List[str]) -> List[Tuple[int, int, str]]:
+    """Units separated by blank lines"""
+    units = []
+    start = 1
+    for number, line in enumerate(lines, 1):
+        if not line.strip() and number > start:
+            units.append((start, number, ""))
+            start = number + 1
+    if start <= len(lines):
+        units.append((start, len(lines), ""))
+    return units
@@ -0,0 +1,190 @@
+"""
+Context Packer - Fit task context into a token budget before prompting
+
+Large context values (code, dependency manifests, configs, infrastructure
+descriptions) are split into segments: top-level definitions for code, or
+blank-line separated blocks for anything else. When the context exceeds the
+budget, segments are kept in order of relevance (definitions named in the
+task first, then imports/preambles, then the rest in file order): relevant
+segments whole, the others reduced to their first line, least relevant
+dropped first; leftover budget restores whole bodies. The "sections omitted"
+markers count against the budget.
+
+Token counts come from a local estimator, so packing needs no API call.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+
+# Word pieces and single punctuation characters, roughly how BPE splits code
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Top-level definitions in Python, JavaScript/TypeScript, Go, Rust, Java, C#, ...
+_DEFINITION_PATTERN = re.compile(
+    r"^(?:export\s+|pub\s+|public\s+|private\s+|protected\s+|static\s+|async\s+|default\s+)*"
+    r"(?:def|class|function|func|fn|interface|struct|enum|impl|type|const|let|var)\s+"
+    r"(?:\([^)]*\)\s*)?([A-Za-z_$][\w$]*)"
+)
+
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][\w]*")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of `text` (words split into ~4-character pieces)"""
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        tokens += (len(piece) + 3) // 4 if piece[0].isalnum() or piece[0] == "_" else 1
+    return tokens
+
+
+class Segment:
+    """A definition or block of a context value, kept whole, reduced or dropped"""
+
+    def __init__(self, key: str, order: int, lines: List[str], name: Optional[str], priority: int):
+        self.key = key
+        self.order = order
+        self.name = name
+        self.priority = priority
+        self.full = "\n".join(lines)
+        self.full_tokens = estimate_tokens(self.full)
+        if len(lines) > 2:
+            indent = re.match(r"\s*", lines[1]).group()
+            self.reduced = f"{lines[0]}\n{indent}... ({len(lines) - 1} lines elided)"
+        else:
+            self.reduced = self.full
+        self.reduced_tokens = estimate_tokens(self.reduced)
+        self.state = "full"
+
+    @property
+    def label(self) -> str:
+        first_line = self.full.split("\n", 1)[0].strip()
+        return f"{self.key}: {self.name or first_line[:60]}"
+
+    @property
+    def tokens(self) -> int:
+        return {"full": self.full_tokens, "elided": self.reduced_tokens, "dropped": 0}[self.state]
+
+
+def pack_context(task: str, context: Optional[dict], budget: int) -> Tuple[Optional[dict], Optional[dict]]:
+    """
+    Fit the string values of `context` into `budget` estimated tokens
+
+    Args:
+        task: The task, used to rank definitions it mentions by name
+        context: Task context; non-string values are passed through unchanged
+        budget: Token budget for all string values together
+
+    Returns:
+        (packed context, report). The report is None when nothing had to be
+        cut; otherwise it lists the budget, estimated tokens before and after
+        packing, and the labels of elided and dropped segments.
+    """
+    if not context:
+        return context, None
+
+    values = {key: value for key, value in context.items() if isinstance(value, str)}
+    original_tokens = sum(estimate_tokens(value) for value in values.values())
+    if original_tokens <= budget:
+        return context, None
+
+    mentioned = {word.lower() for word in _IDENTIFIER_PATTERN.findall(task)}
+    segments: List[Segment] = []
+    for key, value in values.items():
+        segments.extend(_split(key, value, mentioned, len(segments)))
+
+    ranked = sorted(segments, key=lambda segment: (-segment.priority, segment.order))
+    for segment in segments:
+        segment.state = "dropped"
+    total = 0
+
+    def place(segment: Segment, state: str) -> None:
+        nonlocal total
+        extra = {"full": segment.full_tokens, "elided": segment.reduced_tokens}[state] - segment.tokens
+        if total + extra <= budget:
+            segment.state = state
+            total += extra
+
+    # Definitions named in the task and preambles go in whole first, then
+    # every other segment as a stub, then whole bodies while budget remains
+    for segment in ranked:
+        if segment.priority > 0:
+            place(segment, "full")
+            if segment.state == "dropped":
+                place(segment, "elided")
+    for segment in ranked:
+        if segment.state == "dropped":
+            place(segment, "elided")
+    for segment in ranked:
+        if segment.state == "elided" and segment.reduced != segment.full:
+            place(segment, "full")
+
+    # The omission markers count too: cut the least relevant segments until they fit
+    markers = _omission_markers(values, segments)
+    while total + sum(estimate_tokens(marker) for marker in markers.values()) > budget:
+        victim = next((segment for segment in reversed(ranked) if segment.state != "dropped"), None)
+        if victim is None:
+            break
+        if victim.state == "full" and victim.reduced_tokens < victim.full_tokens:
+            victim.state = "elided"
+        else:
+            victim.state = "dropped"
+        total = sum(segment.tokens for segment in segments)
+        markers = _omission_markers(values, segments)
+    total += sum(estimate_tokens(marker) for marker in markers.values())
+
+    packed = dict(context)
+    for key in values:
+        parts = [segment.full if segment.state == "full" else segment.reduced
+                 for segment in segments if segment.key == key and segment.state != "dropped"]
+        if key in markers:
+            parts.append(markers[key])
+        packed[key] = "\n".join(parts)
+
+    report = {
+        "budget": budget,
+        "original_tokens": original_tokens,
+        "packed_tokens": total,
+        "elided": [segment.label for segment in segments
+                   if segment.state == "elided" and segment.reduced != segment.full],
+        "dropped": [segment.label for segment in segments if segment.state == "dropped"]
+    }
+    return packed, report
+
+
+def _omission_markers(values: dict, segments: List[Segment]) -> dict:
+    """Marker line for each value that lost segments"""
+    dropped = {}
+    for segment in segments:
+        if segment.state == "dropped":
+            dropped[segment.key] = dropped.get(segment.key, 0) + 1
+    return {
+        key: f"... ({count} sections omitted to fit the context budget)"
+        for key, count in dropped.items() if key in values
+    }
+
+
+def _split(key: str, value: str, mentioned: set, first_order: int) -> List[Segment]:
+    """Split a value at top-level definitions, or at blank lines if it has none"""
+    lines = value.split("\n")
+    starts = [index for index, line in enumerate(lines) if _DEFINITION_PATTERN.match(line)]
+    if not starts:
+        starts = [index for index, line in enumerate(lines)
+                  if line.strip() and (index == 0 or not lines[index - 1].strip())]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+
+    segments = []
+    for position, start in enumerate(starts):
+        end = starts[position + 1] if position + 1 < len(starts) else len(lines)
+        chunk = lines[start:end]
+        match = _DEFINITION_PATTERN.match(chunk[0])
+        name = match.group(1) if match else None
+        if name is not None and name.lower() in mentioned:
+            priority = 2
+        elif name is None and position == 0:
+            priority = 1  # imports / preamble
+        else:
+            priority = 0
+        segments.append(Segment(key, first_order + position, chunk, name, priority))
+    return segments
@@ -0,0 +1,270 @@
+"""
+Metrics - Per-agent latency, token, cache, retry and error instrumentation
+
+Agents, the router and the rate limiter report to the process-wide metrics
+registry through the record_* helpers below. The default MetricsRegistry
+keeps labelled counters and histograms in memory and can render them in the
+Prometheus text exposition format or as a plain dict snapshot.
+
+The registry is pluggable: configure_metrics() accepts any object with
+`counter(name, help)` and `histogram(name, help, buckets)` factories whose
+instruments provide `inc(amount, **labels)` / `observe(value, **labels)`,
+e.g. an adapter around prometheus_client, or None to disable metrics.
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Latency buckets in seconds, spanning cache hits to long generations
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Content type for serving render_prometheus() output over HTTP
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with one value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, List[float]] = {}  # bucket counts..., sum, count
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        samples = []
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", key + (("le", _format_value(bound)),), cumulative))
+                samples.append((f"{self.name}_bucket", key + (("le", "+Inf"),), series[-1]))
+                samples.append((f"{self.name}_sum", key, series[-2]))
+                samples.append((f"{self.name}_count", key, series[-1]))
+        return samples
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(key),
+                    "count": series[-1],
+                    "sum": series[-2],
+                    "buckets": dict(zip(self.buckets, series[:len(self.buckets)]))
+                }
+                for key, series in sorted(self._series.items())
+            ]
+
+
+class MetricsRegistry:
+    """In-memory registry of named counters and histograms"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help, buckets))
+
+    def _get_or_create(self, name: str, factory) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values of every metric: name -> {"type", "help", "series"}"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "series": metric.snapshot()}
+            for metric in metrics
+        }
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+_shared_metrics: Optional[Any] = MetricsRegistry()
+
+
+def get_metrics() -> Optional[Any]:
+    """The process-wide metrics registry, or None when metrics are disabled"""
+    return _shared_metrics
+
+
+def configure_metrics(registry: Optional[Any] = None) -> Optional[Any]:
+    """Replace the process-wide metrics registry (None disables metrics)"""
+    global _shared_metrics
+    _shared_metrics = registry
+    return _shared_metrics
+
+
+# Recording helpers used by agents, the router and the rate limiter
+
+def record_request(agent: str, model: str, seconds: float, outcome: str,
+                   usage: Optional[Dict[str, int]] = None, error: Optional[BaseException] = None) -> None:
+    """
+    Record one agent (or router) request
+
+    Args:
+        agent: Agent name ("router" for routing calls)
+        model: Model name
+        seconds: Wall time of the request
+        outcome: "ok", "cached", "coalesced" (shared an identical in-flight call) or "error"
+        usage: Token usage of the response (see utils.prompt_cache.response_usage)
+        error: The exception, for outcome "error"
+    """
+    registry = _shared_metrics
+    if registry is None:
+        return
+    labels = {"agent": agent, "model": model}
+    registry.histogram(
+        "agent_request_duration_seconds", "Agent request latency in seconds"
+    ).observe(seconds, outcome=outcome, **labels)
+    registry.counter("agent_requests_total", "Agent requests by outcome").inc(1, outcome=outcome, **labels)
+    if outcome == "cached":
+        registry.counter("agent_cache_hits_total", "Requests served from a cache").inc(1, cache="response", **labels)
+    if outcome == "coalesced":
+        registry.counter(
+            "agent_coalesced_total", "Requests that shared an identical in-flight call"
+        ).inc(1, **labels)
+    if error is not None:
+        registry.counter("agent_errors_total", "Failed agent requests by exception type").inc(
+            1, error=type(error).__name__, **labels
+        )
+    if usage:
+        _count_tokens(registry.counter("agent_tokens_total", "Tokens used by agent requests"), usage, **labels)
+
+
+def _count_tokens(counter: Any, usage: Dict[str, int], **labels) -> None:
+    for field, token_type in (("input_tokens", "input"), ("output_tokens", "output"),
+                              ("cache_read_input_tokens", "cache_read"),
+                              ("cache_creation_input_tokens", "cache_write")):
+        if usage.get(field):
+            counter.inc(usage[field], type=token_type, **labels)
+
+
+def record_routing(tier: str, model: str, seconds: float) -> None:
+    """Record one routing decision and the tier that made it"""
+    registry = _shared_metrics
+    if registry is None:
+        return
+    registry.histogram(
+        "routing_duration_seconds", "route_task latency in seconds by deciding tier"
+    ).observe(seconds, tier=tier, model=model)
+    registry.counter("routing_decisions_total", "Routing decisions by deciding tier").inc(1, tier=tier, model=model)
+    if tier == "cache":
+        registry.counter("agent_cache_hits_total", "Requests served from a cache").inc(
+            1, cache="routing", agent="router", model=model
+        )
+
+
+def record_speculation(outcome: str, agent: str, model: str) -> None:
+    """Record the outcome of a speculative agent run: hit (chosen as primary), reused (as a secondary) or miss"""
+    registry = _shared_metrics
+    if registry is None:
+        return
+    registry.counter("speculations_total", "Speculative primary agent runs by outcome").inc(
+        1, outcome=outcome, agent=agent, model=model
+    )
+
+
+def record_speculation_waste(agent: str, model: str, usage: Dict[str, int]) -> None:
+    """Record the token usage of a finished speculative run whose result was discarded"""
+    registry = _shared_metrics
+    if registry is None:
+        return
+    _count_tokens(
+        registry.counter("speculation_wasted_tokens_total", "Tokens used by discarded speculative runs"),
+        usage, agent=agent, model=model
+    )
+
+
+def record_retry(model: str, agent: str = "unknown", reason: str = "rate_limited") -> None:
+    """Record a retried request (reason: rate_limited, overloaded, server_error or connection_error)"""
+    registry = _shared_metrics
+    if registry is None:
+        return
+    registry.counter("agent_retries_total", "Requests retried after rate limiting or transient errors").inc(
+        1, agent=agent, model=model, reason=reason
+    )
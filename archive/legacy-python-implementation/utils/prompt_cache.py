@@ -0,0 +1,98 @@
+"""
+Prompt Cache - Cacheable prompt prefixes and cache usage accounting
+
+Agents send their system prompt as a text block marked with cache_control so
+the API can reuse the processed prefix on later calls. For multi-agent runs,
+the large values of the task context (source code, logs, schemas, ...) are
+rendered once into a SharedContext block that is placed ahead of each agent's
+system prompt: every agent in the run then shares the same cached prefix, and
+the agents' own prompts refer to the shared block instead of repeating it.
+
+Prefixes shorter than the model's minimum cacheable length are simply not
+cached by the API, so marking small blocks is harmless.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .context_packer import pack_context
+
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Usage fields reported per call and summed across agents
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+def cached_block(text: str) -> Dict[str, Any]:
+    """Text block marked as the end of a cacheable prefix"""
+    return {"type": "text", "text": text, "cache_control": dict(CACHE_CONTROL)}
+
+
+class SharedContext:
+    """Large context values rendered once as a cacheable block shared by several agents"""
+
+    def __init__(self, values: Dict[str, str], packed: Optional[Dict[str, str]] = None,
+                 packing: Optional[dict] = None):
+        """
+        Args:
+            values: Context key -> text moved into the shared block
+            packed: Values as rendered in the block, if packed to a budget
+            packing: Packing report for the rendered values
+        """
+        self.values = values
+        self.packing = packing
+        packed = packed or values
+        sections = [f"### {key}\n{value}" for key, value in packed.items()]
+        self.text = "Shared context for this task (referenced by key below):\n\n" + "\n\n".join(sections)
+        self.block = cached_block(self.text)
+
+    @classmethod
+    def build(cls, context: Optional[dict], min_chars: int = 2000, task: str = "",
+              budget: Optional[int] = 24000) -> Optional["SharedContext"]:
+        """
+        Collect string values of at least `min_chars` characters, or None if there are none
+
+        With a `budget`, the collected values are packed to fit it (see
+        pack_context), ranking definitions named in `task` first.
+        """
+        if not context:
+            return None
+        values = {
+            key: value for key, value in context.items()
+            if isinstance(value, str) and len(value) >= min_chars
+        }
+        if not values:
+            return None
+        packed, packing = values, None
+        if budget is not None:
+            packed, packing = pack_context(task, values, budget)
+        return cls(values, packed, packing)
+
+    def agent_context(self, context: Optional[dict]) -> Optional[dict]:
+        """Copy of `context` with shared values replaced by a reference to the shared block"""
+        if not context:
+            return context
+        return {
+            key: f"[see '{key}' in the shared context]" if key in self.values and value == self.values[key] else value
+            for key, value in context.items()
+        }
+
+
+def response_usage(response: Any) -> Dict[str, int]:
+    """Token usage of a Message, including prompt cache reads and writes"""
+    usage = getattr(response, "usage", None)
+    return {field: getattr(usage, field, 0) or 0 for field in USAGE_FIELDS}
+
+
+def sum_usage(usages: List[Optional[Dict[str, int]]]) -> Dict[str, int]:
+    """Add up usage dicts, skipping missing ones"""
+    total = dict.fromkeys(USAGE_FIELDS, 0)
+    for usage in usages:
+        for field in USAGE_FIELDS:
+            total[field] += (usage or {}).get(field, 0)
+    return total
@@ -0,0 +1,343 @@
+"""
+Rate Limiter - Process-wide request and token budgets for API calls
+
+Every agent (and the orchestrator's router) sends its `messages.create` call
+through one shared RateLimiter. Two token buckets enforce requests-per-minute
+and tokens-per-minute limits: a call reserves its estimated tokens (prompt
+size plus max_tokens) up front and the reservation is reconciled with the
+real usage afterwards. A 429 (or 529 overloaded) response pauses all callers
+for its Retry-After period before the call is retried; server and connection
+errors are retried with backoff by the failing caller only. The SDK's own
+retries are turned off so every retry goes through the limiter. acall() is the coroutine counterpart of
+call() for async clients; it waits on the event loop instead of blocking.
+
+Limits default to the ANTHROPIC_RPM / ANTHROPIC_TPM environment variables
+and are unlimited when those are not set.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .metrics import record_retry
+from .tracing import span
+
+
+class TokenBucket:
+    """Bucket holding up to `per_minute` units, refilled continuously"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (after refill)"""
+        deficit = min(amount, self.capacity) - self.level
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+class RateLimiter:
+    """Shared requests-per-minute and tokens-per-minute limiter"""
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_retries: int = 3):
+        """
+        Args:
+            requests_per_minute: Request budget (None for unlimited)
+            tokens_per_minute: Input + output token budget (None for unlimited)
+            max_retries: Retries after a 429 before the error is raised
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+
+        self._condition = threading.Condition()
+        self._blocked_until = 0.0
+        self._window = deque()  # (timestamp, tokens) of completed calls
+        self._in_flight = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """Block until a request with `estimated_tokens` fits both budgets; return seconds waited"""
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                delay = self._reserve(estimated_tokens)
+                if delay <= 0:
+                    break
+                self._condition.wait(delay)
+
+            waited = time.monotonic() - started
+            self.throttled_seconds += waited
+        return waited
+
+    async def aacquire(self, estimated_tokens: int = 0) -> float:
+        """Coroutine version of acquire(): sleeps on the event loop until the request fits"""
+        import asyncio  # only needed by async callers; kept off the import path
+
+        started = time.monotonic()
+        # Budget is only taken by _reserve() right before returning, so a task
+        # cancelled while sleeping here holds no reservation
+        while True:
+            with self._condition:
+                delay = self._reserve(estimated_tokens)
+                if delay <= 0:
+                    waited = time.monotonic() - started
+                    self.throttled_seconds += waited
+                    return waited
+            await asyncio.sleep(delay)
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        """Take budget for one request if it fits now (return 0), else return the seconds to wait; needs the lock"""
+        now = time.monotonic()
+        delay = max(0.0, self._blocked_until - now)
+        for bucket, amount in ((self.requests, 1), (self.tokens, estimated_tokens)):
+            if bucket is not None:
+                bucket.refill(now)
+                delay = max(delay, bucket.wait_time(amount))
+        if delay > 0:
+            return delay
+
+        if self.requests is not None:
+            self.requests.level -= 1
+        if self.tokens is not None:
+            self.tokens.level -= min(estimated_tokens, self.tokens.capacity)
+        self._in_flight += 1
+        return 0.0
+
+    def release(self, estimated_tokens: int = 0, actual_tokens: Optional[int] = None) -> None:
+        """Finish a request, refunding (or charging) the difference between estimate and usage"""
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            if actual_tokens is not None:
+                if self.tokens is not None:
+                    self.tokens.refill(now)
+                    self.tokens.level += min(estimated_tokens, self.tokens.capacity) - actual_tokens
+                self._window.append((now, actual_tokens))
+            self._condition.notify_all()
+
+    def block_for(self, seconds: float) -> None:
+        """Pause all callers for `seconds` (e.g. a Retry-After header)"""
+        with self._condition:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self.rate_limited += 1
+
+    def call(self, client: Any, agent: Optional[str] = None, **request) -> Any:
+        """Send `client.messages.create(**request)` through the limiter (`agent` labels retry metrics)"""
+        client = without_sdk_retries(client)
+        estimated = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            with span("rate_limit_wait", category="network"):
+                self.acquire(estimated)
+            try:
+                response = client.messages.create(**request)
+            except Exception as error:
+                # A failed call used no tokens; refund the reservation so
+                # retries don't pay for it again
+                self.release(estimated, 0)
+                delay = self._retry_delay(error, attempt, request, agent)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Interrupted mid-request: it may have been billed, keep the estimate charged
+                self.release(estimated)
+                raise
+
+            self.release(estimated, response_tokens(response))
+            return response
+
+    async def acall(self, client: Any, agent: Optional[str] = None, **request) -> Any:
+        """Await `client.messages.create(**request)` of an async client through the limiter"""
+        import asyncio  # only needed by async callers; kept off the import path
+
+        client = without_sdk_retries(client)
+        estimated = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            with span("rate_limit_wait", category="network"):
+                await self.aacquire(estimated)
+            try:
+                response = await client.messages.create(**request)
+            except Exception as error:
+                self.release(estimated, 0)
+                delay = self._retry_delay(error, attempt, request, agent)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (e.g. by asyncio.wait_for) mid-request: it may have
+                # been billed, keep the estimate charged
+                self.release(estimated)
+                raise
+
+            self.release(estimated, response_tokens(response))
+            return response
+
+    @contextmanager
+    def stream(self, client: Any, agent: Optional[str] = None, **request) -> Iterator[Any]:
+        """Open `client.messages.stream(**request)` through the limiter (`agent` labels retry metrics)"""
+        client = without_sdk_retries(client)
+        estimated = estimate_request_tokens(request)
+        attempt = 0
+        while True:
+            with span("rate_limit_wait", category="network"):
+                self.acquire(estimated)
+            manager = client.messages.stream(**request)
+            try:
+                stream = manager.__enter__()
+            except Exception as error:
+                self.release(estimated, 0)
+                delay = self._retry_delay(error, attempt, request, agent)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.release(estimated)
+                raise
+            break
+
+        try:
+            yield stream
+        except BaseException:
+            self.release(estimated)
+            if not manager.__exit__(*sys.exc_info()):
+                raise
+        else:
+            actual = None
+            try:
+                actual = response_tokens(stream.get_final_message())
+            finally:
+                self.release(estimated, actual)
+                manager.__exit__(*sys.exc_info())
+
+    def _retry_delay(self, error: Exception, attempt: int, request: dict, agent: Optional[str]) -> Optional[float]:
+        """
+        Seconds this caller sleeps before retrying a failed attempt, or None to raise the error
+
+        Rate limiting (429) and overload (529) pause every caller for the
+        Retry-After period; server and connection errors back off this caller only.
+        """
+        if attempt >= self.max_retries:
+            return None
+        status = getattr(error, "status_code", None)
+        backoff = retry_after(error, default=2.0 ** attempt)
+        if status in (429, 529):
+            self.block_for(backoff)
+            reason, delay = "rate_limited" if status == 429 else "overloaded", 0.0
+        elif status in (408, 409) or (status is not None and status >= 500):
+            reason, delay = "server_error", backoff
+        elif status is None and type(error).__name__ in _CONNECTION_ERRORS:
+            reason, delay = "connection_error", backoff
+        else:
+            return None
+        record_retry(request.get("model", "unknown"), agent or "unknown", reason)
+        return delay
+
+    def utilisation(self) -> Dict[str, Any]:
+        """Current budget usage; *_utilisation values are 0..1 (None when unlimited)"""
+        now = time.monotonic()
+        with self._condition:
+            while self._window and now - self._window[0][0] > 60:
+                self._window.popleft()
+            stats = {
+                "requests_per_minute": self.requests.capacity if self.requests else None,
+                "tokens_per_minute": self.tokens.capacity if self.tokens else None,
+                "request_utilisation": None,
+                "token_utilisation": None,
+                "requests_last_minute": len(self._window),
+                "tokens_last_minute": sum(tokens for _, tokens in self._window),
+                "in_flight": self._in_flight,
+                "blocked_for": max(0.0, self._blocked_until - now),
+                "throttled_seconds": self.throttled_seconds,
+                "rate_limited": self.rate_limited
+            }
+            for name, bucket in (("request_utilisation", self.requests), ("token_utilisation", self.tokens)):
+                if bucket is not None:
+                    bucket.refill(now)
+                    stats[name] = max(0.0, 1.0 - bucket.level / bucket.capacity)
+        return stats
+
+
+# anthropic exceptions for requests that never got a response (matched by name
+# so the SDK isn't imported here)
+_CONNECTION_ERRORS = frozenset({"APIConnectionError", "APITimeoutError"})
+
+
+def without_sdk_retries(client: Any) -> Any:
+    """
+    The client with the SDK's own retries turned off
+
+    The SDK retries 429s inside messages.create by default, so callers would
+    back off one by one instead of through the limiter's shared pause. Clients
+    from utils.transport are already built this way; injected ones are copied.
+    """
+    if getattr(client, "max_retries", 0) and hasattr(client, "with_options"):
+        return client.with_options(max_retries=0)
+    return client
+
+
+def estimate_request_tokens(request: dict) -> int:
+    """Rough token count for a request: ~4 characters per token plus max_tokens"""
+    chars = len(str(request.get("system", "")))
+    for message in request.get("messages", []):
+        chars += len(str(message.get("content", "")))
+    return chars // 4 + int(request.get("max_tokens", 0))
+
+
+def response_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+
+
+def retry_after(error: Any, default: float) -> float:
+    """Seconds from a 429 error's Retry-After header, or `default`"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_limit(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else None
+
+
+_shared_limiter = RateLimiter(_env_limit("ANTHROPIC_RPM"), _env_limit("ANTHROPIC_TPM"))
+
+
+def get_rate_limiter() -> RateLimiter:
+    """The process-wide limiter used by all agents"""
+    return _shared_limiter
+
+
+def configure_rate_limiter(requests_per_minute: Optional[float] = None,
+                           tokens_per_minute: Optional[float] = None,
+                           max_retries: int = 3) -> RateLimiter:
+    """Replace the process-wide limiter with one using the given budgets"""
+    global _shared_limiter
+    _shared_limiter = RateLimiter(requests_per_minute, tokens_per_minute, max_retries)
+    return _shared_limiter
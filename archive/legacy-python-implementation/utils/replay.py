@@ -0,0 +1,328 @@
+"""
+Replay - Record and replay API exchanges through cassette files
+
+ReplayClient stands in for an Anthropic client (`messages.create` and
+`messages.stream`), AsyncReplayClient for an AsyncAnthropic client
+(awaitable `messages.create`). In "record" mode requests go to a live client and each
+request/response pair is appended to a JSON cassette; in "replay" mode
+responses are served from the cassette without network access; "auto"
+replays what the cassette has and records the rest.
+
+Requests are matched by a hash of their canonical JSON. Identical requests
+recorded several times are replayed in recorded order (the last one repeats).
+A LatencyModel can delay replayed responses to simulate the API: a base
+delay drawn from a fixed, uniform or lognormal distribution plus a cost per
+output token, sampled from a seeded generator so runs are reproducible.
+
+Usage:
+    from utils.replay import LatencyModel, use_cassette
+    use_cassette("cassettes/orchestrator.json", latency=LatencyModel.lognormal(0.8, 0.4))
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from .transport import configure_transport
+
+
+CASSETTE_VERSION = 1
+REPLAY_MODES = ("replay", "record", "auto")
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+class CassetteMiss(LookupError):
+    """A request has no recorded response in replay mode"""
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Hash of a request's canonical JSON"""
+    payload = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LatencyModel:
+    """Simulated response time: base delay distribution plus a per-output-token cost"""
+
+    def __init__(self, sample_base, per_output_token: float = 0.0, seed: Optional[int] = 0):
+        """
+        Args:
+            sample_base: Callable taking a random.Random and returning seconds
+            per_output_token: Seconds added per output token of the response
+            seed: Seed of the generator (None for nondeterministic)
+        """
+        self._sample_base = sample_base
+        self.per_output_token = per_output_token
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fixed(cls, seconds: float, per_output_token: float = 0.0) -> "LatencyModel":
+        return cls(lambda rng: seconds, per_output_token)
+
+    @classmethod
+    def uniform(cls, low: float, high: float, per_output_token: float = 0.0,
+                seed: Optional[int] = 0) -> "LatencyModel":
+        return cls(lambda rng: rng.uniform(low, high), per_output_token, seed)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float, per_output_token: float = 0.0,
+                  seed: Optional[int] = 0) -> "LatencyModel":
+        """Long-tailed delays around `median` seconds (sigma is the log-space spread)"""
+        return cls(lambda rng: rng.lognormvariate(math.log(median), sigma), per_output_token, seed)
+
+    def sample(self, output_tokens: int = 0) -> float:
+        """Seconds to wait before a response with `output_tokens` tokens completes"""
+        with self._lock:
+            base = self._sample_base(self._random)
+        return max(0.0, base) + self.per_output_token * output_tokens
+
+
+class Cassette:
+    """Recorded request/response pairs stored in a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._played: Dict[str, int] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            for interaction in data.get("interactions", []):
+                self._index(interaction)
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Next recorded response for `key`, or None"""
+        with self._lock:
+            recorded = self._by_key.get(key)
+            if not recorded:
+                return None
+            position = self._played.get(key, 0)
+            self._played[key] = position + 1
+            return recorded[min(position, len(recorded) - 1)]["response"]
+
+    def record(self, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """Append an exchange and rewrite the cassette file atomically"""
+        with self._lock:
+            self._index({"key": request_key(request), "request": request, "response": response})
+            self._save()
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._played.clear()
+
+    def _index(self, interaction: Dict[str, Any]) -> None:
+        self._interactions.append(interaction)
+        self._by_key.setdefault(interaction["key"], []).append(interaction)
+
+    def _save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as temp:
+            json.dump({"version": CASSETTE_VERSION, "interactions": self._interactions},
+                      temp, indent=1, ensure_ascii=False, default=str)
+        os.replace(temp_path, self.path)
+
+
+class ReplayClient:
+    """Drop-in for an Anthropic client that records to / replays from a Cassette"""
+
+    def __init__(self, cassette: Cassette, mode: str = "replay", client: Any = None,
+                 latency: Optional[LatencyModel] = None, stream_chunk_chars: int = 64):
+        """
+        Args:
+            cassette: Cassette to read from and record to
+            mode: "replay", "record" or "auto"
+            client: Live client used when recording
+            latency: Simulated latency applied to replayed responses
+            stream_chunk_chars: Size of the text deltas of replayed streams
+        """
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"mode must be one of {', '.join(REPLAY_MODES)}, got {mode!r}")
+        if mode != "replay" and client is None:
+            raise ValueError(f"{mode} mode needs a live client to record from")
+        self.cassette = cassette
+        self.mode = mode
+        self.live_client = client
+        self.latency = latency
+        self.stream_chunk_chars = stream_chunk_chars
+        self.messages = _ReplayMessages(self)
+
+    def _replayed(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.mode == "record":
+            return None
+        recorded = self.cassette.lookup(request_key(request))
+        if recorded is None and self.mode == "replay":
+            raise CassetteMiss(f"no recorded response for request to {request.get('model')} in {self.cassette.path}")
+        return recorded
+
+    def _delay(self, recorded: Dict[str, Any]) -> float:
+        if self.latency is None:
+            return 0.0
+        return self.latency.sample(recorded.get("usage", {}).get("output_tokens", 0))
+
+
+class _ReplayMessages:
+    def __init__(self, client: ReplayClient):
+        self._client = client
+
+    def create(self, **request) -> Any:
+        recorded = self._client._replayed(request)
+        if recorded is not None:
+            delay = self._client._delay(recorded)
+            if delay:
+                time.sleep(delay)
+            return message_from_dict(recorded)
+
+        response = self._client.live_client.messages.create(**request)
+        self._client.cassette.record(request, message_to_dict(response))
+        return response
+
+    def stream(self, **request) -> Any:
+        recorded = self._client._replayed(request)
+        if recorded is not None:
+            return _ReplayStreamManager(recorded, self._client._delay(recorded), self._client.stream_chunk_chars)
+        return _RecordingStreamManager(self._client, request)
+
+
+class AsyncReplayClient(ReplayClient):
+    """Drop-in for an AsyncAnthropic client; `client` is a live async client used when recording"""
+
+    def __init__(self, cassette: Cassette, mode: str = "replay", client: Any = None,
+                 latency: Optional[LatencyModel] = None, stream_chunk_chars: int = 64):
+        super().__init__(cassette, mode, client, latency, stream_chunk_chars)
+        self.messages = _AsyncReplayMessages(self)
+
+
+class _AsyncReplayMessages:
+    def __init__(self, client: AsyncReplayClient):
+        self._client = client
+
+    async def create(self, **request) -> Any:
+        recorded = self._client._replayed(request)
+        if recorded is not None:
+            delay = self._client._delay(recorded)
+            if delay:
+                await asyncio.sleep(delay)
+            return message_from_dict(recorded)
+
+        response = await self._client.live_client.messages.create(**request)
+        self._client.cassette.record(request, message_to_dict(response))
+        return response
+
+
+class _ReplayStreamManager:
+    """Context manager yielding a recorded response as text deltas, spreading the delay over them"""
+
+    def __init__(self, recorded: Dict[str, Any], delay: float, chunk_chars: int):
+        self._message = message_from_dict(recorded)
+        text = "".join(block.text for block in self._message.content if block.type == "text")
+        self._chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+        self._delay = delay
+
+    def __enter__(self) -> "_ReplayStreamManager":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    @property
+    def text_stream(self) -> Iterator[str]:
+        pause = self._delay / len(self._chunks)
+        for chunk in self._chunks:
+            if pause:
+                time.sleep(pause)
+            yield chunk
+
+    def get_final_message(self) -> Any:
+        return self._message
+
+
+class _RecordingStreamManager:
+    """Wraps a live stream and records its final message when the stream closes"""
+
+    def __init__(self, client: ReplayClient, request: Dict[str, Any]):
+        self._client = client
+        self._request = request
+        self._manager = client.live_client.messages.stream(**request)
+        self._stream = None
+
+    def __enter__(self) -> Any:
+        self._stream = self._manager.__enter__()
+        return self._stream
+
+    def __exit__(self, *exc_info) -> bool:
+        if exc_info[0] is None:
+            message = self._stream.get_final_message()
+            self._client.cassette.record(self._request, message_to_dict(message))
+        return self._manager.__exit__(*exc_info)
+
+
+def message_to_dict(message: Any) -> Dict[str, Any]:
+    """Serializable form of a Message (text blocks, usage, stop reason)"""
+    usage = getattr(message, "usage", None)
+    return {
+        "id": getattr(message, "id", None),
+        "model": getattr(message, "model", None),
+        "stop_reason": getattr(message, "stop_reason", None),
+        "content": [
+            {"type": block.type, "text": getattr(block, "text", "")}
+            for block in message.content
+        ],
+        "usage": {field: getattr(usage, field, 0) or 0 for field in USAGE_FIELDS}
+    }
+
+
+def message_from_dict(data: Dict[str, Any]) -> SimpleNamespace:
+    """Message-like object with the attributes agents read"""
+    usage = dict.fromkeys(USAGE_FIELDS, 0)
+    usage.update(data.get("usage") or {})
+    return SimpleNamespace(
+        id=data.get("id"),
+        model=data.get("model"),
+        stop_reason=data.get("stop_reason"),
+        content=[SimpleNamespace(**block) for block in data.get("content", [])],
+        usage=SimpleNamespace(**usage)
+    )
+
+
+def use_cassette(path: str, mode: str = "replay", latency: Optional[LatencyModel] = None) -> Cassette:
+    """
+    Route every client created through utils.transport to a cassette
+
+    Args:
+        path: Cassette file (created when recording)
+        mode: "replay", "record" or "auto"
+        latency: Simulated latency for replayed responses
+
+    Returns:
+        The Cassette shared by all clients
+    """
+    from .transport import anthropic_client, async_anthropic_client
+
+    cassette = Cassette(path)
+
+    def factory(api_key: Optional[str] = None) -> ReplayClient:
+        live = anthropic_client(api_key) if mode != "replay" else None
+        return ReplayClient(cassette, mode=mode, client=live, latency=latency)
+
+    def async_factory(api_key: Optional[str] = None) -> AsyncReplayClient:
+        live = async_anthropic_client(api_key) if mode != "replay" else None
+        return AsyncReplayClient(cassette, mode=mode, client=live, latency=latency)
+
+    configure_transport(factory, async_factory)
+    return cassette
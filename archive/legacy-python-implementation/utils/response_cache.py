@@ -0,0 +1,178 @@
+"""
+Response Cache - Content-addressed cache of parsed agent results
+
+Results are keyed by the agent class, model, max_tokens and hashes of the
+system prompt and user prompt, so any change to what would be sent to the
+model produces a different key. Parsed results are stored as JSON in an
+in-memory LRU tier backed by an optional SQLite tier; both tiers evict least
+recently used entries once their byte budget is exceeded.
+
+The process-wide cache is disabled unless configured, either through
+configure_response_cache() or the AGENT_RESPONSE_CACHE environment variable
+(path of the SQLite file).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def make_response_key(agent: str, model: str, system_prompt: str, prompt: str, max_tokens: int) -> str:
+    """Content address of a single agent request"""
+    system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload = f"{agent}\x00{model}\x00{max_tokens}\x00{system_hash}\x00{prompt_hash}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of parsed agent results"""
+
+    def __init__(self, path: Optional[str] = None, memory_bytes: int = 64 * 1024 * 1024,
+                 disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite file for the persistent tier (None for memory only)
+            memory_bytes: Byte budget of the in-memory tier
+            disk_bytes: Byte budget of the SQLite tier
+        """
+        self.path = path
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_size = 0
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS response_cache_lru ON response_cache (last_used)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a fresh copy of the cached result for `key`, or None"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            elif self._conn is not None:
+                row = self._conn.execute("SELECT value FROM response_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = row[0]
+                    self._conn.execute("UPDATE response_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self._conn.commit()
+                    self._remember(key, value)
+                    self.disk_hits += 1
+
+            if value is None:
+                self.misses += 1
+                return None
+        return json.loads(value)
+
+    def set(self, key: str, result: dict) -> None:
+        """Store a parsed result in both tiers"""
+        value = json.dumps(result)
+        with self._lock:
+            self._remember(key, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), time.time())
+                )
+                self._evict_disk()
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM response_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            disk_entries, disk_size = 0, 0
+            if self._conn is not None:
+                disk_entries, disk_size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache"
+                ).fetchone()
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_size
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, value: str) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_size -= len(previous)
+        if len(value) > self.memory_bytes:
+            return
+        self._memory[key] = value
+        self._memory_size += len(value)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.evictions += 1
+
+    def _evict_disk(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response_cache").fetchone()[0]
+        if total <= self.disk_bytes:
+            return
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM response_cache ORDER BY last_used ASC"):
+            if total <= self.disk_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM response_cache WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+
+_shared_cache: Optional[ResponseCache] = None
+if os.environ.get("AGENT_RESPONSE_CACHE"):
+    _shared_cache = ResponseCache(os.environ["AGENT_RESPONSE_CACHE"])
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide response cache, or None when caching is disabled"""
+    return _shared_cache
+
+
+def configure_response_cache(path: Optional[str] = None, memory_bytes: int = 64 * 1024 * 1024,
+                             disk_bytes: int = 512 * 1024 * 1024, enabled: bool = True) -> Optional[ResponseCache]:
+    """Replace the process-wide response cache (enabled=False disables caching)"""
+    global _shared_cache
+    _shared_cache = ResponseCache(path, memory_bytes, disk_bytes) if enabled else None
+    return _shared_cache
@@ -0,0 +1,142 @@
+"""
+Response Parser - Single-pass tokenizer and classifier registry for agent responses
+
+A response is split once into fenced code blocks and lines. Agents register
+lightweight classifiers for blocks and lines on a module-level ResponseParser;
+parsing then walks the blocks once and the lines once, running every
+classifier on each item, so the cost stays linear in the response size no
+matter how many extractors an agent has.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# ```lang\n ... ``` (language optional); compiled once for all agents
+FENCE_PATTERN = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+
+# Bullet and numbering characters stripped from the start of extracted lines
+BULLET_CHARS = '•-*123456789. '
+
+
+def response_text(response: Any) -> str:
+    """Concatenate the text blocks of a Message"""
+    return "".join(block.text for block in response.content if block.type == "text")
+
+
+def clean_line(line: str) -> str:
+    return line.strip().lstrip(BULLET_CHARS)
+
+
+class ParsedResponse:
+    """Tokens of a response plus the buckets filled by classifiers"""
+
+    def __init__(self, text: str, blocks: List[Tuple[str, str]], buckets: Dict[str, list]):
+        self.text = text
+        self.blocks = blocks
+        self.buckets = buckets
+
+    def __getitem__(self, bucket: str) -> list:
+        return self.buckets[bucket]
+
+
+class ResponseParser:
+    """Registry of block and line classifiers run in one pass over a response"""
+
+    def __init__(self):
+        self._block_classifiers: List[Tuple[Optional[str], Callable]] = []
+        self._line_classifiers: List[Tuple[Optional[str], Callable]] = []
+        self._buckets: List[str] = []
+
+    def block(self, bucket: str, classify: Callable[[str, str], Any]) -> "ResponseParser":
+        """Add `classify(language, code)`; a non-None return is appended to `bucket`"""
+        self._add_bucket(bucket)
+        self._block_classifiers.append((bucket, classify))
+        return self
+
+    def line(self, bucket: str, classify: Callable[[str, str], Any]) -> "ResponseParser":
+        """Add `classify(line, line_lower)`; a non-None return is appended to `bucket`"""
+        self._add_bucket(bucket)
+        self._line_classifiers.append((bucket, classify))
+        return self
+
+    def block_choice(self, buckets: Iterable[str],
+                     classify: Callable[[str, str], Optional[Tuple[str, Any]]]) -> "ResponseParser":
+        """Add `classify(language, code)` returning (bucket, item) or None, for if/elif chains"""
+        for bucket in buckets:
+            self._add_bucket(bucket)
+        self._block_classifiers.append((None, classify))
+        return self
+
+    def line_choice(self, buckets: Iterable[str],
+                    classify: Callable[[str, str], Optional[Tuple[str, Any]]]) -> "ResponseParser":
+        """Add `classify(line, line_lower)` returning (bucket, item) or None"""
+        for bucket in buckets:
+            self._add_bucket(bucket)
+        self._line_classifiers.append((None, classify))
+        return self
+
+    def parse(self, text: str) -> ParsedResponse:
+        buckets: Dict[str, list] = {bucket: [] for bucket in self._buckets}
+
+        blocks = [(match.group(1), match.group(2)) for match in FENCE_PATTERN.finditer(text)]
+        if self._block_classifiers:
+            self._run(self._block_classifiers, blocks, buckets, lower=False)
+
+        if self._line_classifiers:
+            self._run(self._line_classifiers, text.split("\n"), buckets, lower=True)
+
+        return ParsedResponse(text, blocks, buckets)
+
+    @staticmethod
+    def _run(classifiers: List[Tuple[Optional[str], Callable]], items: Iterable[Any],
+             buckets: Dict[str, list], lower: bool) -> None:
+        for item in items:
+            args = (item, item.lower()) if lower else item
+            for bucket, classify in classifiers:
+                found = classify(*args)
+                if found is None:
+                    continue
+                if bucket is None:
+                    buckets[found[0]].append(found[1])
+                else:
+                    buckets[bucket].append(found)
+
+    def _add_bucket(self, bucket: str) -> None:
+        if bucket not in self._buckets:
+            self._buckets.append(bucket)
+
+
+# Common classifier builders
+
+def code_block(language: str, code: str) -> dict:
+    """Block classifier keeping every labelled block as {"language", "content"}"""
+    if language:
+        return {"language": language, "content": code.strip()}
+    return None
+
+
+def blocks_in(languages: Iterable[str]) -> Callable[[str, str], Optional[dict]]:
+    """Block classifier keeping blocks whose language (case-insensitive) is in `languages`"""
+    wanted = frozenset(language.lower() for language in languages)
+
+    def classify(language: str, code: str) -> Optional[dict]:
+        if language and language.lower() in wanted:
+            return {"language": language, "content": code.strip()}
+        return None
+    return classify
+
+
+def marked_lines(markers: Iterable[str], min_length: int = 0, max_length: Optional[int] = None,
+                 clean: bool = True) -> Callable[[str, str], Optional[str]]:
+    """Line classifier keeping lines containing any marker, cleaned of bullets"""
+    markers = tuple(markers)
+
+    def classify(line: str, line_lower: str) -> Optional[str]:
+        if not any(marker in line_lower for marker in markers):
+            return None
+        value = clean_line(line) if clean else line.strip()
+        if len(value) <= min_length or (max_length is not None and len(value) >= max_length):
+            return None
+        return value
+    return classify
@@ -0,0 +1,165 @@
+"""
+Single Flight - Coalesce concurrent identical agent requests into one call
+
+When several callers (threads of a parallel run, tasks of the daemon, CI
+workers sharing a process) ask an agent the same thing at the same moment,
+only the first caller (the leader) sends the request; the others wait for
+the leader's call and receive a copy of its parsed result, or its exception.
+Unlike the response cache this catches duplicates that are still in flight.
+When the leader is cancelled (e.g. an asyncio timeout), its cancellation is not
+shared: the waiters retry, and one of them becomes the new leader.
+
+Calls are keyed by the agent's response key (agent class, model, system
+prompt, prompt and max_tokens), so only requests that would send exactly the
+same payload are coalesced. Sync callers (threads) and async callers (tasks
+on any event loop) share the same table; async waiters await a future on
+their own loop, so waiting takes no thread.
+
+The process-wide SingleFlight is enabled by default; configure_singleflight(None)
+disables coalescing.
+"""
+
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class _Call:
+    """One in-flight call and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.joined = 0
+        # (loop, future) of async waiters, woken with call_soon_threadsafe
+        self.async_waiters: List[Tuple[Any, Any]] = []
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # The leader was cancelled or interrupted; waiters retry the call
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Table of in-flight calls keyed by request key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `function` unless an identical call is in flight, then wait for that one
+
+        Returns:
+            (result, shared): shared is True when the result came from another
+            caller's call (it is then a private copy)
+        """
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                try:
+                    call.result = function()
+                except Exception as error:
+                    call.error = error
+                    raise
+                except BaseException:
+                    call.abandoned = True
+                    raise
+                finally:
+                    self._finish(key, call)
+                return call.result, False
+
+            call.done.wait()
+            if not call.abandoned:
+                return self._shared_result(call), True
+
+    async def ado(self, key: str, function: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Coroutine version of do(); waiting callers await a future instead of blocking the loop"""
+        import asyncio  # only needed by async callers; kept off the import path
+
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter = loop.create_future()
+            call, leader = self._join(key, (loop, waiter))
+            if leader:
+                try:
+                    call.result = await function()
+                except Exception as error:
+                    call.error = error
+                    raise
+                except BaseException:
+                    # Cancellation is the leader's own; don't hand it to the waiters
+                    call.abandoned = True
+                    raise
+                finally:
+                    self._finish(key, call)
+                return call.result, False
+
+            await waiter
+            if not call.abandoned:
+                return self._shared_result(call), True
+
+    def _join(self, key: str, async_waiter: Optional[Tuple[Any, Any]] = None) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.joined += 1
+                if async_waiter is not None:
+                    call.async_waiters.append(async_waiter)
+                return call, False
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def _finish(self, key: str, call: _Call) -> None:
+        with self._lock:
+            del self._calls[key]
+            # No caller can join once the call is out of the table; snapshot
+            # the result so the leader's caller can't mutate what waiters get
+            if call.joined and call.error is None and not call.abandoned:
+                call.result = copy.deepcopy(call.result)
+            async_waiters = call.async_waiters
+        call.done.set()
+        for loop, waiter in async_waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                pass  # the waiter's event loop is closed
+
+    def _shared_result(self, call: _Call) -> Any:
+        with self._lock:
+            self.coalesced += 1
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.leaders + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "coalesced_rate": self.coalesced / total if total else 0.0
+            }
+
+
+def _wake(waiter: Any) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_shared_flight: Optional[SingleFlight] = SingleFlight()
+
+
+def get_singleflight() -> Optional[SingleFlight]:
+    """The process-wide SingleFlight, or None when coalescing is disabled"""
+    return _shared_flight
+
+
+def configure_singleflight(flight: Optional[SingleFlight] = None) -> Optional[SingleFlight]:
+    """Replace the process-wide SingleFlight (None disables coalescing)"""
+    global _shared_flight
+    _shared_flight = flight
+    return _shared_flight
@@ -0,0 +1,148 @@
+"""
+Tracing - Opt-in span recording exported as Chrome trace-event JSON
+
+When a Tracer is installed, the orchestrator and agents record a span for
+each phase of a run (routing, prompt build, rate-limit wait, network request,
+response parse, ...) on the thread that executed it, or on a track of its
+own for each asyncio task (aexecute). The resulting file can
+be opened in chrome://tracing or https://ui.perfetto.dev to see the timeline
+of every agent and find the critical path.
+
+Tracing is disabled by default and span() is then a no-op. Enable it with
+configure_tracer(Tracer()) and write the trace with Tracer.write(), use the
+trace_to() context manager, or set AGENT_TRACE to a file written at exit.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def _track() -> Tuple[int, str]:
+    """Trace track (tid, name) of the caller: its asyncio task if any, else its thread"""
+    # No task can be running unless asyncio has been imported
+    asyncio = sys.modules.get("asyncio")
+    try:
+        task = asyncio.current_task() if asyncio is not None else None
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return id(task), task.get_name()
+    thread = threading.current_thread()
+    return thread.ident, thread.name
+
+
+class Tracer:
+    """Thread-safe recorder of complete ("X") trace events"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(self, name: str, category: str = "agent", **args) -> Iterator[Dict[str, Any]]:
+        """
+        Record the enclosed block as a span
+
+        Yields the span's args dict, so details known only at the end (e.g.
+        the routing tier) can be added inside the block.
+        """
+        tid, track_name = _track()
+        start = self._now_us()
+        try:
+            yield args
+        except BaseException as error:
+            args["error"] = type(error).__name__
+            raise
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start,
+                "dur": self._now_us() - start,
+                "pid": self.pid,
+                "tid": tid,
+                "args": {key: value if isinstance(value, (int, float, bool)) or value is None else str(value)
+                         for key, value in args.items()}
+            }
+            with self._lock:
+                self._events.append(event)
+                self._threads.setdefault(tid, track_name)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded events plus thread-name metadata, in trace-event format"""
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+            threads = dict(self._threads)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return metadata + events
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """Write the trace as Chrome trace-event JSON"""
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_json(), handle)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+
+
+_shared_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The process-wide tracer, or None when tracing is off"""
+    return _shared_tracer
+
+
+def configure_tracer(tracer: Optional[Tracer] = None) -> Optional[Tracer]:
+    """Install a process-wide tracer (None turns tracing off)"""
+    global _shared_tracer
+    _shared_tracer = tracer
+    return _shared_tracer
+
+
+@contextmanager
+def span(name: str, category: str = "agent", **args) -> Iterator[Dict[str, Any]]:
+    """Record a span on the process-wide tracer; a no-op when tracing is off"""
+    tracer = _shared_tracer
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, category, **args) as span_args:
+        yield span_args
+
+
+@contextmanager
+def trace_to(path: str) -> Iterator[Tracer]:
+    """Trace the enclosed block and write it to `path`, restoring the previous tracer"""
+    previous = _shared_tracer
+    tracer = configure_tracer(Tracer())
+    try:
+        yield tracer
+    finally:
+        configure_tracer(previous)
+        tracer.write(path)
+
+
+if os.environ.get("AGENT_TRACE"):
+    atexit.register(configure_tracer(Tracer()).write, os.environ["AGENT_TRACE"])
@@ -0,0 +1,201 @@
+"""
+Transport - Process-wide factory for the API clients used by agents
+
+Agents and the orchestrator get their client from create_client() instead of
+constructing an Anthropic client directly, so the transport can be swapped
+for the whole process, e.g. for a record/replay client (see utils.replay) in
+offline benchmarks and tests. The anthropic package is only imported when
+the default factory is used.
+
+The default transport shares one live client per API key across every agent
+and the router, so all requests reuse a single keep-alive connection pool
+(HTTP/2 when the h2 package is installed) instead of each agent opening its
+own connections. Pool size and timeouts are set with
+configure_connection_pool() or the AGENT_HTTP_MAX_CONNECTIONS and
+AGENT_HTTP_TIMEOUT environment variables.
+
+Async callers (BaseAgent.aexecute, AgentOrchestrator.aexecute) get their
+client from create_async_client(), whose factory is configured alongside the
+sync one; the default is a live AsyncAnthropic client, so a single event
+loop can drive many concurrent requests without a thread per call. Async
+clients are shared per event loop, as their connections belong to it.
+
+Setting AGENT_CASSETTE (a cassette file) installs a replay transport at
+import time; AGENT_CASSETTE_MODE selects "replay" (default), "record" or
+"auto".
+"""
+
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+
+ClientFactory = Callable[[Optional[str]], Any]
+
+_client_factory: Optional[ClientFactory] = None
+_async_client_factory: Optional[ClientFactory] = None
+
+
+class PoolSettings:
+    """Connection pool and timeout settings of the live clients"""
+
+    def __init__(self, max_connections: int = 32, max_keepalive_connections: int = 16,
+                 keepalive_expiry: float = 60.0, timeout: float = 600.0,
+                 connect_timeout: float = 5.0, http2: Optional[bool] = None):
+        """
+        Args:
+            max_connections: Maximum open connections per client
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept
+            timeout: Read/write timeout in seconds (generations can be long)
+            connect_timeout: Connection setup timeout in seconds
+            http2: Use HTTP/2 (None: when the h2 package is installed)
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.http2 = http2 if http2 is not None else importlib.util.find_spec("h2") is not None
+
+    def http_options(self) -> Dict[str, Any]:
+        """Keyword arguments for the SDK's httpx client classes"""
+        import httpx
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            "http2": self.http2
+        }
+
+
+def _env_settings() -> PoolSettings:
+    settings = PoolSettings()
+    if os.environ.get("AGENT_HTTP_MAX_CONNECTIONS"):
+        settings.max_connections = int(os.environ["AGENT_HTTP_MAX_CONNECTIONS"])
+        settings.max_keepalive_connections = min(settings.max_keepalive_connections, settings.max_connections)
+    if os.environ.get("AGENT_HTTP_TIMEOUT"):
+        settings.timeout = float(os.environ["AGENT_HTTP_TIMEOUT"])
+    return settings
+
+
+_pool_settings = _env_settings()
+_shared_clients: Dict[Optional[str], Any] = {}
+# Event loop -> API key -> async client
+_shared_async_clients: "weakref.WeakKeyDictionary[Any, Dict[Optional[str], Any]]" = weakref.WeakKeyDictionary()
+_shared_lock = threading.Lock()
+
+
+def anthropic_client(api_key: Optional[str] = None) -> Any:
+    """A new live Anthropic client with its own connection pool"""
+    from anthropic import Anthropic, DefaultHttpxClient
+    return Anthropic(
+        api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
+        http_client=DefaultHttpxClient(**_pool_settings.http_options()),
+        # Retries go through the rate limiter's shared backoff
+        max_retries=0
+    )
+
+
+def async_anthropic_client(api_key: Optional[str] = None) -> Any:
+    """A new live AsyncAnthropic client with its own connection pool"""
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+    return AsyncAnthropic(
+        api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"),
+        http_client=DefaultAsyncHttpxClient(**_pool_settings.http_options()),
+        max_retries=0
+    )
+
+
+def shared_anthropic_client(api_key: Optional[str] = None) -> Any:
+    """The default transport: one live client (and connection pool) per API key"""
+    with _shared_lock:
+        client = _shared_clients.get(api_key)
+        if client is None:
+            client = _shared_clients[api_key] = anthropic_client(api_key)
+        return client
+
+
+def shared_async_anthropic_client(api_key: Optional[str] = None) -> Any:
+    """The default async transport: one live client per API key and running event loop"""
+    import asyncio  # only needed by async callers; kept off the import path
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Not inside a loop yet: the caller owns this client
+        return async_anthropic_client(api_key)
+    with _shared_lock:
+        clients = _shared_async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            client = clients[api_key] = async_anthropic_client(api_key)
+        return client
+
+
+def create_client(api_key: Optional[str] = None) -> Any:
+    """Client for `api_key` from the configured transport"""
+    factory = _client_factory or shared_anthropic_client
+    return factory(api_key)
+
+
+def create_async_client(api_key: Optional[str] = None) -> Any:
+    """Async client (awaitable `messages.create`) for `api_key` from the configured transport"""
+    factory = _async_client_factory or shared_async_anthropic_client
+    return factory(api_key)
+
+
+def configure_transport(factory: Optional[ClientFactory] = None,
+                        async_factory: Optional[ClientFactory] = None) -> None:
+    """
+    Replace the process-wide client factories
+
+    Args:
+        factory: Sync client factory (None restores the shared live
+            Anthropic client)
+        async_factory: Async client factory (None restores the shared live
+            AsyncAnthropic client)
+    """
+    global _client_factory, _async_client_factory
+    _client_factory = factory
+    _async_client_factory = async_factory
+
+
+def configure_connection_pool(settings: Optional[PoolSettings] = None, **options) -> PoolSettings:
+    """
+    Set the connection pool of the live clients, e.g.
+    configure_connection_pool(max_connections=64, timeout=120)
+
+    Clients created afterwards use the new pool; existing agents keep the
+    client they were constructed with.
+
+    Args:
+        settings: Complete settings (defaults to PoolSettings(**options))
+        options: PoolSettings arguments
+    """
+    global _pool_settings
+    _pool_settings = settings if settings is not None else PoolSettings(**options)
+    with _shared_lock:
+        _shared_clients.clear()
+        _shared_async_clients.clear()
+    return _pool_settings
+
+
+def close_clients() -> None:
+    """Close the shared sync clients (e.g. at shutdown) and forget the shared async ones"""
+    with _shared_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+        _shared_async_clients.clear()
+    for client in clients:
+        client.close()
+
+
+if os.environ.get("AGENT_CASSETTE"):
+    from .replay import use_cassette
+    use_cassette(os.environ["AGENT_CASSETTE"], mode=os.environ.get("AGENT_CASSETTE_MODE", "replay"))